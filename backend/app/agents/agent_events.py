@@ -0,0 +1,109 @@
+import ast
+import json
+import re
+from typing import Any, Dict, List, Set
+
+# Fields of the submission form that can be streamed to the client as they appear
+FORM_FIELDS = [
+    "title", "humanity_challenge", "category", "sub_category", "geographic_focus",
+    "time_horizon", "problem_statement", "solution", "why_now", "market_estimate",
+    "business_model", "technologies", "competition", "status", "sources",
+    "ideal_customer_profile", "skills_required", "potential_investors",
+    "potential_customers", "contacts", "collaboration_groups", "other"
+]
+
+_FIELD_PATTERN = "|".join(FORM_FIELDS)
+# "field": "value" / 'field': ['a', 'b'] / "field": 123 inside code or printed dicts
+_KEY_VALUE_RE = re.compile(
+    r"""["'](%s)["']\s*:\s*("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'|\[[^\[\]]*\]|-?\d+(?:\.\d+)?)""" % _FIELD_PATTERN
+)
+# Called agents and tools, e.g. `result = web_agent(task="...")`
+_CALL_RE = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+
+
+def agent_name(agent: Any) -> str:
+    """
+    Name of the agent that produced a step; the manager has no name of its own
+    """
+    return getattr(agent, "name", None) or "manager_agent"
+
+
+def extract_form_fields(*texts: Any) -> Dict[str, Any]:
+    """
+    Form fields that can already be read from agent output: dicts returned
+    by a step, or field/value pairs written in its code or printed output
+    """
+    fields: Dict[str, Any] = {}
+    for text in texts:
+        if isinstance(text, dict):
+            fields.update({k: v for k, v in text.items() if k in FORM_FIELDS and v not in (None, "", [])})
+            continue
+        if not isinstance(text, str):
+            continue
+        for field, raw in _KEY_VALUE_RE.findall(text):
+            try:
+                value = ast.literal_eval(raw)
+            except (ValueError, SyntaxError):
+                try:
+                    value = json.loads(raw)
+                except ValueError:
+                    continue
+            if value not in (None, "", []):
+                fields[field] = value
+    return fields
+
+
+def _called_names(agent: Any, code: str) -> List[str]:
+    tools = set(getattr(agent, "tools", {}) or {}) - {"final_answer"}
+    managed = set(getattr(agent, "managed_agents", {}) or {})
+    names = []
+    for name in _CALL_RE.findall(code):
+        if (name in tools or name in managed) and name not in names:
+            names.append(name)
+    return names
+
+
+def step_events(memory_step: Any, agent: Any, reported: Set[int]) -> List[Dict[str, Any]]:
+    """
+    Progress events for a finished agent step.
+
+    Planning steps are not passed to step callbacks, so any that were added to
+    the agent's memory since the last report are emitted first. reported holds
+    the ids of memory steps already turned into events during this run.
+    """
+    name = agent_name(agent)
+    events: List[Dict[str, Any]] = []
+
+    for step in getattr(getattr(agent, "memory", None), "steps", []):
+        if type(step).__name__ == "PlanningStep" and id(step) not in reported:
+            reported.add(id(step))
+            events.append({"event": "planning", "data": {"agent": name, "plan": step.plan}})
+
+    if id(memory_step) in reported:
+        return events
+    reported.add(id(memory_step))
+
+    code = ""
+    tool_calls = []
+    for call in memory_step.tool_calls or []:
+        arguments = call.arguments
+        if call.name == "python_interpreter" and isinstance(arguments, str):
+            code += arguments + "\n"
+        tool_calls.append(call.name)
+
+    error = getattr(memory_step, "error", None)
+    events.append({"event": "step", "data": {
+        "agent": name,
+        "step": memory_step.step_number,
+        "duration_ms": round((memory_step.duration or 0.0) * 1000, 1),
+        "tool_calls": tool_calls,
+        "calls": _called_names(agent, code),
+        "error": str(error) if error else None
+    }})
+
+    # Only the manager writes the form; web pages seen by web_agent are not form fields
+    if name == "manager_agent":
+        fields = extract_form_fields(code, memory_step.observations, memory_step.action_output)
+        if fields:
+            events.append({"event": "partial", "data": fields})
+    return events
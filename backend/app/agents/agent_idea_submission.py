@@ -1,8 +1,22 @@
-from json import tool
-from smolagents import CodeAgent, DuckDuckGoSearchTool, LiteLLMModel, tool, VisitWebpageTool
+from smolagents import CodeAgent, LiteLLMModel, tool
 import os
 import json
-from typing import Dict, Any
+import queue
+import threading
+import time
+from typing import Dict, Any, Iterator, Optional
+
+from app.agents.agent_pool import AgentPool, AgentRunCancelled, AgentSet
+from app.agents.cached_model import CachedLiteLLMModel
+from app.agents.tools.web_search import WebSearchTool, VisitWebpagesTool
+# The form definition lives apart from the agents so it can be imported cheaply
+from app.agents.idea_form import (
+    humanity_challenges, time_horizons, statuses, max_steps_manager,
+    model_id, fallback_title, form_prompt
+)
+from app.core.config import settings
+from app.core.metrics import AGENT_RUN_DURATION
+from app.llms.llm_cache import get_llm_cache
 
 
 @tool
@@ -13,73 +27,13 @@ def market_estimate_tool() -> int:
     """
     return 69
 
-humanity_challenges = ["Climate Change", "AI Ethics", "Other Challenges"]
-time_horizons = ["Less than 1 year", "1-5 years", "5-10 years", "More than 10 years"]
-statuses = ["Early-stage", "Pilot", "Proven", "Scaling"]
-max_steps_manager = 25
-
-form_prompt= f"""
-You are an expert AI assistant that helps users fill out idea submission forms.
-Your goal is to analyze the user's idea description thoroughly and extract relevant information to populate the form fields.
-If information for a field is not provided, use the agents available to you to get the information.
-The agents are:
-- web_agent (for web search)
-
-To use the agents, you can use the following format:
-# {"Description of what you want to do"}           
-{"Task name made by you"} = {"agent name"}(task="{"Task description for the agent"}")
-
-Never make up information, only base your answers on the information provided by the user or your tools.
-For list fields, provide items as a comma-separated list.
-For the market_estimate field, provide a numeric value.
-
-Try to write an answer for each field at least once. If you can't after two tries, leave it blank. Use the agents to get external information when needed.
-You have maximum {max_steps_manager} steps to complete the task.
-
-The form has the following fields:
-- title: A concise title for the idea
-- humanity_challenge: The main challenge the idea addresses (must match one of the predefined challenges, which are: {humanity_challenges} )
-- category: The category of the idea, specifically related to the humanity challenge (e.g., "Climate Change" -> "Energy", "AI Ethics" -> "Mechanistic Interpretability")
-- sub_category: A more specific category, related to the category
-- geographic_focus: The geographic scope (local, regional, global, etc.)
-- time_horizon: The timeframe for implementation (must match one of the predefined time horizons, which are: {time_horizons} )
-- problem_statement: A clear statement of the problem being solved. Ensure to encapsulate the problem in detail, writing at least 2-3 sentences.
-- solution: A description of the proposed solution. Ensure to encapsulate the solution in detail, writing at least 2-3 sentences.
-- why_now: Why this idea is relevant and timely now. Ensure to write at least 2-3 sentences.
-- market_estimate: Estimated market size in dollars (numeric value)
-- business_model: How the idea will generate revenue or sustain itself. Make it a short, coincise description.
-- technologies: List of technologies potentially used, and be specific (max 5).
-- competition: List of competing companies (max 5)
-- status: Current status of the idea (must match one of the predefined statuses, which are: {statuses} )
-- sources: List of sources or references. Insert the 3 main sources used, separated by commas. E.g., "Source 1 (https://www.example1.com), Source 2 (https://www.example2.com)"
-
-Optional fields:
-- ideal_customer_profile: Description of the ideal customer (max 100 words)
-- skills_required: List of skills needed to implement the idea (max 5)
-- potential_investors: List of potential investors in the following format: "Company Name (Type of investor, e.g. VC, Angel, etc.), Company Name (Type of investor, e.g. VC, Angel, etc.), etc."
-- potential_customers: List of potential customers in the following format: "Company Name (Type of customer, e.g. Enterprise, Government, etc.), Company Name (Type of customer, e.g. Enterprise, Government, etc.), etc."
-- contacts: List of relevant contacts in the following format: "Name (Role - Company) - Contact info, Name (Role - Company) - Contact info, etc."
-- collaboration_groups: List of groups to collaborate with in the following format: "Group Name (Type of group, e.g. NGO, University, etc.), Group Name (Type of group, e.g. NGO, University, etc.), etc."
-- similar_ideas: List of similar ideas in the following format: "Idea 1 (Description), Idea 2 (Description), etc."
-- other: Any other relevant information not included in the other fields.that you think is important to know.
-
-IMPORTANT: Do NOT include 'author' or 'type_of_author' fields in your response. These will be handled separately by the system.
-"""
-
-model = LiteLLMModel(
-    "gpt-4o-mini",
+# Identical agent steps (same history, same model settings) reuse the LLM response cache
+model = CachedLiteLLMModel(
+    model_id,
     temperature=0.2,
-    api_key=os.environ["OPENAI_API_KEY"]
-)
-
-web_agent = CodeAgent(
-    tools=[DuckDuckGoSearchTool(),VisitWebpageTool()],
-    model=model,
-    name="web_agent",
-    description="The web_agent is responsible for searching the web for information.",
-    verbosity_level=0,
-    additional_authorized_imports=['json'],
-    max_steps=4
+    # Read from settings so a missing key fails the first call, not the import
+    api_key=settings.OPENAI_API_KEY or None,
+    cache=get_llm_cache() if settings.LLM_CACHE_ENABLED else None
 )
 
 market_agent = CodeAgent(
@@ -92,30 +46,146 @@ market_agent = CodeAgent(
     max_steps=1
 )
 
-manager_agent = CodeAgent(
-    tools=[], 
-    managed_agents=[web_agent],
-    model=model, 
-    additional_authorized_imports=['json'],
-    max_steps=max_steps_manager,
-    planning_interval=5,
-    verbosity_level=2
+# Tools are shared by every agent set; they fetch through one pooled, cached fetcher
+web_tools = [WebSearchTool(), VisitWebpagesTool()]
+
+
+def build_agents() -> AgentSet:
+    """
+    Build an isolated manager_agent/web_agent pair for the agent pool.
+    
+    Each set has its own CodeAgent memory and state, while the LiteLLMModel
+    and the web tools are shared.
+    """
+    agents = AgentSet(manager_agent=None, web_agent=None)
+    
+    web_agent = CodeAgent(
+        tools=web_tools,
+        model=model,
+        name="web_agent",
+        description="The web_agent is responsible for searching the web for information.",
+        verbosity_level=0,
+        additional_authorized_imports=['json'],
+        max_steps=4,
+        step_callbacks=[agents.check_cancelled, agents.report_step]
     )
+    
+    manager_agent = CodeAgent(
+        tools=[], 
+        managed_agents=[web_agent],
+        model=model, 
+        additional_authorized_imports=['json'],
+        max_steps=max_steps_manager,
+        planning_interval=5,
+        verbosity_level=2,
+        step_callbacks=[agents.check_cancelled, agents.report_step]
+        )
+    
+    agents.manager_agent = manager_agent
+    agents.web_agent = web_agent
+    return agents
 
 
-def analyze_idea_description(description: str) -> Dict[str, Any]:
+# Caps the number of concurrent analyses; each run checks out its own agent set
+agent_pool = AgentPool(build_agents, settings.AGENT_POOL_SIZE, settings.AGENT_POOL_TIMEOUT_SECONDS)
+
+
+def build_task(description: str, known_fields: Optional[Dict[str, Any]] = None) -> str:
+    """
+    The manager agent's task. Fields that are already known (e.g. from the
+    structured extraction) are handed over so the agent only works on the rest.
+    """
+    task = form_prompt + "Here is the idea description: " + description
+    if known_fields:
+        task += (
+            "\n\nThese fields have already been filled in from the description: "
+            + json.dumps(known_fields, ensure_ascii=False)
+            + "\nDo not research them again. Focus your steps on the missing fields, then return"
+            " the complete form with these values included as they are."
+        )
+    return task
+
+
+def _run_manager(agents: AgentSet, description: str, known_fields: Optional[Dict[str, Any]]) -> Any:
+    # Times the whole run, including the steps of the managed agents
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = agents.manager_agent.run(build_task(description, known_fields))
+        outcome = "ok"
+        return result
+    except AgentRunCancelled:
+        outcome = "cancelled"
+        raise
+    finally:
+        AGENT_RUN_DURATION.observe(time.perf_counter() - started, outcome=outcome)
+
+
+def analyze_idea_description(
+    description: str,
+    cancel_event: Optional[threading.Event] = None,
+    known_fields: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Analyze an idea description using the agent and return the form data.
     
     Args:
         description: The idea description from the frontend
+        cancel_event: Optional event that stops the run (between steps) when set
+        known_fields: Form fields that are already known and need no research
         
     Returns:
         A dictionary containing the form data
     """
-    # Run the agent with the description
-    result = manager_agent.run(form_prompt + "Here is the idea description: " + description)
+    # Run the agent with the description on an agent set of our own
+    with agent_pool.checkout(cancel_event) as agents:
+        result = _run_manager(agents, description, known_fields)
     
+    return parse_agent_output(result, description)
+
+
+def stream_idea_analysis(
+    description: str,
+    cancel_event: Optional[threading.Event] = None,
+    known_fields: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze an idea description and yield progress events while the agent runs.
+    
+    Yields "planning", "step" and "partial" events (see agent_events) as the
+    agents work, then a single "final" event with the parsed form data, or an
+    "error" event if the run failed. Closing the generator early cancels the run.
+    """
+    cancel_event = cancel_event or threading.Event()
+    events: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+    
+    def run() -> None:
+        try:
+            with agent_pool.checkout(cancel_event) as agents:
+                agents.event_sink = events.put
+                result = _run_manager(agents, description, known_fields)
+            events.put({"event": "final", "data": parse_agent_output(result, description)})
+        except Exception as e:
+            events.put({"event": "error", "data": {"detail": str(e)}})
+        finally:
+            events.put(None)
+    
+    threading.Thread(target=run, name="agent-stream", daemon=True).start()
+    try:
+        while True:
+            event = events.get()
+            if event is None:
+                return
+            yield event
+    finally:
+        # The client went away (or the run ended); don't keep the agents busy
+        cancel_event.set()
+
+
+def parse_agent_output(result: Any, description: str) -> Dict[str, Any]:
+    """
+    Turn the final answer of the manager agent into a form data dictionary
+    """
     # The agent's final output is a dictionary, but it might be returned as a string
     # representation of a dictionary or as an actual dictionary
     if isinstance(result, dict):
@@ -153,12 +223,12 @@ def analyze_idea_description(description: str) -> Dict[str, Any]:
         except:
             # If parsing fails, return a simple dictionary
             return {
-                "title": "Generated from description",
+                "title": fallback_title,
                 "problem_statement": description[:100] + "..." if len(description) > 100 else description
             }
     
     # If parsing fails, return a simple dictionary
     return {
-        "title": "Generated from description",
+        "title": fallback_title,
         "problem_statement": description[:100] + "..." if len(description) > 100 else description
     }
\ No newline at end of file
@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+from app.agents.agent_events import agent_name, step_events
+from app.core.latency import LatencyRecorder
+from app.core.metrics import AGENT_STEP_DURATION, AGENT_STEPS
+
+
+class AgentPoolTimeout(Exception):
+    """
+    Raised when no agent set becomes free within the checkout timeout
+    """
+
+
+class AgentRunCancelled(Exception):
+    """
+    Raised from a step callback to stop an agent run that was cancelled
+    """
+
+
+@dataclass
+class AgentSet:
+    """
+    The agents needed for one analysis run. A set is only ever used by one run
+    at a time, so the per-run memory and state of its CodeAgents is private.
+    """
+    manager_agent: Any
+    web_agent: Any
+    cancel_event: Optional[threading.Event] = None
+    # Receives progress events while a streamed run is in progress
+    event_sink: Optional[Callable[[Dict[str, Any]], None]] = None
+    # Memory steps already reported to the event sink during the current run
+    reported_steps: Set[int] = field(default_factory=set)
+
+    def check_cancelled(self, *args, **kwargs) -> None:
+        """
+        Step callback that aborts the run once cancel_event is set
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise AgentRunCancelled("Agent run cancelled")
+
+    def report_step(self, memory_step: Any, agent: Any = None) -> None:
+        """
+        Step callback that counts the step and forwards progress events to
+        event_sink, if any
+        """
+        name = agent_name(agent)
+        AGENT_STEPS.inc(agent=name, error=getattr(memory_step, "error", None) is not None)
+        if getattr(memory_step, "duration", None):
+            AGENT_STEP_DURATION.observe(memory_step.duration, agent=name)
+        if self.event_sink is None:
+            return
+        try:
+            events = step_events(memory_step, agent, self.reported_steps)
+        except Exception as e:
+            # Progress reporting must never break the run itself
+            print(f"Error building agent step events: {str(e)}")
+            return
+        for event in events:
+            self.event_sink(event)
+
+
+class AgentPool:
+    """
+    Bounded pool of isolated agent sets.
+
+    Sets are built on demand by the factory (which shares the model and tools
+    between sets) and reused after each run. A semaphore caps the number of
+    runs in flight; callers beyond the cap wait for a set to be returned.
+    """
+
+    def __init__(self, factory: Callable[[], AgentSet], max_size: int, timeout: Optional[float] = None):
+        self.factory = factory
+        self.max_size = max_size
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._idle: "queue.LifoQueue[AgentSet]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+
+        self.created = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.checkouts = 0
+        self.wait_time = LatencyRecorder()
+
+    @contextmanager
+    def checkout(self, cancel_event: Optional[threading.Event] = None) -> Iterator[AgentSet]:
+        """
+        Borrow an agent set for the duration of one run
+        """
+        started = time.perf_counter()
+        with self._lock:
+            self.waiting += 1
+        acquired = self._slots.acquire(timeout=self.timeout)
+        with self._lock:
+            self.waiting -= 1
+        self.wait_time.record(time.perf_counter() - started)
+        if not acquired:
+            raise AgentPoolTimeout(f"No agent available after {self.timeout} seconds")
+
+        try:
+            try:
+                agents = self._idle.get_nowait()
+            except queue.Empty:
+                agents = self.factory()
+                with self._lock:
+                    self.created += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+            self.checkouts += 1
+        agents.cancel_event = cancel_event
+        agents.reported_steps.clear()
+        try:
+            yield agents
+        finally:
+            agents.cancel_event = None
+            agents.event_sink = None
+            self._idle.put(agents)
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    def prewarm(self, count: int) -> int:
+        """
+        Build up to count agent sets ahead of the first run. Returns how many
+        sets were built.
+        """
+        built = 0
+        with self._lock:
+            count = min(count, self.max_size - self.created)
+        for _ in range(max(count, 0)):
+            self._idle.put(self.factory())
+            with self._lock:
+                self.created += 1
+            built += 1
+        return built
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool occupancy and checkout wait time
+        """
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "created": self.created,
+                "in_use": self.in_use,
+                "idle": self._idle.qsize(),
+                "waiting": self.waiting,
+                "checkouts": self.checkouts,
+                "wait_ms": self.wait_time.percentiles()
+            }
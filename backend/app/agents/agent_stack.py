@@ -0,0 +1,111 @@
+import importlib
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, Optional
+
+AGENT_MODULE = "app.agents.agent_idea_submission"
+
+
+class AgentStack:
+    """
+    Loads the agent stack (smolagents, litellm, the model and the agent pool)
+    on first use instead of at import time.
+
+    Processes that never analyze an idea never pay for the import, and a
+    missing OPENAI_API_KEY no longer stops the API from starting. warm_up()
+    loads the stack and builds agent sets ahead of the first request.
+    """
+
+    def __init__(self, module_name: str = AGENT_MODULE):
+        self.module_name = module_name
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+        self._warm_thread: Optional[threading.Thread] = None
+
+        self.load_seconds: Optional[float] = None
+        self.warm = False
+        self.warming = False
+        self.warm_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self) -> ModuleType:
+        """
+        Import the agent module, once
+        """
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    started = time.perf_counter()
+                    try:
+                        module = importlib.import_module(self.module_name)
+                    except Exception as e:
+                        self.error = str(e)
+                        raise
+                    self.load_seconds = time.perf_counter() - started
+                    self.error = None
+                    self._module = module
+        return self._module
+
+    def warm_up(self, agent_sets: int = 1) -> None:
+        """
+        Load the stack and build agent sets so the first analysis does not
+        pay for them
+        """
+        self.warming = True
+        started = time.perf_counter()
+        try:
+            self.load().agent_pool.prewarm(agent_sets)
+            self.warm = True
+            self.warm_seconds = time.perf_counter() - started
+        except Exception as e:
+            print(f"Error warming up the agent stack: {str(e)}")
+            self.error = str(e)
+        finally:
+            self.warming = False
+
+    def start_warm_up(self, agent_sets: int = 1) -> None:
+        """
+        Warm up on a background thread so startup is not delayed
+        """
+        if self._warm_thread is not None:
+            return
+        self.warming = True
+        self._warm_thread = threading.Thread(
+            target=self.warm_up, args=(agent_sets,), name="agent-warm-up", daemon=True
+        )
+        self._warm_thread.start()
+
+    def state(self) -> Dict[str, Any]:
+        """
+        Whether the stack is loaded and warm, and how long that took
+        """
+        return {
+            "loaded": self.loaded,
+            "warm": self.warm,
+            "warming": self.warming,
+            "load_seconds": round(self.load_seconds, 3) if self.load_seconds is not None else None,
+            "warm_seconds": round(self.warm_seconds, 3) if self.warm_seconds is not None else None,
+            "error": self.error
+        }
+
+
+# Process-wide agent stack, loaded on first use (or by the startup warm-up)
+agent_stack = AgentStack()
+
+def get_agent_stack() -> AgentStack:
+    """
+    Returns the process-wide agent stack
+    """
+    return agent_stack
+
+def get_agents() -> Any:
+    """
+    Returns the loaded agent module (analyze_idea_description,
+    stream_idea_analysis, parse_agent_output and agent_pool)
+    """
+    return agent_stack.load()
@@ -0,0 +1,65 @@
+import time
+from typing import Any, Dict, List, Optional
+
+from smolagents import LiteLLMModel
+from smolagents.models import ChatMessage
+
+from app.core.metrics import LLM_CALL_DURATION, LLM_CALL_ERRORS, record_llm_usage
+from app.llms.llm_cache import LLMResponseCache
+
+
+class CachedLiteLLMModel(LiteLLMModel):
+    """
+    LiteLLMModel that serves repeated identical agent steps from the LLM
+    response cache.
+
+    The key covers the model, temperature, the full message history and the
+    stop sequences, so a step is only replayed when the agent is in exactly
+    the same state. Calls with tools are passed straight through. Calls that
+    reach the model are recorded in the LLM latency and token metrics.
+    """
+
+    def __init__(self, *args, cache: Optional[LLMResponseCache] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+        self.cache_hits = 0
+
+    def __call__(
+        self,
+        messages: List[Dict[str, Any]],
+        stop_sequences: Optional[List[str]] = None,
+        grammar: Optional[str] = None,
+        tools_to_call_from: Optional[List[Any]] = None,
+        **kwargs
+    ) -> ChatMessage:
+        if self.cache is None or tools_to_call_from is not None or grammar is not None:
+            return self._call_model(messages, stop_sequences, grammar, tools_to_call_from, **kwargs)
+
+        key = LLMResponseCache.key(
+            self.model_id,
+            self.kwargs.get("temperature"),
+            {"messages": messages, "stop_sequences": stop_sequences, "kwargs": kwargs}
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            self.last_input_token_count = 0
+            self.last_output_token_count = 0
+            return ChatMessage(role="assistant", content=cached)
+
+        message = self._call_model(messages, stop_sequences, **kwargs)
+        if isinstance(message.content, str) and message.content:
+            self.cache.set(key, message.content)
+        return message
+
+    def _call_model(self, *args, **kwargs) -> ChatMessage:
+        started = time.perf_counter()
+        try:
+            message = super().__call__(*args, **kwargs)
+        except Exception:
+            LLM_CALL_ERRORS.inc(model=self.model_id, kind="agent")
+            raise
+        finally:
+            LLM_CALL_DURATION.observe(time.perf_counter() - started, model=self.model_id, kind="agent")
+        record_llm_usage(self.model_id, self.last_input_token_count, self.last_output_token_count)
+        return message
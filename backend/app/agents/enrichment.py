@@ -0,0 +1,179 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+from pydantic import create_model
+
+from app.agents.structured_extraction import IdeaExtractor, get_idea_extractor
+from app.agents.tools.web_fetcher import WebFetcher, get_web_fetcher
+from app.core.config import settings
+from app.core.latency import LatencyRecorder
+from app.llms.prompts.idea_prompts import IdeaPrompts
+from app.schemas.idea import IdeaExtraction
+
+# Fields that can be looked up on the web independently of each other: the
+# search query (formatted with the form so far) and what the field should hold
+ENRICHABLE_FIELDS = {
+    "market_estimate": ("{title} market size", "Estimated market size in dollars (numeric value)"),
+    "competition": ("{title} competitors companies", "Competing companies (max 5), comma separated"),
+    "business_model": ("{title} business model", "How the idea generates revenue or sustains itself, in one or two sentences"),
+    "technologies": ("{title} technologies", "Technologies potentially used, specific (max 5)"),
+    "why_now": ("{title} {humanity_challenge} trends", "Why this idea is relevant and timely now, 2-3 sentences"),
+    "potential_investors": ("{title} investors funding", "Potential investors as 'Company Name (Type of investor)' (max 5)"),
+    "potential_customers": ("{title} customers", "Potential customers as 'Company Name (Type of customer)' (max 5)"),
+    "collaboration_groups": ("{title} organizations", "Groups to collaborate with as 'Group Name (Type of group)' (max 5)"),
+}
+# Filled from the pages the other lookups read; searched on its own only when
+# it is the only field missing
+SOURCES_FIELD = "sources"
+SOURCES_QUERY = "{title} {category}"
+MAX_SOURCES = 3
+
+
+def _idea_summary(form: Dict[str, Any]) -> str:
+    return "\n".join(
+        f"{field}: {value}" for field, value in form.items()
+        if field in ("title", "humanity_challenge", "category", "problem_statement", "solution") and value
+    )
+
+
+class FieldEnricher:
+    """
+    Fills missing form fields with independent web lookups run in parallel.
+
+    Each enrichable field gets its own task: a web search, a parallel fetch
+    of the top result pages, then one structured completion that reads the
+    field from those pages. Each enrich() call runs its tasks on a thread
+    pool of its own (at most `workers` threads), so concurrent analyses never
+    queue behind each other's lookups, and the tasks share a time budget: a
+    sparse form takes about as long as its slowest lookup (never more than
+    the budget). Lookups that miss the budget are dropped,
+    and a lookup that is still running stops at its next stage (search,
+    fetch, extraction) so it does not hold a worker other analyses need.
+    """
+
+    def __init__(
+        self,
+        fetcher: Optional[WebFetcher] = None,
+        extractor: Optional[IdeaExtractor] = None,
+        workers: Optional[int] = None,
+        budget: Optional[float] = None,
+        pages_per_field: int = 2
+    ):
+        self.fetcher = fetcher
+        self.extractor = extractor
+        self.workers = workers or settings.ENRICHMENT_WORKERS
+        self.budget = budget or settings.ENRICHMENT_TASK_BUDGET_SECONDS
+        self.pages_per_field = pages_per_field
+
+        self.lookups = 0
+        self.filled = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.latency = LatencyRecorder()
+
+    def _lookup(self, field: str, form: Dict[str, Any], deadline: float) -> Dict[str, Any]:
+        # Nobody reads the outcome once the budget is spent; free the worker instead
+        expired = {"value": None, "pages": []}
+        if time.monotonic() >= deadline:
+            return expired
+        fetcher = self.fetcher or get_web_fetcher()
+        extractor = self.extractor or get_idea_extractor()
+        query_template, field_description = ENRICHABLE_FIELDS.get(field, (SOURCES_QUERY, ""))
+        query = query_template.format_map({k: form.get(k) or "" for k in ("title", "humanity_challenge", "category")})
+
+        results = fetcher.search_many([" ".join(query.split())])[0]
+        if isinstance(results, Exception):
+            raise results
+        if time.monotonic() >= deadline:
+            return expired
+        pages = [p for p in fetcher.fetch_many([r["url"] for r in results[:self.pages_per_field]]) if not p.error]
+        if not pages or field == SOURCES_FIELD:
+            return {"value": None, "pages": [(p.title, p.url) for p in pages]}
+        if time.monotonic() >= deadline:
+            return expired
+
+        page_text = "\n\n".join(f"# {p.title} ({p.url})\n{p.text}" for p in pages)
+        prompt = IdeaPrompts.get_enrichment_prompt(field, field_description, _idea_summary(form), page_text)
+        response_model = create_model(
+            f"Enrich_{field}", **{field: (IdeaExtraction.model_fields[field].annotation, None)}
+        )
+        value = getattr(extractor.complete_structured(prompt, response_model), field)
+        return {"value": value, "pages": [(p.title, p.url) for p in pages]}
+
+    def enrich(self, form: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """
+        Look up the given missing fields of a form in parallel. Returns the
+        fields that could be filled; the rest are left to the caller.
+        """
+        lookups = [f for f in fields if f in ENRICHABLE_FIELDS]
+        if SOURCES_FIELD in fields and not lookups:
+            lookups = [SOURCES_FIELD]
+        if not lookups:
+            return {}
+
+        started = time.perf_counter()
+        deadline = time.monotonic() + self.budget
+        executor = ThreadPoolExecutor(max_workers=min(len(lookups), self.workers), thread_name_prefix="enrichment")
+        futures = {executor.submit(self._lookup, field, form, deadline): field for field in lookups}
+        done, not_done = wait(futures, timeout=self.budget)
+        for future in not_done:
+            future.cancel()
+        # Lookups still running return at their next deadline check
+        executor.shutdown(wait=False)
+        self.timeouts += len(not_done)
+        self.lookups += len(futures)
+
+        enriched: Dict[str, Any] = {}
+        sources: List[str] = []
+        for future in done:
+            field = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as e:
+                print(f"Error enriching {field}: {str(e)}")
+                self.errors += 1
+                continue
+            if outcome["value"] not in (None, "", [], 0):
+                enriched[field] = outcome["value"]
+            for title, url in outcome["pages"]:
+                source = f"{title} ({url})" if title else url
+                if source not in sources:
+                    sources.append(source)
+        if SOURCES_FIELD in fields and sources:
+            enriched[SOURCES_FIELD] = sources[:MAX_SOURCES]
+
+        self.filled += len(enriched)
+        self.latency.record(time.perf_counter() - started)
+        return enriched
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lookup counts, fields filled and enrichment wall-clock time
+        """
+        return {
+            "workers": self.workers,
+            "budget_seconds": self.budget,
+            "lookups": self.lookups,
+            "filled": self.filled,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "latency_ms": self.latency.percentiles()
+        }
+
+
+# Process-wide enricher, created on first use
+_field_enricher: Optional[FieldEnricher] = None
+_field_enricher_lock = threading.Lock()
+
+def get_field_enricher() -> FieldEnricher:
+    """
+    Returns the process-wide field enricher
+    """
+    global _field_enricher
+    if _field_enricher is None:
+        with _field_enricher_lock:
+            if _field_enricher is None:
+                _field_enricher = FieldEnricher()
+    return _field_enricher
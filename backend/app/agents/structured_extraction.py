@@ -0,0 +1,104 @@
+import json
+import threading
+import time
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+import httpx
+
+from app.agents.idea_form import humanity_challenges, time_horizons, statuses, model_id
+from app.core.config import settings
+from app.core.metrics import LLM_CALL_DURATION, LLM_CALL_ERRORS, record_llm_usage
+from app.llms.llm_cache import LLMResponseCache, get_llm_cache
+from app.llms.prompts.idea_prompts import IdeaPrompts
+from app.schemas.idea import IdeaExtraction
+
+
+class IdeaExtractor:
+    """
+    Fills the submission form from an idea description with one
+    schema-constrained completion (OpenAI structured outputs).
+
+    The response is validated against IdeaExtraction, and only the fields
+    the model could answer are returned. Runs synchronously, like the agent
+    it sits in front of, and shares the LLM response cache.
+    """
+
+    def __init__(self, model: Optional[str] = None, temperature: float = 0.0):
+        from openai import OpenAI
+
+        self.model = model or model_id
+        self.temperature = temperature
+        self.client = OpenAI(
+            api_key=settings.OPENAI_API_KEY or None,
+            http_client=httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS
+                ),
+                timeout=httpx.Timeout(60.0)
+            )
+        )
+        self.cache = get_llm_cache() if settings.LLM_CACHE_ENABLED else None
+
+    def complete_structured(self, prompt: str, response_model: Type[BaseModel]) -> BaseModel:
+        """
+        One completion constrained to the JSON schema of response_model,
+        validated into an instance of it
+        """
+        key = LLMResponseCache.key(
+            self.model, self.temperature, {"schema": response_model.model_json_schema(), "prompt": prompt}
+        )
+        raw = self.cache.get(key) if self.cache is not None else None
+        if raw is None:
+            started = time.perf_counter()
+            try:
+                response = self.client.beta.chat.completions.parse(
+                    model=self.model,
+                    temperature=self.temperature,
+                    messages=[{"role": "user", "content": prompt}],
+                    response_format=response_model
+                )
+            except Exception:
+                LLM_CALL_ERRORS.inc(model=self.model, kind="structured")
+                raise
+            finally:
+                LLM_CALL_DURATION.observe(time.perf_counter() - started, model=self.model, kind="structured")
+            if response.usage is not None:
+                record_llm_usage(self.model, response.usage.prompt_tokens, response.usage.completion_tokens)
+            message = response.choices[0].message
+            if message.parsed is None:
+                raise ValueError(f"Extraction refused: {message.refusal}")
+            raw = message.content
+            if self.cache is not None:
+                self.cache.set(key, raw)
+        return response_model.model_validate(json.loads(raw))
+
+    def extract(self, description: str) -> Dict[str, Any]:
+        """
+        Form fields stated in the description; unanswered fields are left out
+        """
+        prompt = IdeaPrompts.get_extraction_prompt(description, humanity_challenges, time_horizons, statuses)
+        extraction = self.complete_structured(prompt, IdeaExtraction)
+        return {
+            field: value for field, value in extraction.model_dump().items()
+            if value not in (None, "", [])
+        }
+
+
+# Process-wide extractor, created on first use
+_idea_extractor: Optional[IdeaExtractor] = None
+_idea_extractor_lock = threading.Lock()
+
+def get_idea_extractor() -> IdeaExtractor:
+    """
+    Returns the process-wide idea extractor
+    """
+    global _idea_extractor
+    if _idea_extractor is None:
+        with _idea_extractor_lock:
+            if _idea_extractor is None:
+                _idea_extractor = IdeaExtractor()
+    return _idea_extractor
@@ -0,0 +1,370 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote_plus, unquote, urlparse
+
+import httpx
+
+from app.core.config import settings
+from app.core.latency import LatencyRecorder
+from app.core.sqlite_cache import SQLiteCache
+
+# Elements whose text is never useful to the model
+_SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "form",
+    "button", "select", "nav", "header", "footer", "aside", "menu"
+}
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "br", "li", "ul", "ol", "table", "tr",
+    "td", "th", "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "dd", "dt"
+}
+_HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+# Lines shorter than this are mostly menu items, buttons and bylines
+_MIN_LINE_CHARS = 30
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.lines: List[str] = []
+        self._current: List[str] = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._heading = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+            self._heading = tag in _HEADING_TAGS
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip_depth:
+            self._current.append(data)
+
+    def _flush(self):
+        line = " ".join("".join(self._current).split())
+        self._current = []
+        if line:
+            self.lines.append("## " + line if self._heading else line)
+        self._heading = False
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def extract_text(html: str, max_chars: Optional[int] = None) -> Tuple[str, str]:
+    """
+    Title and main text of an HTML page.
+
+    Drops scripts, navigation, headers/footers and forms, keeps headings, and
+    removes short and repeated lines (menus, share buttons, cookie banners).
+    The text is cut at max_chars.
+    """
+    parser = _TextExtractor()
+    try:
+        parser.feed(html)
+        parser.close()
+    except Exception:
+        # Malformed markup: keep whatever was parsed before the error
+        pass
+    seen = set()
+    lines = []
+    for line in parser.lines:
+        if line in seen or (len(line) < _MIN_LINE_CHARS and not line.startswith("## ")):
+            continue
+        seen.add(line)
+        lines.append(line)
+    text = "\n".join(lines)
+    if max_chars is not None and len(text) > max_chars:
+        text = text[:max_chars].rsplit(" ", 1)[0] + "\n...(truncated)"
+    return " ".join(parser.title.split()), text
+
+
+class _ResultParser(HTMLParser):
+    # Result links and snippets of the DuckDuckGo HTML endpoint
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.results: List[Dict[str, str]] = []
+        self._field: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        classes = (dict(attrs).get("class") or "").split()
+        if tag == "a" and "result__a" in classes:
+            self.results.append({"title": "", "url": _result_url(dict(attrs).get("href", "")), "snippet": ""})
+            self._field = "title"
+        elif "result__snippet" in classes and self.results:
+            self._field = "snippet"
+
+    def handle_endtag(self, tag):
+        if tag in ("a", "td", "div"):
+            self._field = None
+
+    def handle_data(self, data):
+        if self._field and self.results:
+            self.results[-1][self._field] += data
+
+
+def _result_url(href: str) -> str:
+    # DuckDuckGo wraps result links in a redirect: //duckduckgo.com/l/?uddg=<url>
+    parsed = urlparse(href)
+    if parsed.path.startswith("/l/"):
+        target = parse_qs(parsed.query).get("uddg")
+        if target:
+            return unquote(target[0])
+    return href
+
+
+@dataclass
+class Page:
+    """
+    A fetched page, reduced to the text that is passed to the model
+    """
+    url: str
+    status: int
+    title: str = ""
+    text: str = ""
+    error: Optional[str] = None
+    cached: bool = False
+    elapsed_ms: float = 0.0
+
+
+class WebFetcher:
+    """
+    Concurrent, cached fetch engine for the web tools.
+
+    Runs one httpx.AsyncClient (a keep-alive connection pool) on a private
+    event loop thread, so the synchronous agent tools in every agent thread
+    share connections. Requests to one host are capped by a per-host
+    semaphore, and several URLs or queries are fetched in parallel in one
+    call. Extracted page text is cached on disk by URL with a TTL.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[SQLiteCache] = None,
+        search_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_chars: Optional[int] = None
+    ):
+        self.cache = cache
+        self.search_url = search_url or settings.WEB_SEARCH_URL
+        self.max_connections = max_connections or settings.WEB_FETCH_MAX_CONNECTIONS
+        self.per_host = per_host or settings.WEB_FETCH_PER_HOST
+        self.timeout = timeout or settings.WEB_FETCH_TIMEOUT_SECONDS
+        self.max_bytes = max_bytes or settings.WEB_FETCH_MAX_BYTES
+        self.max_chars = max_chars or settings.WEB_PAGE_MAX_CHARS
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._start_lock = threading.Lock()
+
+        self.fetches = 0
+        self.cache_hits = 0
+        self.errors = 0
+        self.latency = LatencyRecorder()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            with self._start_lock:
+                if self._loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name="web-fetcher", daemon=True).start()
+                    self._client = httpx.AsyncClient(
+                        limits=httpx.Limits(
+                            max_connections=self.max_connections,
+                            max_keepalive_connections=self.max_connections
+                        ),
+                        timeout=httpx.Timeout(self.timeout),
+                        follow_redirects=True,
+                        headers={"User-Agent": "Mozilla/5.0 (compatible; TheWayForwardBot/1.0)"}
+                    )
+                    self._loop = loop
+        return self._loop
+
+    def _run(self, coro) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host)
+        return self._host_limits[host]
+
+    async def _get(self, url: str) -> Tuple[int, str, str]:
+        # Stream the body so oversized pages are cut off instead of downloaded in full
+        async with self._host_limit(url):
+            async with self._client.stream("GET", url) as response:
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) >= self.max_bytes:
+                        break
+                encoding = response.encoding or "utf-8"
+                return response.status_code, response.headers.get("content-type", ""), body.decode(encoding, errors="replace")
+
+    async def _fetch(self, url: str, use_cache: bool = True) -> Page:
+        key = "page:" + url
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return Page(**{**cached, "cached": True, "elapsed_ms": 0.0})
+
+        started = time.perf_counter()
+        self.fetches += 1
+        try:
+            status, content_type, body = await self._get(url)
+        except Exception as e:
+            self.errors += 1
+            return Page(url=url, status=0, error=f"Error fetching the webpage: {str(e)}")
+        elapsed = time.perf_counter() - started
+        self.latency.record(elapsed)
+
+        if status >= 400:
+            self.errors += 1
+            return Page(url=url, status=status, error=f"HTTP {status}", elapsed_ms=round(elapsed * 1000, 1))
+        if "html" in content_type or not content_type:
+            title, text = extract_text(body, self.max_chars)
+        elif content_type.startswith("text/") or "json" in content_type:
+            title, text = "", body[:self.max_chars]
+        else:
+            return Page(url=url, status=status, error=f"Unsupported content type: {content_type}")
+
+        page = Page(url=url, status=status, title=title, text=text, elapsed_ms=round(elapsed * 1000, 1))
+        if self.cache is not None:
+            self.cache.set(key, {"url": url, "status": status, "title": title, "text": text})
+        return page
+
+    async def _fetch_many(self, urls: List[str], use_cache: bool) -> List[Page]:
+        return list(await asyncio.gather(*(self._fetch(url, use_cache) for url in urls)))
+
+    def fetch_many(self, urls: List[str], use_cache: bool = True) -> List[Page]:
+        """
+        Fetch several pages in parallel; results are in the order of urls
+        """
+        return self._run(self._fetch_many(urls, use_cache))
+
+    def fetch(self, url: str, use_cache: bool = True) -> Page:
+        """
+        Fetch a single page
+        """
+        return self.fetch_many([url], use_cache)[0]
+
+    async def _search(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        key = f"search:{max_results}:{query}"
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache_hits += 1
+                return cached
+
+        url = self.search_url.format(query=quote_plus(query))
+        started = time.perf_counter()
+        self.fetches += 1
+        try:
+            status, _, body = await self._get(url)
+        except Exception as e:
+            self.errors += 1
+            raise RuntimeError(f"Search failed: {str(e)}")
+        self.latency.record(time.perf_counter() - started)
+        if status >= 400:
+            self.errors += 1
+            raise RuntimeError(f"Search failed: HTTP {status}")
+
+        parser = _ResultParser()
+        parser.feed(body)
+        results = [
+            {k: " ".join(v.split()) for k, v in result.items()}
+            for result in parser.results if result["url"]
+        ][:max_results]
+        if self.cache is not None and results:
+            self.cache.set(key, results)
+        return results
+
+    async def _search_many(self, queries: List[str], max_results: int) -> List[Any]:
+        return list(await asyncio.gather(
+            *(self._search(query, max_results) for query in queries), return_exceptions=True
+        ))
+
+    def search_many(self, queries: List[str], max_results: int = 8) -> List[Any]:
+        """
+        Run several searches in parallel. Each item is a list of results
+        (title, url, snippet) or the exception that search raised.
+        """
+        return self._run(self._search_many(queries, max_results))
+
+    def close(self) -> None:
+        """
+        Close the connection pool and stop the event loop thread
+        """
+        if self._loop is None:
+            return
+        self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+        self._client = None
+        self._host_limits = {}
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Fetch counts, page cache and fetch latency
+        """
+        return {
+            "fetches": self.fetches,
+            "cache_hits": self.cache_hits,
+            "errors": self.errors,
+            "hosts": len(self._host_limits),
+            "latency_ms": self.latency.percentiles(),
+            "cache": self.cache.stats() if self.cache is not None else None
+        }
+
+
+# Process-wide fetcher, created on first use by the web tools
+_web_fetcher: Optional[WebFetcher] = None
+_web_fetcher_lock = threading.Lock()
+
+def get_web_fetcher() -> WebFetcher:
+    """
+    Returns the process-wide web fetcher
+    """
+    global _web_fetcher
+    if _web_fetcher is None:
+        with _web_fetcher_lock:
+            if _web_fetcher is None:
+                _web_fetcher = WebFetcher(SQLiteCache(
+                    settings.WEB_CACHE_PATH,
+                    ttl=settings.WEB_CACHE_TTL_SECONDS,
+                    max_entries=settings.WEB_CACHE_MAX_ENTRIES,
+                    max_bytes=settings.WEB_CACHE_MAX_BYTES,
+                    name="web-pages"
+                ))
+    return _web_fetcher
+
+def web_fetcher_stats() -> Optional[Dict[str, Any]]:
+    """
+    Stats of the process-wide fetcher, or None if it has not been used yet
+    """
+    return _web_fetcher.stats() if _web_fetcher is not None else None
@@ -0,0 +1,92 @@
+from typing import Any, List, Optional, Union
+
+from smolagents import Tool
+
+from app.agents.tools.web_fetcher import WebFetcher, get_web_fetcher
+from app.core.metrics import AGENT_TOOL_DURATION, AGENT_TOOL_ERRORS, instrument
+
+# Upper bound on queries/URLs handled by one tool call
+MAX_FAN_OUT = 5
+
+
+def _as_list(value: Union[str, List[str]]) -> List[str]:
+    # The model passes either one value or a list; also accept a JSON-ish string of several
+    if isinstance(value, str):
+        value = [value]
+    items = []
+    for item in value:
+        item = str(item).strip()
+        if item and item not in items:
+            items.append(item)
+    return items[:MAX_FAN_OUT]
+
+
+class WebSearchTool(Tool):
+    name = "web_search"
+    description = (
+        "Searches the web and returns the top results (title, url and snippet) for each query. "
+        "Pass a list of up to 5 queries to run them in parallel in one call."
+    )
+    inputs = {
+        "queries": {
+            "type": "array",
+            "description": "The search query, or a list of search queries, to perform."
+        }
+    }
+    output_type = "string"
+
+    def __init__(self, fetcher: Optional[WebFetcher] = None, max_results: int = 8, **kwargs):
+        super().__init__(**kwargs)
+        self.fetcher = fetcher
+        self.max_results = max_results
+
+    @instrument(AGENT_TOOL_DURATION, AGENT_TOOL_ERRORS, tool="web_search")
+    def forward(self, queries: Any) -> str:
+        queries = _as_list(queries)
+        if not queries:
+            return "No query given."
+        fetcher = self.fetcher or get_web_fetcher()
+        sections = []
+        for query, results in zip(queries, fetcher.search_many(queries, self.max_results)):
+            if isinstance(results, Exception):
+                sections.append(f"## Results for: {query}\n\n{str(results)}")
+            elif not results:
+                sections.append(f"## Results for: {query}\n\nNo results found! Try a less restrictive/shorter query.")
+            else:
+                lines = [f"[{r['title']}]({r['url']})\n{r['snippet']}" for r in results]
+                sections.append(f"## Results for: {query}\n\n" + "\n\n".join(lines))
+        return "\n\n".join(sections)
+
+
+class VisitWebpagesTool(Tool):
+    name = "visit_webpage"
+    description = (
+        "Visits one or more webpages and returns the main text of each, without navigation or boilerplate. "
+        "Pass a list of up to 5 urls to read them in parallel in one call."
+    )
+    inputs = {
+        "urls": {
+            "type": "array",
+            "description": "The url, or a list of urls, of the webpages to visit."
+        }
+    }
+    output_type = "string"
+
+    def __init__(self, fetcher: Optional[WebFetcher] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.fetcher = fetcher
+
+    @instrument(AGENT_TOOL_DURATION, AGENT_TOOL_ERRORS, tool="visit_webpage")
+    def forward(self, urls: Any) -> str:
+        urls = _as_list(urls)
+        if not urls:
+            return "No url given."
+        fetcher = self.fetcher or get_web_fetcher()
+        sections = []
+        for page in fetcher.fetch_many(urls):
+            if page.error:
+                sections.append(f"# {page.url}\n\n{page.error}")
+            else:
+                heading = f"# {page.title} ({page.url})" if page.title else f"# {page.url}"
+                sections.append(f"{heading}\n\n{page.text}")
+        return "\n\n".join(sections)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import ideas, llms, agents
+from app.api.v1.endpoints import ideas, llms, agents, stats, health
 
 api_router = APIRouter()
 
@@ -8,4 +8,6 @@ api_router.include_router(ideas.router, prefix="/ideas", tags=["ideas"])
 # api_router.include_router(podcasts.router, prefix="/podcasts", tags=["podcasts"])
 # api_router.include_router(resources.router, prefix="/resources", tags=["resources"])
 api_router.include_router(llms.router, prefix="/llms", tags=["llms"])
-api_router.include_router(agents.router, prefix="/agents", tags=["agents"]) 
\ No newline at end of file
+api_router.include_router(agents.router, prefix="/agents", tags=["agents"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(health.router, prefix="/health", tags=["health"])
@@ -1,8 +1,17 @@
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel
-from typing import Dict, Any
+import asyncio
+import threading
 
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
+from pydantic import BaseModel, Field
+from typing import Dict, Any, AsyncIterator, List, Literal, Optional
+
+from app.core.config import settings
+from app.core.sse import sse_event
 from app.services.agent_service import AgentService
+from app.services.batch_analysis_service import BatchAnalysisService
+from app.services.job_service import get_job_service, JobQueueFullError, ANALYZE_IDEA_JOB
 
 router = APIRouter()
 service = AgentService()
@@ -13,11 +22,48 @@ class IdeaDescriptionRequest(BaseModel):
     description: str
 
 
+class BatchAnalysisRequest(BaseModel):
+    """Request model for analyzing many idea descriptions at once."""
+    descriptions: List[str]
+    concurrency: Optional[int] = Field(None, ge=1, description="Analyses in flight at once")
+    item_budget_seconds: Optional[float] = Field(None, gt=0, description="Time allowed per description")
+    persist: bool = Field(False, description="Save each analyzed idea")
+    author: Optional[str] = None
+    type_of_author: Literal["Curator", "Agent"] = "Curator"
+
+
 class IdeaAnalysisResponse(BaseModel):
     """Response model for idea analysis."""
     form_data: Dict[str, Any]
 
 
+class JobResponse(BaseModel):
+    """Status of a background analysis job."""
+    id: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+def _job_response(job: Dict[str, Any]) -> JobResponse:
+    result = job["result"]
+    if result is not None:
+        # Same rule as the synchronous endpoint: never return author fields
+        result = {k: v for k, v in result.items() if k not in ("author", "type_of_author")}
+    return JobResponse(
+        id=job["id"],
+        status=job["status"],
+        result=result,
+        error=job["error"],
+        created_at=job["created_at"],
+        started_at=job["started_at"],
+        finished_at=job["finished_at"]
+    )
+
+
 @router.post("/analyze-idea", response_model=IdeaAnalysisResponse)
 def analyze_idea(request: IdeaDescriptionRequest):
     """
@@ -89,3 +135,143 @@ def analyze_idea(request: IdeaDescriptionRequest):
             "status": "",
             "sources": []
         })
+
+
+@router.post("/analyze-idea/stream")
+async def stream_analyze_idea(request: IdeaDescriptionRequest, http_request: Request):
+    """
+    Analyze an idea description and stream the progress as server-sent events.
+    
+    Events: "planning" (the agent's plan), "step" (one per agent step, with the
+    agents and tools it called and its duration), "partial" (form fields as soon
+    as they are known, normalized like the final result), then "result" with
+    the complete form data, or "error". The analysis is cancelled (at the
+    next agent step) as soon as the client disconnects.
+    """
+    if not request.description or not request.description.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Description cannot be empty")
+    
+    cancel_event = threading.Event()
+    
+    async def watch_disconnect() -> None:
+        # Steps can take minutes; notice a disconnect while waiting for the next one
+        while not cancel_event.is_set():
+            if await http_request.is_disconnected():
+                cancel_event.set()
+                return
+            await asyncio.sleep(1.0)
+    
+    async def events() -> AsyncIterator[str]:
+        watcher = asyncio.create_task(watch_disconnect())
+        try:
+            async for event in iterate_in_threadpool(service.stream_analysis(request.description, cancel_event)):
+                if cancel_event.is_set():
+                    return
+                data = event["data"]
+                if event["event"] in ("partial", "result"):
+                    # Same rule as the synchronous endpoint: never return author fields
+                    data = {k: v for k, v in data.items() if k not in ("author", "type_of_author")}
+                yield sse_event(event["event"], data)
+        except Exception as e:
+            print(f"Error in analyze_idea stream: {str(e)}")
+            yield sse_event("error", {"detail": "Error analyzing idea"})
+        finally:
+            # Disconnected, cancelled or finished: stop the agents either way
+            cancel_event.set()
+            watcher.cancel()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/analyze-ideas/batch")
+async def analyze_ideas_batch(request: BatchAnalysisRequest):
+    """
+    Analyze many idea descriptions concurrently and stream each result as
+    server-sent events as soon as it is ready.
+    
+    Events: "result" per description ({index, status, form_data and/or error,
+    duration_ms}; status is "ok", "invalid" (unparseable or incomplete
+    analysis, never saved), "error" or "timeout"), "persisted" per saved
+    idea when persist is set ({index, status, idea_id or error}), then "done"
+    with a summary of the batch.
+    """
+    descriptions = [d.strip() for d in request.descriptions]
+    if not descriptions or not all(descriptions):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Descriptions cannot be empty")
+    if len(descriptions) > settings.AGENT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.AGENT_BATCH_MAX_ITEMS} descriptions per batch"
+        )
+    if request.persist and not (request.author and request.author.strip()):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="An author is required to save ideas")
+    
+    batch = BatchAnalysisService(agent_service=service).analyze_batch(
+        descriptions,
+        concurrency=request.concurrency,
+        item_budget=request.item_budget_seconds,
+        persist=request.persist,
+        author=(request.author or "").strip(),
+        type_of_author=request.type_of_author
+    )
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in batch:
+                yield sse_event(event["event"], event["data"])
+        except Exception as e:
+            print(f"Error in analyze_ideas batch: {str(e)}")
+            yield sse_event("error", {"detail": "Error analyzing ideas"})
+        finally:
+            await batch.aclose()
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/analyze-idea/jobs", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+def submit_analyze_idea_job(request: IdeaDescriptionRequest):
+    """
+    Queue an idea description for analysis and return the job right away.
+    
+    Poll GET /agents/jobs/{job_id} for the result.
+    """
+    if not request.description or not request.description.strip():
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Description cannot be empty")
+    try:
+        job = get_job_service().submit(ANALYZE_IDEA_JOB, {"description": request.description})
+    except JobQueueFullError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    return _job_response(job)
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+def get_job(job_id: str):
+    """
+    Get the status of an analysis job, and its result once it has finished
+    """
+    job = get_job_service().get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return _job_response(job)
+
+
+@router.delete("/jobs/{job_id}", response_model=JobResponse)
+def cancel_job(job_id: str):
+    """
+    Cancel a queued or running analysis job
+    """
+    job = get_job_service().cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    if job["status"] != "cancelled":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Job already {job['status']}")
+    return _job_response(job)
+
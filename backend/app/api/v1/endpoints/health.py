@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Response
+from typing import Dict, Any
+
+from app.agents.agent_stack import get_agent_stack
+from app.core.config import settings
+from app.search.idea_search_index import get_idea_search_index
+
+router = APIRouter()
+
+@router.get("")
+async def health() -> Dict[str, Any]:
+    """
+    Liveness: the process is up and serving requests
+    """
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def ready(response: Response) -> Dict[str, Any]:
+    """
+    Readiness, with the warm state of the agent stack.
+
+    When AGENT_WARMUP is enabled, returns 503 until the warm-up has finished
+    so traffic is only routed to the instance once analyses are fast.
+    """
+    agents = get_agent_stack().state()
+    # A failed warm-up does not keep the instance out of rotation; the
+    # stack is loaded again on the first analysis
+    is_ready = agents["warm"] or not settings.AGENT_WARMUP or (agents["error"] is not None and not agents["warming"])
+    if not is_ready:
+        response.status_code = 503
+    return {
+        "status": "ready" if is_ready else "warming",
+        "agents": agents,
+        "search_index_ready": get_idea_search_index().ready
+    }
@@ -1,14 +1,20 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, status
+from fastapi import APIRouter, HTTPException, Header, Query, Depends, Request, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import List, Optional
 from uuid import UUID
-from app.schemas.idea import IdeaCreate, IdeaUpdate, IdeaResponse
-from app.services.idea_service import IdeaService
+from app.schemas.idea import (
+    IdeaCreate, IdeaUpdate, IdeaResponse, IdeaPage, IdeaSearchResponse, SimilarIdea, IdeaImportReport,
+    IdeaFacets, TrendingIdeas
+)
+from app.services.idea_service import IdeaService, idea_etag, ideas_etag
+from app.core.config import settings
+from app.core.etag import etag_matches, not_modified
 
 router = APIRouter()
 service = IdeaService()
 
 @router.get("/", response_model=List[IdeaResponse])
-def get_ideas(
+async def get_ideas(
     limit: int = Query(100, ge=1, le=100),
     offset: int = Query(0, ge=0),
     category: Optional[str] = None,
@@ -16,10 +22,14 @@ def get_ideas(
     status: Optional[str] = None,
     humanity_challenge: Optional[str] = None,
     title: Optional[str] = None,
-    problem_statement: Optional[str] = None
+    problem_statement: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
     """
-    Get all ideas with optional filtering
+    Get all ideas with optional filtering.
+    
+    Responses carry an ETag; send it back as If-None-Match to get a 304 when
+    no idea on the page has been edited, voted on or viewed since.
     """
     if any([category, sub_category, status, humanity_challenge, title, problem_statement]):
         query_params = {
@@ -32,77 +42,236 @@ def get_ideas(
         }
         # Remove None values
         query_params = {k: v for k, v in query_params.items() if v is not None}
-        return service.search_ideas(query_params)
-    return service.get_all_ideas(limit, offset)
+        # Answered from the caches when possible, without a database query
+        etag = service.search_ideas_etag(query_params)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.IDEA_CACHE_CONTROL)
+        ideas = await service.search_ideas(query_params)
+    else:
+        etag = service.get_all_ideas_etag(limit, offset)
+        if etag and etag_matches(if_none_match, etag):
+            return not_modified(etag, settings.IDEA_CACHE_CONTROL)
+        ideas = await service.get_all_ideas(limit, offset)
+    
+    etag = ideas_etag(ideas)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.IDEA_CACHE_CONTROL)
+    # The service has already validated every row as an IdeaResponse; returning
+    # a response directly skips FastAPI's second validation and serialization pass
+    return ORJSONResponse(
+        [idea.model_dump() for idea in ideas],
+        headers={"ETag": etag, "Cache-Control": settings.IDEA_CACHE_CONTROL}
+    )
+
+@router.get("/page", response_model=IdeaPage)
+async def get_ideas_page(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description="'summary' (default), 'all' or comma-separated columns"),
+    category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    status: Optional[str] = None,
+    humanity_challenge: Optional[str] = None
+):
+    """
+    Get ideas newest first with cursor pagination and column projection
+    """
+    filters = {
+        "category": category,
+        "sub_category": sub_category,
+        "status": status,
+        "humanity_challenge": humanity_challenge
+    }
+    try:
+        page = await service.get_ideas_page(limit, cursor, fields, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Projected items only carry the selected columns
+    return ORJSONResponse(page.model_dump(exclude_unset=True))
+
+@router.get("/export")
+async def export_ideas(
+    fields: Optional[str] = Query(None, description="'all' (default), 'summary' or comma-separated columns"),
+    category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    status: Optional[str] = None,
+    humanity_challenge: Optional[str] = None
+):
+    """
+    Stream every idea, newest first, as NDJSON (one JSON object per line)
+    """
+    filters = {
+        "category": category,
+        "sub_category": sub_category,
+        "status": status,
+        "humanity_challenge": humanity_challenge
+    }
+    try:
+        lines = service.export_ideas(fields, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="ideas.ndjson"'}
+    )
+
+@router.post("/import", response_model=IdeaImportReport)
+async def import_ideas(
+    request: Request,
+    batch_size: Optional[int] = Query(None, ge=1, le=1000, description="Rows per multi-row insert")
+):
+    """
+    Create ideas from an NDJSON request body, one idea per line.
+
+    The body is read as it is uploaded. Invalid lines are reported in the
+    response with their line numbers and do not stop the import.
+    """
+    return await service.import_ideas(request.stream(), batch_size)
+
+@router.get("/search", response_model=IdeaSearchResponse)
+async def search_ideas(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    category: Optional[str] = None,
+    sub_category: Optional[str] = None,
+    status: Optional[str] = None,
+    humanity_challenge: Optional[str] = None
+):
+    """
+    Ranked full-text search over title, problem statement, solution and technologies
+    """
+    filters = {
+        "category": category,
+        "sub_category": sub_category,
+        "status": status,
+        "humanity_challenge": humanity_challenge
+    }
+    return await service.full_text_search(q, limit, offset, filters)
+
+@router.get("/facets", response_model=IdeaFacets)
+async def get_idea_facets():
+    """
+    Number of ideas per humanity challenge, category, sub-category and status.
+    
+    Served from in-memory counts kept current by every write and reconciled
+    with the database periodically; ready is false until the startup scan
+    has finished.
+    """
+    return service.get_facets()
+
+@router.get("/trending", response_model=TrendingIdeas)
+async def get_trending_ideas(
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0)
+):
+    """
+    Published ideas ranked by hot score: net upvotes, views and featured
+    status, decayed with the idea's age (see the TRENDING_* settings).
+    
+    Served from an in-memory ranking updated on every vote and view; ready
+    is false until the startup scan has finished.
+    """
+    return service.get_trending(limit, offset)
 
 @router.get("/{idea_id}", response_model=IdeaResponse)
-def get_idea(idea_id: UUID):
+async def get_idea(idea_id: UUID, if_none_match: Optional[str] = Header(None)):
     """
-    Get an idea by its ID
+    Get an idea by its ID.
+    
+    Responses carry an ETag; send it back as If-None-Match to get a 304 when
+    the idea has not been edited or voted on since. A 304 does not count as
+    a view.
     """
-    idea = service.get_idea_by_id(idea_id)
+    # Answered from the idea cache when possible, without a database query
+    etag = service.get_idea_etag(idea_id)
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.IDEA_CACHE_CONTROL)
+    
+    idea = await service.get_idea_by_id(idea_id)
     if not idea:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idea not found")
+    etag = idea_etag(idea)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, settings.IDEA_CACHE_CONTROL)
     
     # Increment view count
-    service.view_idea(idea_id)
+    await service.view_idea(idea_id)
     
-    return idea
+    return ORJSONResponse(
+        idea.model_dump(),
+        headers={"ETag": etag, "Cache-Control": settings.IDEA_CACHE_CONTROL}
+    )
+
+@router.get("/{idea_id}/similar", response_model=List[SimilarIdea])
+async def get_similar_ideas(idea_id: UUID, k: int = Query(5, ge=1, le=50)):
+    """
+    Get the ideas most similar to an idea, from the vector index
+    """
+    similar = service.get_similar_ideas(idea_id, k)
+    if similar is None:
+        # Not embedded (yet): distinguish a missing idea from a pending one
+        idea = await service.get_idea_by_id(idea_id)
+        if not idea:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idea not found")
+        return []
+    return similar
 
 @router.post("/", response_model=IdeaResponse, status_code=status.HTTP_201_CREATED)
-def create_idea(idea: IdeaCreate):
+async def create_idea(idea: IdeaCreate):
     """
     Create a new idea
     """
-    return service.create_idea(idea)
+    return await service.create_idea(idea)
 
 @router.put("/{idea_id}", response_model=IdeaResponse)
-def update_idea(idea_id: UUID, idea: IdeaUpdate):
+async def update_idea(idea_id: UUID, idea: IdeaUpdate):
     """
     Update an existing idea
     """
     # Check if idea exists
-    existing_idea = service.get_idea_by_id(idea_id)
+    existing_idea = await service.get_idea_by_id(idea_id)
     if not existing_idea:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idea not found")
     
-    updated_idea = service.update_idea(idea_id, idea)
+    updated_idea = await service.update_idea(idea_id, idea)
     return updated_idea
 
 @router.delete("/{idea_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_idea(idea_id: UUID):
+async def delete_idea(idea_id: UUID):
     """
     Delete an idea
     """
     # Check if idea exists
-    existing_idea = service.get_idea_by_id(idea_id)
+    existing_idea = await service.get_idea_by_id(idea_id)
     if not existing_idea:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idea not found")
     
-    success = service.delete_idea(idea_id)
+    success = await service.delete_idea(idea_id)
     if not success:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to delete idea")
 
 @router.post("/{idea_id}/upvote", status_code=status.HTTP_204_NO_CONTENT)
-def upvote_idea(idea_id: UUID):
+async def upvote_idea(idea_id: UUID):
     """
     Upvote an idea
     """
     # Check if idea exists
-    idea = service.get_idea_by_id(idea_id)
+    idea = await service.get_idea_by_id(idea_id)
     if not idea:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idea not found")
     
-    service.upvote_idea(idea_id)
+    await service.upvote_idea(idea_id)
 
 @router.post("/{idea_id}/downvote", status_code=status.HTTP_204_NO_CONTENT)
-def downvote_idea(idea_id: UUID):
+async def downvote_idea(idea_id: UUID):
     """
     Downvote an idea
     """
     # Check if idea exists
-    idea = service.get_idea_by_id(idea_id)
+    idea = await service.get_idea_by_id(idea_id)
     if not idea:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Idea not found")
     
-    service.downvote_idea(idea_id) 
\ No newline at end of file
+    await service.downvote_idea(idea_id) 
\ No newline at end of file
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
+from app.core.sse import sse_event
 from app.services.llm_service import LLMService
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 router = APIRouter()
 
@@ -26,3 +28,30 @@ async def improve_text(request: TextImprovementRequest):
         return TextImprovementResponse(improved_text=improved_text)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/improve-text/stream")
+async def improve_text_stream(request: TextImprovementRequest):
+    """
+    Improve an idea description, streaming the text as server-sent events.
+    
+    Sends a "token" event per chunk of text, then "done", or "error" if the
+    LLM call fails part-way.
+    """
+    if not request.text or not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+    
+    llm_service = LLMService()
+    
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for chunk in llm_service.stream_improved_idea_text(request.text):
+                yield sse_event("token", {"text": chunk})
+            yield sse_event("done", {})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
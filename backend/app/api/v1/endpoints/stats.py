@@ -0,0 +1,106 @@
+from fastapi import APIRouter
+from typing import Dict, Any
+
+from app.services.counter_service import get_counter_service
+from app.services.idea_service import get_idea_cache, get_idea_list_cache
+from app.search.idea_search_index import get_idea_search_index
+from app.search.vector_index import get_vector_index
+from app.search.facet_index import get_facet_index
+from app.search.trending_index import get_trending_index
+from app.services.agent_service import AgentService
+from app.services.job_service import get_job_service
+from app.llms.llm_basics import get_llm_stats
+from app.agents.tools.web_fetcher import web_fetcher_stats
+
+router = APIRouter()
+
+@router.get("/counters")
+async def get_counter_stats() -> Dict[str, Any]:
+    """
+    Write-behind counter buffer size and flush lag
+    """
+    return get_counter_service().stats()
+
+@router.get("/cache")
+async def get_cache_stats() -> Dict[str, Any]:
+    """
+    Idea cache size and hit/miss/eviction counters
+    """
+    return get_idea_cache().stats()
+
+@router.get("/list-cache")
+async def get_list_cache_stats() -> Dict[str, Any]:
+    """
+    Size and hit/miss counters of the list page membership cache used for list ETags
+    """
+    return get_idea_list_cache().stats()
+
+@router.get("/search")
+async def get_search_stats() -> Dict[str, Any]:
+    """
+    Search index size and query latency
+    """
+    return get_idea_search_index().stats()
+
+@router.get("/vectors")
+async def get_vector_stats() -> Dict[str, Any]:
+    """
+    Vector index size, embedding backlog and query latency
+    """
+    return get_vector_index().stats()
+
+@router.get("/facets")
+async def get_facet_stats() -> Dict[str, Any]:
+    """
+    Facet count index size and drift found by the last reconcile
+    """
+    return get_facet_index().stats()
+
+@router.get("/trending")
+async def get_trending_stats() -> Dict[str, Any]:
+    """
+    Trending ranking size, refresh history and query latency
+    """
+    return get_trending_index().stats()
+
+@router.get("/agent-cache")
+async def get_agent_cache_stats() -> Dict[str, Any]:
+    """
+    Analyze-idea result cache hits/misses and single-flight sharing
+    """
+    return AgentService().cache_stats()
+
+@router.get("/agents")
+async def get_agent_pool_stats() -> Dict[str, Any]:
+    """
+    Agent pool occupancy and checkout wait time
+    """
+    return AgentService().pool_stats()
+
+@router.get("/analysis")
+async def get_analysis_tier_stats() -> Dict[str, Any]:
+    """
+    Analyze-idea completions and latency per pipeline tier (cache, extraction, agent)
+    """
+    return AgentService().tier_stats()
+
+@router.get("/jobs")
+async def get_job_stats() -> Dict[str, Any]:
+    """
+    Background job queue depth and worker occupancy
+    """
+    return get_job_service().stats()
+
+@router.get("/llm")
+async def get_llm_latency_stats() -> Dict[str, Any]:
+    """
+    LLM completion latency and time-to-first-token
+    """
+    return get_llm_stats()
+
+@router.get("/web")
+async def get_web_fetch_stats() -> Dict[str, Any]:
+    """
+    Web tool fetches, page cache hits and fetch latency
+    """
+    return web_fetcher_stats() or {"fetches": 0}
@@ -0,0 +1,89 @@
+import gzip
+from typing import Any, Dict, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+# Complete documents that are worth compressing; streamed types (server-sent
+# events, NDJSON) are left alone, since a compressor would hold their small
+# chunks back until it had enough data to emit
+COMPRESSIBLE_TYPES: Tuple[str, ...] = ("application/json",)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip. A coding is acceptable
+    unless its q-value is 0; gzip is also allowed through "*" when it is not
+    listed itself.
+    """
+    qualities: Dict[str, float] = {}
+    for token in accept_encoding.split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    if "gzip" in qualities:
+        return qualities["gzip"] > 0
+    return qualities.get("*", 0.0) > 0
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware that gzips large JSON response bodies.
+
+    The body of a compressible response is collected (it may arrive in several
+    messages when it passes through other middleware) and compressed in one
+    go once complete, if it is at least minimum_size bytes. Everything else,
+    including all streaming responses, passes through untouched.
+    """
+
+    def __init__(self, app: Any, minimum_size: int = 1024, compresslevel: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not accepts_gzip(Headers(scope=scope).get("accept-encoding", "")):
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compress = False
+        chunks = []
+
+        async def send_wrapper(message):
+            nonlocal start_message, compress
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                compress = (
+                    headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                    and "content-encoding" not in headers
+                )
+                if compress:
+                    start_message = message
+                    return
+            elif message["type"] == "http.response.body" and compress:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                body = b"".join(chunks)
+                headers = MutableHeaders(raw=start_message["headers"])
+                if len(body) >= self.minimum_size:
+                    body = gzip.compress(body, compresslevel=self.compresslevel)
+                    headers["Content-Encoding"] = "gzip"
+                    headers.add_vary_header("Accept-Encoding")
+                headers["Content-Length"] = str(len(body))
+                await send(start_message)
+                await send({"type": "http.response.body", "body": body, "more_body": False})
+                return
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
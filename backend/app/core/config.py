@@ -27,10 +27,126 @@ class Settings(BaseSettings):
     # Supabase Settings
     SUPABASE_URL: str = os.getenv("SUPABASE_URL", "")
     SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "")
+    # Use the async Supabase client for the ideas API. When False, the blocking
+    # client is used and every call runs in Starlette's threadpool instead.
+    IDEAS_ASYNC_CLIENT: bool = True
     
     # LLM Settings
     OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
     ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")  # Keep as backup
+    # Connection pool of the shared LLM client
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 60.0
+    # LLM Response Cache Settings (completions keyed by model, temperature and prompt hash)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "data/llm_cache.sqlite3")
+    LLM_CACHE_TTL_SECONDS: float = 24 * 3600
+    LLM_CACHE_MEMORY_MAX_ENTRIES: int = 2000
+    LLM_CACHE_MEMORY_MAX_BYTES: int = 8 * 1024 * 1024
+    LLM_CACHE_MAX_ENTRIES: int = 20000
+    LLM_CACHE_MAX_BYTES: int = 100 * 1024 * 1024
+    
+    # Counter Settings (write-behind view/vote counters)
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 2.0
+    COUNTER_FLUSH_MAX_PENDING: int = 500
+    
+    # Idea Cache Settings (read-through cache in front of IdeaService.get_idea_by_id)
+    IDEA_CACHE_MAX_ENTRIES: int = 1000
+    IDEA_CACHE_TTL_SECONDS: float = 60.0
+    # Which ideas each recently served list page held, so list ETags can be
+    # recomputed from the idea cache without querying the database
+    IDEA_LIST_CACHE_MAX_ENTRIES: int = 500
+    IDEA_LIST_CACHE_TTL_SECONDS: float = 10.0
+    # Sent with idea list and detail responses (and their 304s)
+    IDEA_CACHE_CONTROL: str = "public, max-age=5, stale-while-revalidate=30"
+    
+    # Response Compression Settings (complete bodies only; streams are not compressed)
+    RESPONSE_GZIP_MIN_BYTES: int = 1024
+    RESPONSE_GZIP_LEVEL: int = 4
+    
+    # Bulk Export/Import Settings (NDJSON)
+    IDEA_EXPORT_BATCH_SIZE: int = 500
+    IDEA_IMPORT_BATCH_SIZE: int = 200
+    IDEA_IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+    
+    # Facet Count Settings (GET /ideas/facets, kept in memory)
+    # Recount from a scan of the facet columns every interval to fix any drift
+    FACET_RECONCILE_INTERVAL_SECONDS: float = 600.0
+    FACET_RECONCILE_BATCH_SIZE: int = 1000
+    
+    # Trending Settings (GET /ideas/trending, ranked in memory)
+    # Hot score = (1 + points) halved every half-life since the idea was created, where
+    # points = vote weight * net upvotes + view weight * views + featured bonus
+    TRENDING_HALF_LIFE_HOURS: float = 72.0
+    TRENDING_VOTE_WEIGHT: float = 1.0
+    TRENDING_VIEW_WEIGHT: float = 0.1
+    TRENDING_FEATURED_BONUS: float = 10.0
+    # Re-read counters from the database (votes recorded by other processes) every interval
+    TRENDING_REFRESH_INTERVAL_SECONDS: float = 300.0
+    TRENDING_REFRESH_BATCH_SIZE: int = 1000
+    
+    # Similar Ideas Settings
+    EMBEDDER: str = "openai"  # "openai" or "hashing" (local, deterministic)
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_DIM: int = 512
+    VECTOR_INDEX_DIR: str = os.getenv("VECTOR_INDEX_DIR", "data/vector_index")
+    SIMILAR_IDEAS_COUNT: int = 5
+    
+    # Agent Pool Settings (isolated agent sets, one per concurrent analysis)
+    AGENT_POOL_SIZE: int = 4
+    AGENT_POOL_TIMEOUT_SECONDS: float = 300.0
+    # Load the agent stack and build agent sets in the background at startup,
+    # instead of on the first analysis
+    AGENT_WARMUP: bool = False
+    AGENT_WARMUP_SETS: int = 1
+    
+    # Batch Analysis Settings (POST /agents/analyze-ideas/batch)
+    AGENT_BATCH_MAX_ITEMS: int = 100
+    AGENT_BATCH_CONCURRENCY: int = 4
+    AGENT_BATCH_MAX_CONCURRENCY: int = 8
+    AGENT_BATCH_ITEM_BUDGET_SECONDS: float = 180.0
+    # Analyzed ideas are written (when requested) once this many are ready
+    AGENT_BATCH_PERSIST_BATCH_SIZE: int = 10
+    
+    # Agent Result Cache Settings (analyze-idea results, keyed by normalized description)
+    AGENT_CACHE_PATH: str = os.getenv("AGENT_CACHE_PATH", "data/agent_cache.sqlite3")
+    AGENT_CACHE_TTL_SECONDS: float = 7 * 24 * 3600
+    AGENT_CACHE_MAX_ENTRIES: int = 5000
+    AGENT_CACHE_MAX_BYTES: int = 50 * 1024 * 1024
+    # Bump to invalidate every cached analysis after changing the agent setup
+    AGENT_CACHE_VERSION: str = "2"
+    
+    # Try a single structured-output extraction before running the agent, and
+    # only send the agent the fields it could not fill
+    AGENT_EXTRACTION_ENABLED: bool = True
+    # Look up fields extraction left empty with parallel web lookups (one per
+    # field, sharing a time budget) before falling back to the agent
+    ENRICHMENT_ENABLED: bool = True
+    # Parallel lookups per analysis; 8 covers every enrichable field in one round
+    ENRICHMENT_WORKERS: int = 8
+    ENRICHMENT_TASK_BUDGET_SECONDS: float = 45.0
+    
+    # Web Tool Settings (pooled fetcher and page cache used by web_agent)
+    # {query} is replaced by the URL-encoded query
+    WEB_SEARCH_URL: str = os.getenv("WEB_SEARCH_URL", "https://html.duckduckgo.com/html/?q={query}")
+    WEB_FETCH_MAX_CONNECTIONS: int = 20
+    WEB_FETCH_PER_HOST: int = 4
+    WEB_FETCH_TIMEOUT_SECONDS: float = 15.0
+    WEB_FETCH_MAX_BYTES: int = 2 * 1024 * 1024
+    WEB_PAGE_MAX_CHARS: int = 6000
+    WEB_CACHE_PATH: str = os.getenv("WEB_CACHE_PATH", "data/web_cache.sqlite3")
+    WEB_CACHE_TTL_SECONDS: float = 6 * 3600
+    WEB_CACHE_MAX_ENTRIES: int = 5000
+    WEB_CACHE_MAX_BYTES: int = 100 * 1024 * 1024
+    
+    # Background Job Settings (asynchronous analyze-idea jobs)
+    JOB_STORE_PATH: str = os.getenv("JOB_STORE_PATH", "data/jobs.sqlite3")
+    JOB_WORKERS: int = 2
+    JOB_QUEUE_MAX_DEPTH: int = 100
+    # Finished jobs (and their results) are deleted this long after they end
+    JOB_RETENTION_SECONDS: float = 7 * 24 * 3600
+    JOB_CLEANUP_INTERVAL_SECONDS: float = 3600
     
     class Config:
         case_sensitive = True
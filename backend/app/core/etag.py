@@ -0,0 +1,41 @@
+import hashlib
+from typing import Iterable, Optional
+
+from starlette.responses import Response
+
+
+def weak_etag(parts: Iterable[str]) -> str:
+    """
+    Weak ETag over the given version strings. Weak, because the same
+    representation may be sent with different encodings (gzip or not).
+    """
+    digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against an ETag
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None) -> Response:
+    """
+    304 response carrying the validators a cache needs to refresh its entry
+    """
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    return Response(status_code=304, headers=headers)
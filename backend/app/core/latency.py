@@ -0,0 +1,30 @@
+import threading
+from collections import deque
+from typing import Dict
+
+
+class LatencyRecorder:
+    """
+    Keeps the most recent durations (in seconds) and reports percentiles in ms
+    """
+
+    def __init__(self, window: int = 1000):
+        self._samples: deque = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self.count += 1
+
+    def percentiles(self) -> Dict[str, float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+
+        def at(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+
+        return {"p50": at(0.50), "p95": at(0.95), "p99": at(0.99)}
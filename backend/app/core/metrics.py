@@ -0,0 +1,310 @@
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds, from fast cache hits to agent runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter with labels
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Histogram(_Metric):
+    """
+    Histogram with fixed buckets and labels. observe() is a bisect and a few
+    additions under a lock, so it is cheap enough for every request.
+    """
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: count per bucket (plus +Inf), sum, count
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self._values[key] = entry
+            entry[0][index] += 1
+            entry[1][0] += value
+            entry[1][1] += 1
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return int(entry[1][1]) if entry else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            items = [(key, (list(counts), list(totals))) for key, (counts, totals) in self._values.items()]
+        for key, (counts, (total, count)) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="+Inf"' if bound == float("inf") else 'le="%r"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {int(count)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Process-wide set of metrics rendered in the Prometheus text format
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+def get_metrics_registry() -> MetricsRegistry:
+    """
+    Returns the process-wide metrics registry
+    """
+    return registry
+
+
+def instrument(
+    histogram: Histogram,
+    errors: Optional[Counter] = None,
+    label: Optional[str] = None,
+    **labels: Any
+) -> Callable:
+    """
+    Decorator that times a function (sync or async) into histogram.
+
+    label names the label that receives the function's name (e.g. "method"),
+    so one decorator can be applied across a class. Exceptions are counted in
+    errors, if given, and re-raised.
+    """
+    def decorator(fn: Callable) -> Callable:
+        call_labels = dict(labels)
+        if label:
+            call_labels[label] = fn.__name__
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                except Exception:
+                    if errors is not None:
+                        errors.inc(**call_labels)
+                    raise
+                finally:
+                    histogram.observe(time.perf_counter() - started, **call_labels)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                if errors is not None:
+                    errors.inc(**call_labels)
+                raise
+            finally:
+                histogram.observe(time.perf_counter() - started, **call_labels)
+        return wrapper
+    return decorator
+
+
+def instrument_methods(histogram: Histogram, errors: Optional[Counter] = None, label: str = "method", **labels: Any) -> Callable:
+    """
+    Class decorator applying instrument() to every public method of the class
+    """
+    def decorator(cls: type) -> type:
+        for name, attr in list(vars(cls).items()):
+            if not name.startswith("_") and callable(attr):
+                setattr(cls, name, instrument(histogram, errors, label, **labels)(attr))
+        return cls
+    return decorator
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request latency per route template.
+
+    The route is read from the scope after the router has matched it, so
+    /ideas/{idea_id} is one series rather than one per idea. Timing stops when
+    the response has been sent, which for streaming responses is the end of
+    the stream.
+    """
+
+    def __init__(self, app: Any, histogram: Optional[Histogram] = None):
+        self.app = app
+        self.histogram = histogram or HTTP_REQUEST_DURATION
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            self.histogram.observe(
+                time.perf_counter() - started,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", None) or "unmatched",
+                status=status
+            )
+
+
+# Metrics shared across layers. Defined here so every layer imports the same objects.
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"]
+)
+SUPABASE_CALL_DURATION = registry.histogram(
+    "supabase_call_duration_seconds", "Supabase call latency by IdeaRepository method", ["method", "client"]
+)
+SUPABASE_CALL_ERRORS = registry.counter(
+    "supabase_call_errors_total", "Failed Supabase calls by IdeaRepository method", ["method", "client"]
+)
+LLM_CALL_DURATION = registry.histogram(
+    "llm_call_duration_seconds", "LLM call latency by model and kind of call", ["model", "kind"]
+)
+LLM_CALL_ERRORS = registry.counter(
+    "llm_call_errors_total", "Failed LLM calls by model and kind of call", ["model", "kind"]
+)
+LLM_PROMPT_TOKENS = registry.counter(
+    "llm_prompt_tokens_total", "Prompt tokens sent to the LLM by model", ["model"]
+)
+LLM_COMPLETION_TOKENS = registry.counter(
+    "llm_completion_tokens_total", "Completion tokens received from the LLM by model", ["model"]
+)
+AGENT_STEPS = registry.counter(
+    "agent_steps_total", "Agent steps by agent, and by whether the step failed", ["agent", "error"]
+)
+AGENT_STEP_DURATION = registry.histogram(
+    "agent_step_duration_seconds", "Agent step latency by agent", ["agent"]
+)
+AGENT_TOOL_DURATION = registry.histogram(
+    "agent_tool_call_duration_seconds", "Agent tool call latency by tool", ["tool"]
+)
+AGENT_TOOL_ERRORS = registry.counter(
+    "agent_tool_call_errors_total", "Failed agent tool calls by tool", ["tool"]
+)
+AGENT_RUN_DURATION = registry.histogram(
+    "agent_run_duration_seconds", "Total agent run time", ["outcome"]
+)
+
+
+def record_llm_usage(model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    """
+    Add the token counts of one LLM response to the per-model counters
+    """
+    if prompt_tokens:
+        LLM_PROMPT_TOKENS.inc(prompt_tokens, model=model)
+    if completion_tokens:
+        LLM_COMPLETION_TOKENS.inc(completion_tokens, model=model)
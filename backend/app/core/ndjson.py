@@ -0,0 +1,50 @@
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+
+def ndjson_line(data: Any) -> str:
+    """
+    Format one newline-delimited JSON record
+    """
+    return json.dumps(data, default=str) + "\n"
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes],
+    max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a stream of byte chunks into (line_number, line) pairs as the chunks
+    arrive, so a large upload is never held in memory at once.
+
+    Lines longer than max_line_bytes are skipped and yielded as
+    (line_number, None). Line numbers start at 1 and count blank lines.
+    """
+    buffer = bytearray()
+    line_number = 0
+    # Set while skipping the rest of an overlong line
+    overlong = False
+    async for chunk in chunks:
+        buffer.extend(chunk)
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            line_number += 1
+            if overlong:
+                overlong = False
+                yield line_number, None
+            elif end - start > max_line_bytes:
+                yield line_number, None
+            else:
+                yield line_number, bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            overlong = True
+            buffer.clear()
+    if overlong:
+        yield line_number + 1, None
+    elif buffer.strip():
+        yield line_number + 1, bytes(buffer)
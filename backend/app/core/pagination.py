@@ -0,0 +1,31 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+
+def encode_cursor(date_created: str, idea_id: str) -> str:
+    """
+    Build an opaque keyset cursor from the last row of a page
+    """
+    raw = json.dumps([str(date_created), str(idea_id)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[str, str]]:
+    """
+    Turn a cursor back into its (date_created, id) key.
+
+    Raises ValueError if the cursor was not produced by encode_cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_created, idea_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # Both values end up inside a PostgREST filter, so only accept well-formed ones
+        datetime.fromisoformat(date_created)
+        return date_created, str(UUID(idea_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,166 @@
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class FlightCancelled(Exception):
+    """
+    Raised to a caller of SingleFlight.do whose own cancel event was set
+    """
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+        # Cancel event of each caller that joined the call (None: not cancellable)
+        self.cancel_events: List[Optional[threading.Event]] = []
+        self.run_cancel: Optional["_RunCancel"] = None
+
+
+class _RunCancel(threading.Event):
+    """
+    Cancel event handed to a shared run. It reads as set only once every
+    caller that joined the run has cancelled, so one caller giving up never
+    aborts the run for the others. Once set, the call is detached from its
+    key so later callers start a fresh run instead of joining a dying one.
+    """
+
+    def __init__(self, flight: "SingleFlight", key: Hashable, call: _Call):
+        super().__init__()
+        self._flight = flight
+        self._key = key
+        self._call = call
+
+    def is_set(self) -> bool:
+        if super().is_set():
+            return True
+        with self._flight._lock:
+            events = self._call.cancel_events
+            if not events or not all(event is not None and event.is_set() for event in events):
+                return False
+            if self._flight._calls.get(self._key) is self._call:
+                del self._flight._calls[self._key]
+        self.set()
+        return True
+
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key runs the function; callers that arrive while it
+    is still running block and receive the same result (or exception).
+
+    Each caller may pass its own cancel event. A caller whose event is set
+    gets FlightCancelled (a waiter straight away, the leader once the run
+    returns), while the run itself is only cancelled when every caller has
+    cancelled (see _RunCancel).
+    """
+
+    # How often a blocked waiter checks its own cancel event
+    CANCEL_POLL_SECONDS = 0.2
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[threading.Event], Any],
+        cancel_event: Optional[threading.Event] = None
+    ) -> Any:
+        """
+        Run fn(run_cancel) once for all concurrent callers of key. run_cancel
+        is the run-level cancel event described above.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                leader = False
+            else:
+                call = _Call()
+                call.run_cancel = _RunCancel(self, key, call)
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+            call.cancel_events.append(cancel_event)
+
+        if not leader:
+            if cancel_event is None:
+                call.done.wait()
+            else:
+                while not call.done.wait(self.CANCEL_POLL_SECONDS):
+                    if cancel_event.is_set():
+                        raise FlightCancelled("Cancelled while waiting for a shared run")
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(call.run_cancel)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        if cancel_event is not None and cancel_event.is_set():
+            raise FlightCancelled("Cancelled while the shared run finished for other callers")
+        return call.result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight(),
+            "executions": self.executions,
+            "shared": self.shared
+        }
+
+
+class AsyncSingleFlight:
+    """
+    asyncio counterpart of SingleFlight for coroutines on one event loop.
+
+    The first caller for a key starts the call as a task; later callers await
+    the same task. The task is shielded, so a caller that is cancelled (e.g. a
+    client that disconnects) does not cancel the call for the others.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self.executions = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is not None:
+            self.shared += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            self.executions += 1
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight(),
+            "executions": self.executions,
+            "shared": self.shared
+        }
@@ -0,0 +1,98 @@
+import random
+from typing import Any, List, Optional
+
+
+class _Node:
+    __slots__ = ("key", "forward")
+
+    def __init__(self, key: Any, level: int):
+        self.key = key
+        self.forward: List[Optional["_Node"]] = [None] * level
+
+
+class SkipList:
+    """
+    Sorted set of unique, comparable keys.
+
+    add() and remove() take O(log n) expected time and never move other
+    entries, so a large ordered index can be updated on every event. Reading
+    the first k keys walks the bottom level in O(k) (plus the offset).
+    Not thread-safe; callers hold their own lock.
+    """
+
+    MAX_LEVEL = 32
+    # Chance that a node is promoted to the next level
+    P = 0.25
+
+    def __init__(self, seed: Optional[int] = None):
+        self._random = random.Random(seed)
+        self.clear()
+
+    def clear(self) -> None:
+        self._head = _Node(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_level(self) -> int:
+        level = 1
+        while level < self.MAX_LEVEL and self._random.random() < self.P:
+            level += 1
+        return level
+
+    def _predecessors(self, key: Any) -> List[_Node]:
+        # The last node before key on every level
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for i in range(self._level - 1, -1, -1):
+            while node.forward[i] is not None and node.forward[i].key < key:
+                node = node.forward[i]
+            update[i] = node
+        return update
+
+    def add(self, key: Any) -> None:
+        """
+        Insert a key (no-op if it is already present)
+        """
+        update = self._predecessors(key)
+        following = update[0].forward[0]
+        if following is not None and following.key == key:
+            return
+        level = self._random_level()
+        self._level = max(self._level, level)
+        node = _Node(key, level)
+        for i in range(level):
+            node.forward[i] = update[i].forward[i]
+            update[i].forward[i] = node
+        self._size += 1
+
+    def remove(self, key: Any) -> bool:
+        """
+        Delete a key; returns False if it was not present
+        """
+        update = self._predecessors(key)
+        node = update[0].forward[0]
+        if node is None or node.key != key:
+            return False
+        for i in range(len(node.forward)):
+            update[i].forward[i] = node.forward[i]
+        while self._level > 1 and self._head.forward[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return True
+
+    def slice(self, start: int, stop: int) -> List[Any]:
+        """
+        Keys from position start (inclusive) to stop (exclusive), in order
+        """
+        keys: List[Any] = []
+        node = self._head.forward[0]
+        position = 0
+        while node is not None and position < stop:
+            if position >= start:
+                keys.append(node.key)
+            node = node.forward[0]
+            position += 1
+        return keys
@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class SQLiteCache:
+    """
+    Persistent key/value cache in a SQLite file.
+
+    Values are stored as JSON. Entries expire after a TTL, and once the cache
+    grows past max_entries or max_bytes the least recently used entries are
+    evicted. The entry count and byte total are tracked in memory, so a write
+    costs a primary-key lookup rather than a scan; expired entries are purged
+    every PURGE_EVERY writes. Safe to share between threads, but every call
+    blocks on SQLite, so async code should run it in the threadpool.
+    """
+
+    # Writes between purges of expired entries
+    PURGE_EVERY = 256
+
+    def __init__(
+        self,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: int = 10000,
+        max_bytes: int = 100 * 1024 * 1024,
+        name: str = "sqlite-cache"
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+        # Counted once here, then kept current by every write and delete
+        self._count, self._bytes = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+        ).fetchone()
+        self._writes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value (None if missing or expired) and mark it as recently used
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._delete_locked(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a JSON-serialisable value and evict down to the size bounds
+        """
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        payload = json.dumps(value)
+        with self._lock:
+            previous = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now + ttl if ttl else None, now)
+            )
+            if previous is None:
+                self._count += 1
+            else:
+                self._bytes -= previous[0]
+            self._bytes += len(payload)
+
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                self._purge_expired_locked(now)
+            self._evict_locked()
+
+    def _delete_locked(self, key: str) -> bool:
+        row = self._conn.execute("SELECT size FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+        self._count -= 1
+        self._bytes -= row[0]
+        return True
+
+    def _purge_expired_locked(self, now: float) -> None:
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache WHERE expires_at <= ?", (now,)
+        ).fetchone()
+        if not count:
+            return
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        self._count -= count
+        self._bytes -= total
+        self.expirations += count
+
+    def _evict_locked(self) -> None:
+        while self._count > self.max_entries or self._bytes > self.max_bytes:
+            oldest = self._conn.execute(
+                "SELECT key, size FROM cache ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            if not oldest:
+                break
+            for key, size in oldest:
+                if self._count <= self.max_entries and self._bytes <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                self._count -= 1
+                self._bytes -= size
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        """
+        Remove a value if present
+        """
+        with self._lock:
+            self._delete_locked(key)
+
+    def clear(self) -> None:
+        """
+        Remove every value
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._count = 0
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Size and hit/miss/eviction counters
+        """
+        with self._lock:
+            count, total = self._count, self._bytes
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": count,
+            "bytes": total,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
@@ -0,0 +1,19 @@
+-- Atomic, batched counter increments for the ideas table.
+--
+-- Called by IdeaRepository.increment_counters with a JSON array such as
+--   [{"id": "<uuid>", "view_count": 3, "upvotes": 1}, ...]
+-- Ids are expected to be unique within one call (CounterService merges
+-- increments per idea before flushing).
+
+create or replace function increment_idea_counters(updates jsonb)
+returns void
+language sql
+as $$
+    update ideas as i
+    set
+        view_count = coalesce(i.view_count, 0) + coalesce((u ->> 'view_count')::int, 0),
+        upvotes    = coalesce(i.upvotes, 0)    + coalesce((u ->> 'upvotes')::int, 0),
+        downvotes  = coalesce(i.downvotes, 0)  + coalesce((u ->> 'downvotes')::int, 0)
+    from jsonb_array_elements(updates) as u
+    where i.id = (u ->> 'id')::uuid;
+$$;
@@ -0,0 +1,5 @@
+-- Index backing keyset pagination in IdeaRepository.get_page, which orders by
+-- (date_created desc, id desc) and seeks past the last row of the previous page.
+
+create index if not exists ideas_date_created_id_idx
+    on ideas (date_created desc, id desc);
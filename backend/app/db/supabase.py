@@ -1,11 +1,38 @@
-from supabase import create_client
+import asyncio
+from typing import Optional
+from supabase import create_client, acreate_client, AsyncClient
 from app.core.config import settings
 
 # Initialize Supabase client
 supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
 
+# Async Supabase client, created lazily on the running event loop.
+# Its PostgREST session is a single pooled (HTTP/2) httpx.AsyncClient.
+async_supabase: Optional[AsyncClient] = None
+_async_supabase_lock = asyncio.Lock()
+
 def get_supabase_client():
     """
     Returns the Supabase client instance
     """
-    return supabase 
\ No newline at end of file
+    return supabase
+
+async def get_async_supabase_client() -> AsyncClient:
+    """
+    Returns the async Supabase client instance, creating it on first use
+    """
+    global async_supabase
+    if async_supabase is None:
+        async with _async_supabase_lock:
+            if async_supabase is None:
+                async_supabase = await acreate_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return async_supabase
+
+async def close_async_supabase_client() -> None:
+    """
+    Closes the pooled connections of the async Supabase client
+    """
+    global async_supabase
+    if async_supabase is not None:
+        await async_supabase.postgrest.aclose()
+        async_supabase = None
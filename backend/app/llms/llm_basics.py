@@ -1,47 +1,249 @@
 import os
+import time
 from openai import AsyncOpenAI
-from typing import Dict, Any, Optional
+from typing import Dict, Any, AsyncIterator, Optional, Union
 from app.core.config import settings
+from app.core.latency import LatencyRecorder
+from app.core.metrics import LLM_CALL_DURATION, LLM_CALL_ERRORS, record_llm_usage
+from app.core.singleflight import AsyncSingleFlight
+from app.llms.llm_cache import LLMResponseCache, get_llm_cache
 import httpx
 
 class LLMProvider:
     def __init__(self):
+        # One keep-alive connection pool for every LLM call in the process, so
+        # requests reuse warm TLS connections to the API
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            # Configure timeout to avoid long-running requests
+            timeout=httpx.Timeout(60.0)  # 60 seconds timeout
+        )
         # Initialize the OpenAI client according to official documentation
         # The latest version of openai library (1.12.0) uses a different initialization pattern
         self.client = AsyncOpenAI(
             api_key=settings.OPENAI_API_KEY,
-            # Configure timeout to avoid long-running requests
-            timeout=httpx.Timeout(60.0)  # 60 seconds timeout
+            http_client=self.http_client
         )
         self.default_model = "gpt-4o-mini"
-    
+        # Identical prompts in flight at the same time share one upstream call
+        self.single_flight = AsyncSingleFlight()
+        # Completions of identical requests are served from cache
+        self.cache = get_llm_cache() if settings.LLM_CACHE_ENABLED else None
+
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completion_latency = LatencyRecorder()
+        self.time_to_first_token = LatencyRecorder()
+
     async def complete(
-        self, 
-        prompt: str, 
+        self,
+        prompt: str,
         model: Optional[str] = None,
-        temperature: float = 0.7
-    ) -> str:
+        temperature: float = 0.7,
+        stream: bool = False,
+        use_cache: bool = True
+    ) -> Union[str, AsyncIterator[str]]:
         """
         Send a completion request to the LLM and return the response.
-        
+
         Args:
             prompt: The prompt to send to the LLM
             model: The model to use (defaults to gpt-4o-mini)
             temperature: Controls randomness (0-1)
-            
+            stream: Return an async iterator of text chunks instead of
+                waiting for the whole completion
+            use_cache: Serve and store the response through the response
+                cache (pass False to always call the LLM)
+
         Returns:
-            The text response from the LLM
+            The text response from the LLM, or an iterator over its chunks
         """
+        if stream:
+            return self.stream(prompt, model=model, temperature=temperature, use_cache=use_cache)
+
+        model = model or self.default_model
+        key = LLMResponseCache.key(model, temperature, prompt)
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = await cache.aget(key)
+            if cached is not None:
+                return cached
+        # Cached and uncached callers must not share a call, so the flag is part of the key
+        return await self.single_flight.do(
+            (key, cache is not None),
+            lambda: self._complete(prompt, model, temperature, key if cache is not None else None)
+        )
+
+    async def _complete(self, prompt: str, model: str, temperature: float, cache_key: Optional[str] = None) -> str:
+        started = time.perf_counter()
+        self._enter()
         try:
             response = await self.client.chat.completions.create(
-                model=model or self.default_model,
+                model=model,
                 temperature=temperature,
                 messages=[
                     {"role": "user", "content": prompt}
                 ]
             )
-            return response.choices[0].message.content or ""
+            self._record(model, "completion", started, response.usage)
+            text = response.choices[0].message.content or ""
+            if cache_key is not None and text:
+                await self.cache.aset(cache_key, text)
+            return text
         except Exception as e:
             # Log the error
             print(f"Error calling LLM: {str(e)}")
+            LLM_CALL_ERRORS.inc(model=model, kind="completion")
             raise
+        finally:
+            self.in_flight -= 1
+
+    async def stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        temperature: float = 0.7,
+        use_cache: bool = True
+    ) -> AsyncIterator[str]:
+        """
+        Send a streaming completion request and yield the text as it arrives.
+
+        A cached response is yielded as a single chunk; a streamed response
+        is stored in the cache once it has been received in full.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            model: The model to use (defaults to gpt-4o-mini)
+            temperature: Controls randomness (0-1)
+            use_cache: Serve and store the response through the response cache
+
+        Yields:
+            Chunks of the response text
+        """
+        model = model or self.default_model
+        key = LLMResponseCache.key(model, temperature, prompt)
+        cache = self.cache if use_cache else None
+        if cache is not None:
+            cached = await cache.aget(key)
+            if cached is not None:
+                yield cached
+                return
+
+        started = time.perf_counter()
+        first_token = True
+        chunks = []
+        self._enter()
+        try:
+            response = await self.client.chat.completions.create(
+                model=model,
+                temperature=temperature,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                stream=True,
+                # The last chunk then carries the token usage of the whole stream
+                stream_options={"include_usage": True}
+            )
+            usage = None
+            async with response:
+                async for chunk in response:
+                    if not chunk.choices:
+                        usage = chunk.usage or usage
+                        continue
+                    text = chunk.choices[0].delta.content
+                    if not text:
+                        continue
+                    if first_token:
+                        self.time_to_first_token.record(time.perf_counter() - started)
+                        first_token = False
+                    chunks.append(text)
+                    yield text
+            self._record(model, "stream", started, usage)
+            if cache is not None and chunks:
+                await cache.aset(key, "".join(chunks))
+        except Exception as e:
+            # Log the error
+            print(f"Error streaming from LLM: {str(e)}")
+            LLM_CALL_ERRORS.inc(model=model, kind="stream")
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def _enter(self) -> None:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def _record(self, model: str, kind: str, started: float, usage: Any) -> None:
+        elapsed = time.perf_counter() - started
+        self.completion_latency.record(elapsed)
+        LLM_CALL_DURATION.observe(elapsed, model=model, kind=kind)
+        if usage is not None:
+            record_llm_usage(model, usage.prompt_tokens, usage.completion_tokens)
+
+    def _pool_stats(self) -> Dict[str, Any]:
+        # httpx does not expose its connection pool publicly; read it defensively
+        pool = getattr(getattr(self.http_client, "_transport", None), "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "max_connections": settings.LLM_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            "connections": len(connections),
+            "idle_connections": idle,
+            "active_connections": len(connections) - idle
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Connection pool usage, request coalescing, completion latency and
+        time-to-first-token of streamed completions
+        """
+        return {
+            "pool": self._pool_stats(),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "coalescing": self.single_flight.stats(),
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "completions": self.completion_latency.count,
+            "completion_latency_ms": self.completion_latency.percentiles(),
+            "streams": self.time_to_first_token.count,
+            "time_to_first_token_ms": self.time_to_first_token.percentiles()
+        }
+
+    async def aclose(self) -> None:
+        """
+        Close the pooled HTTP connections
+        """
+        await self.client.close()
+
+
+# Process-wide provider, created at startup and closed at shutdown
+_llm_provider: Optional[LLMProvider] = None
+
+def get_llm_provider() -> LLMProvider:
+    """
+    Returns the process-wide LLM provider, creating it on first use
+    """
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = LLMProvider()
+    return _llm_provider
+
+async def close_llm_provider() -> None:
+    """
+    Close the process-wide LLM provider, if it was created
+    """
+    global _llm_provider
+    if _llm_provider is not None:
+        await _llm_provider.aclose()
+        _llm_provider = None
+
+def get_llm_stats() -> Dict[str, Any]:
+    """
+    Stats of the process-wide LLM provider
+    """
+    return get_llm_provider().stats()
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import threading
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.sqlite_cache import SQLiteCache
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of LLM completions.
+
+    A byte-bounded in-memory LRU sits in front of a SQLite file that survives
+    restarts. Both tiers expire entries after the same TTL; a disk hit is
+    copied into memory so repeated lookups stay in-process.
+    """
+
+    def __init__(self, memory: TTLCache, disk: SQLiteCache):
+        self.memory = memory
+        self.disk = disk
+
+    @staticmethod
+    def key(model: str, temperature: Optional[float], prompt: Any) -> str:
+        """
+        Cache key of a completion. prompt is a string or any JSON-serialisable
+        value (e.g. a list of chat messages).
+        """
+        if not isinstance(prompt, str):
+            prompt = json.dumps(prompt, sort_keys=True, default=str)
+        prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+        return f"{model}:{temperature}:{prompt_hash}"
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = self.disk.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        self.memory.set(key, value)
+        self.disk.set(key, value)
+
+    async def aget(self, key: str) -> Optional[str]:
+        """
+        get() for async callers: memory hits are served inline, the SQLite
+        lookup runs in the threadpool so it never blocks the event loop
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        value = await run_in_threadpool(self.disk.get, key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    async def aset(self, key: str, value: str) -> None:
+        """
+        set() for async callers; the SQLite write runs in the threadpool
+        """
+        self.memory.set(key, value)
+        await run_in_threadpool(self.disk.set, key, value)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hit/miss/eviction counters of both tiers
+        """
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats()
+        }
+
+
+# Process-wide LLM response cache, created on first use so the SQLite file is
+# only opened when caching is actually used
+_llm_cache: Optional[LLMResponseCache] = None
+_llm_cache_lock = threading.Lock()
+
+def get_llm_cache() -> LLMResponseCache:
+    """
+    Returns the process-wide LLM response cache
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(
+                    TTLCache(
+                        maxsize=settings.LLM_CACHE_MEMORY_MAX_ENTRIES,
+                        ttl=settings.LLM_CACHE_TTL_SECONDS,
+                        name="llm-responses",
+                        max_bytes=settings.LLM_CACHE_MEMORY_MAX_BYTES,
+                        sizeof=lambda value: len(value.encode())
+                    ),
+                    SQLiteCache(
+                        settings.LLM_CACHE_PATH,
+                        ttl=settings.LLM_CACHE_TTL_SECONDS,
+                        max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+                        max_bytes=settings.LLM_CACHE_MAX_BYTES,
+                        name="llm-responses"
+                    )
+                )
+    return _llm_cache
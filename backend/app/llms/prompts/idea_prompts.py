@@ -25,3 +25,48 @@ class IdeaPrompts:
         
         Provide ONLY the improved version without any explanations, introductions, or additional commentary.
         """
+    
+    @staticmethod
+    def get_extraction_prompt(text: str, humanity_challenges: list, time_horizons: list, statuses: list) -> str:
+        return f"""
+        You are an expert AI assistant that helps users fill out idea submission forms.
+        
+        Read the idea description below and fill in every form field that the description answers.
+        Only use information stated in or directly implied by the description. Never make up facts,
+        figures, companies or sources: if the description does not answer a field, set it to null.
+        
+        Field rules:
+        - humanity_challenge must be one of: {humanity_challenges}
+        - time_horizon must be one of: {time_horizons}
+        - status must be one of: {statuses}
+        - category is related to the humanity challenge (e.g., "Climate Change" -> "Energy"), and sub_category is more specific
+        - problem_statement, solution and why_now should be 2-3 sentences each
+        - market_estimate is a number in dollars
+        - list fields hold at most 5 short items
+        
+        Here is the idea description:
+        
+        ```
+        {text}
+        ```
+        """
+    
+    @staticmethod
+    def get_enrichment_prompt(field: str, field_description: str, idea: str, pages: str) -> str:
+        return f"""
+        You are an expert AI assistant that helps users fill out idea submission forms.
+        
+        The form for the idea below is missing the field "{field}": {field_description}
+        Fill it in using only the web pages provided. Never make up facts, figures or companies:
+        if the pages do not support an answer, set the field to null.
+        
+        The idea:
+        
+        ```
+        {idea}
+        ```
+        
+        Web pages:
+        
+        {pages}
+        """
@@ -1,8 +1,29 @@
-from app.db.supabase import get_supabase_client
+from app.db.supabase import get_supabase_client, get_async_supabase_client
 from app.schemas.idea import IdeaCreate, IdeaUpdate
+from app.core.config import settings
+from app.core.metrics import SUPABASE_CALL_DURATION, SUPABASE_CALL_ERRORS, instrument_methods
+from starlette.concurrency import run_in_threadpool
 from uuid import UUID
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union, Tuple
 
+EQUALITY_FILTERS = ["category", "sub_category", "status", "humanity_challenge"]
+
+def _keyset_page(query, limit: int, after: Optional[Tuple[str, str]], filters: Optional[Dict[str, Any]]):
+    """
+    Apply filters, (date_created, id) ordering and the keyset condition to a select
+    """
+    for key, value in (filters or {}).items():
+        if key in EQUALITY_FILTERS and value is not None:
+            query = query.eq(key, value)
+    query = query.order("date_created", desc=True).order("id", desc=True)
+    if after:
+        date_created, idea_id = after
+        query = query.or_(
+            f'date_created.lt."{date_created}",and(date_created.eq."{date_created}",id.lt.{idea_id})'
+        )
+    return query.limit(limit)
+
+@instrument_methods(SUPABASE_CALL_DURATION, SUPABASE_CALL_ERRORS, client="sync")
 class IdeaRepository:
     def __init__(self):
         self.supabase = get_supabase_client()
@@ -14,6 +35,19 @@ class IdeaRepository:
         """
         return self.supabase.table(self.table).select("*").limit(limit).offset(offset).execute()
     
+    def get_page(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[str, str]] = None,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Get ideas newest first using keyset pagination on (date_created, id)
+        """
+        query = self.supabase.table(self.table).select(columns)
+        return _keyset_page(query, limit, after, filters).execute()
+    
     def get_by_id(self, idea_id: UUID):
         """
         Get an idea by its ID
@@ -26,6 +60,12 @@ class IdeaRepository:
         """
         return self.supabase.table(self.table).insert(idea).execute()
     
+    def create_many(self, ideas: List[Dict[str, Any]]):
+        """
+        Create many ideas in a single multi-row insert
+        """
+        return self.supabase.table(self.table).insert(ideas).execute()
+    
     def update(self, idea_id: UUID, idea: Dict[str, Any]):
         """
         Update an existing idea
@@ -53,32 +93,146 @@ class IdeaRepository:
         
         return query.execute()
     
+    def increment_counters(self, updates: List[Dict[str, Any]]):
+        """
+        Atomically add counter deltas to many ideas in a single round trip.
+
+        Each update is a dict with the idea "id" and the amounts to add to
+        "view_count", "upvotes" and/or "downvotes". The addition happens on the
+        server (see db/migrations/001_increment_idea_counters.sql), so concurrent
+        increments never overwrite each other.
+        """
+        return self.supabase.rpc("increment_idea_counters", {"updates": updates}).execute()
+    
     def increment_view_count(self, idea_id: UUID):
         """
         Increment the view count of an idea
         """
-        idea = self.get_by_id(idea_id).data
-        if idea:
-            current_views = idea.get("view_count", 0)
-            return self.supabase.table(self.table).update({"view_count": current_views + 1}).eq("id", str(idea_id)).execute()
-        return None
+        return self.increment_counters([{"id": str(idea_id), "view_count": 1}])
     
     def upvote(self, idea_id: UUID):
         """
         Increment the upvotes of an idea
         """
-        idea = self.get_by_id(idea_id).data
-        if idea:
-            current_upvotes = idea.get("upvotes", 0)
-            return self.supabase.table(self.table).update({"upvotes": current_upvotes + 1}).eq("id", str(idea_id)).execute()
-        return None
+        return self.increment_counters([{"id": str(idea_id), "upvotes": 1}])
     
     def downvote(self, idea_id: UUID):
         """
         Increment the downvotes of an idea
         """
-        idea = self.get_by_id(idea_id).data
-        if idea:
-            current_downvotes = idea.get("downvotes", 0)
-            return self.supabase.table(self.table).update({"downvotes": current_downvotes + 1}).eq("id", str(idea_id)).execute()
-        return None 
\ No newline at end of file
+        return self.increment_counters([{"id": str(idea_id), "downvotes": 1}])
+
+
+@instrument_methods(SUPABASE_CALL_DURATION, SUPABASE_CALL_ERRORS, client="async")
+class AsyncIdeaRepository:
+    """
+    Non-blocking version of IdeaRepository built on the async Supabase client.
+
+    All requests share the client's pooled httpx.AsyncClient, so concurrency
+    is bounded by sockets rather than by threadpool workers.
+    """
+    def __init__(self):
+        self.table = "ideas"
+    
+    async def _query(self):
+        client = await get_async_supabase_client()
+        return client.table(self.table)
+    
+    async def get_all(self, limit: int = 100, offset: int = 0):
+        """
+        Get all ideas with pagination
+        """
+        return await (await self._query()).select("*").limit(limit).offset(offset).execute()
+    
+    async def get_page(
+        self,
+        limit: int = 100,
+        after: Optional[Tuple[str, str]] = None,
+        columns: str = "*",
+        filters: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Get ideas newest first using keyset pagination on (date_created, id)
+        """
+        query = (await self._query()).select(columns)
+        return await _keyset_page(query, limit, after, filters).execute()
+    
+    async def get_by_id(self, idea_id: UUID):
+        """
+        Get an idea by its ID
+        """
+        return await (await self._query()).select("*").eq("id", str(idea_id)).single().execute()
+    
+    async def create(self, idea: Dict[str, Any]):
+        """
+        Create a new idea
+        """
+        return await (await self._query()).insert(idea).execute()
+    
+    async def create_many(self, ideas: List[Dict[str, Any]]):
+        """
+        Create many ideas in a single multi-row insert
+        """
+        return await (await self._query()).insert(ideas).execute()
+    
+    async def update(self, idea_id: UUID, idea: Dict[str, Any]):
+        """
+        Update an existing idea
+        """
+        return await (await self._query()).update(idea).eq("id", str(idea_id)).execute()
+    
+    async def delete(self, idea_id: UUID):
+        """
+        Delete an idea
+        """
+        return await (await self._query()).delete().eq("id", str(idea_id)).execute()
+    
+    async def search(self, query_params: Dict[str, Any]):
+        """
+        Search ideas based on query parameters
+        """
+        query = (await self._query()).select("*")
+        
+        for key, value in query_params.items():
+            if value is not None:
+                if key in ["category", "sub_category", "status", "humanity_challenge"]:
+                    query = query.eq(key, value)
+                elif key in ["title", "problem_statement", "solution"]:
+                    query = query.ilike(key, f"%{value}%")
+        
+        return await query.execute()
+    
+    async def increment_counters(self, updates: List[Dict[str, Any]]):
+        """
+        Atomically add counter deltas to many ideas in a single round trip
+        """
+        client = await get_async_supabase_client()
+        return await client.rpc("increment_idea_counters", {"updates": updates}).execute()
+
+
+class ThreadedIdeaRepository:
+    """
+    Async facade over the blocking IdeaRepository.
+
+    Every call runs in Starlette's threadpool, which is how the sync endpoints
+    used to behave. Kept for comparison with AsyncIdeaRepository.
+    """
+    def __init__(self, repository: Optional[IdeaRepository] = None):
+        self._repository = repository or IdeaRepository()
+    
+    def __getattr__(self, name: str):
+        method = getattr(self._repository, name)
+        
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(method, *args, **kwargs)
+        
+        return call
+
+
+def get_idea_repository() -> Union[AsyncIdeaRepository, ThreadedIdeaRepository]:
+    """
+    Returns the async idea repository selected by settings.IDEAS_ASYNC_CLIENT
+    """
+    if settings.IDEAS_ASYNC_CLIENT:
+        return AsyncIdeaRepository()
+    return ThreadedIdeaRepository()
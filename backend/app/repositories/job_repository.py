@@ -0,0 +1,123 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+
+class JobRepository:
+    """
+    SQLite store for background jobs, so queued and interrupted jobs survive a restart
+    """
+
+    def __init__(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_finished_at ON jobs (finished_at)")
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def create(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insert a new queued job
+        """
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, JOB_QUEUED, json.dumps(payload), time.time())
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job by its ID
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list_unfinished(self) -> List[Dict[str, Any]]:
+        """
+        Jobs that were queued or running, oldest first
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at",
+                (JOB_QUEUED, JOB_RUNNING)
+            ).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def transition(self, job_id: str, from_statuses: tuple, to_status: str, **fields: Any) -> bool:
+        """
+        Move a job to a new status if it is currently in one of from_statuses.
+        Returns False when the job was not in an expected status (e.g. it was
+        cancelled while running), in which case nothing is written.
+        """
+        columns = {"status": to_status}
+        for key, value in fields.items():
+            columns[key] = json.dumps(value) if key == "result" else value
+        assignments = ", ".join(f"{key} = ?" for key in columns)
+        placeholders = ", ".join("?" for _ in from_statuses)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND status IN ({placeholders})",
+                (*columns.values(), job_id, *from_statuses)
+            )
+        return cursor.rowcount > 0
+
+    def delete_finished(self, before: float) -> int:
+        """
+        Delete finished jobs that ended before the given time. Returns the
+        number of jobs deleted.
+        """
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE finished_at < ? AND status IN ({placeholders})",
+                (before, *FINISHED_STATUSES)
+            )
+        return cursor.rowcount
+
+    def count_by_status(self) -> Dict[str, int]:
+        """
+        Number of jobs per status
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, create_model
 from typing import Optional, List, Dict, Any, Literal, Union
 from datetime import datetime
 from uuid import UUID
@@ -104,4 +104,144 @@ class IdeaResponse(BaseModel):
     other: Optional[str] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+class IdeaSummary(BaseModel):
+    """
+    Lightweight projection of an idea for list views and cards
+    """
+    id: UUID
+    title: str
+    humanity_challenge: str
+    category: str
+    sub_category: str
+    time_horizon: str
+    status: str
+    type_of_author: str
+    author: str
+    date_created: datetime
+    date_updated: datetime
+    upvotes: int = 0
+    downvotes: int = 0
+    view_count: int = 0
+    is_featured: bool = False
+
+# Fields of IdeaCreate that are set by the user or the system, not extracted
+# from an idea description
+EXTRACTION_EXCLUDED_FIELDS = {
+    "author", "type_of_author", "similar_ideas", "supporting_material", "is_featured", "is_published"
+}
+
+# Form fields that can be read from an idea description in one structured
+# completion. Built from IdeaCreate so the two stay in sync; every field is
+# nullable, and null means the description does not say.
+IdeaExtraction = create_model(
+    "IdeaExtraction",
+    **{
+        name: (Optional[field.annotation], None)
+        for name, field in IdeaCreate.model_fields.items()
+        if name not in EXTRACTION_EXCLUDED_FIELDS
+    }
+)
+
+# Columns that can be requested through the fields= projection parameter
+IDEA_FIELDS = list(IdeaResponse.model_fields)
+IDEA_SUMMARY_FIELDS = list(IdeaSummary.model_fields)
+
+# An idea restricted to the columns picked with fields=. Built from
+# IdeaResponse so every column keeps its type; columns that were not selected
+# are unset and left out of the response (dump with exclude_unset).
+IdeaProjection = create_model(
+    "IdeaProjection",
+    __doc__="An idea with only the columns requested through fields=",
+    **{name: (Optional[field.annotation], None) for name, field in IdeaResponse.model_fields.items()}
+)
+
+class IdeaPage(BaseModel):
+    """
+    A page of ideas from keyset pagination. Items are IdeaSummary objects by
+    default, or IdeaProjection objects holding only the columns requested
+    with fields=; pass next_cursor back as cursor= to get the following page.
+    """
+    items: List[Union[IdeaSummary, IdeaProjection]]
+    next_cursor: Optional[str] = None
+
+class IdeaImportError(BaseModel):
+    """
+    A row of an NDJSON import that was not inserted
+    """
+    line: int
+    error: str
+
+class IdeaImportReport(BaseModel):
+    """
+    Outcome of an NDJSON import: row counts, per-row errors and throughput
+    """
+    received: int
+    imported: int
+    failed: int
+    batches: int
+    errors: List[IdeaImportError]
+    took_ms: float
+    rows_per_second: float
+
+class IdeaSearchHit(BaseModel):
+    """
+    A ranked search result
+    """
+    id: UUID
+    title: str
+    humanity_challenge: Optional[str] = None
+    category: Optional[str] = None
+    sub_category: Optional[str] = None
+    status: Optional[str] = None
+    score: float
+
+class IdeaSearchResponse(BaseModel):
+    """
+    A page of ranked search results with facet counts over all matches
+    """
+    total: int
+    items: List[IdeaSearchHit]
+    facets: Dict[str, Dict[str, int]]
+    took_ms: float
+
+class TrendingIdea(BaseModel):
+    """
+    An idea in the trending feed, with its time-decayed hot score
+    """
+    id: UUID
+    title: str
+    humanity_challenge: Optional[str] = None
+    category: Optional[str] = None
+    date_created: datetime
+    upvotes: int
+    downvotes: int
+    view_count: int
+    is_featured: bool
+    hot_score: float
+
+class TrendingIdeas(BaseModel):
+    """
+    A page of the trending feed
+    """
+    total: int
+    items: List[TrendingIdea]
+    ready: bool
+
+class IdeaFacets(BaseModel):
+    """
+    Number of ideas per humanity challenge, category, sub-category and status
+    """
+    total: int
+    facets: Dict[str, Dict[str, int]]
+    ready: bool
+
+class SimilarIdea(BaseModel):
+    """
+    A neighbour from the vector index, with its cosine similarity
+    """
+    id: UUID
+    title: str
+    score: float
+
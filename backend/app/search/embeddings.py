@@ -0,0 +1,98 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.search.idea_search_index import tokenize
+
+
+def idea_text(idea: Dict[str, Any]) -> str:
+    """
+    The text of an idea that goes into its embedding
+    """
+    parts = [
+        idea.get("title"),
+        idea.get("category"),
+        idea.get("sub_category"),
+        idea.get("problem_statement"),
+        idea.get("solution"),
+        ", ".join(idea.get("technologies") or [])
+    ]
+    return "\n".join(str(p) for p in parts if p)
+
+
+class Embedder(ABC):
+    """
+    Turns texts into L2-normalised float32 vectors of a fixed dimension
+    """
+    name = "base"
+    dim = 0
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed a batch of texts into a (len(texts), dim) float32 matrix
+        """
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic local embedder using the hashing trick over unigrams and
+    bigrams. No network and no model download, so it is used offline and in
+    tests; similarity is lexical rather than semantic.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _bucket(self, feature: str):
+        digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+        value = int.from_bytes(digest, "little")
+        return value % self.dim, 1.0 if (value >> 63) & 1 else -1.0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                index, sign = self._bucket(feature)
+                vectors[row, index] += sign
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class OpenAIEmbedder(Embedder):
+    """
+    Embeddings from the OpenAI embeddings API (batched, one request per call)
+    """
+
+    def __init__(self, model: str = "text-embedding-3-small", dim: int = 1536):
+        from openai import OpenAI
+
+        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+        self.model = model
+        self.dim = dim
+        self.name = f"openai-{model}-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        response = self.client.embeddings.create(model=self.model, input=texts, dimensions=self.dim)
+        vectors = np.array([item.embedding for item in response.data], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+def get_embedder(kind: Optional[str] = None) -> Embedder:
+    """
+    Build the embedder selected by settings.EMBEDDER ("openai" or "hashing").
+    Falls back to hashing when no OpenAI key is configured.
+    """
+    kind = kind or settings.EMBEDDER
+    if kind == "openai" and settings.OPENAI_API_KEY:
+        return OpenAIEmbedder(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIM)
+    return HashingEmbedder()
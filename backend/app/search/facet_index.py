@@ -0,0 +1,190 @@
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.search.idea_search_index import FACET_FIELDS
+
+FacetValues = Tuple[Optional[str], ...]
+
+
+def facet_values(idea: Dict[str, Any]) -> FacetValues:
+    """
+    The facet field values of an idea row, in FACET_FIELDS order
+    """
+    return tuple(idea.get(field) or None for field in FACET_FIELDS)
+
+
+class FacetIndex:
+    """
+    In-memory counts of ideas per value of each facet field.
+
+    The index remembers the facet values of every idea, so replacing or
+    removing one costs a few dictionary updates however many ideas there
+    are. Counts can drift if a write reaches the database without going
+    through IdeaService; reconcile() corrects them from a fresh scan.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._docs: Dict[str, FacetValues] = {}
+        self._counts: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+        # Ideas written while a reconcile scan is running; their live values
+        # are newer than whatever the scan read
+        self._dirty: Optional[Set[str]] = None
+
+        self.ready = False
+        self.build_duration = 0.0
+        self._build_started: Optional[float] = None
+        self.reconciles = 0
+        self.last_reconcile_at: Optional[float] = None
+        self.last_reconcile_duration = 0.0
+        self.last_reconcile_drift = 0
+
+    def _count_locked(self, values: FacetValues, delta: int) -> None:
+        for field, value in zip(FACET_FIELDS, values):
+            if value is None:
+                continue
+            counts = self._counts[field]
+            count = counts.get(value, 0) + delta
+            if count > 0:
+                counts[value] = count
+            else:
+                counts.pop(value, None)
+
+    def _set_locked(self, doc_id: str, values: Optional[FacetValues]) -> None:
+        previous = self._docs.pop(doc_id, None)
+        if previous is not None:
+            self._count_locked(previous, -1)
+        if values is not None:
+            self._docs[doc_id] = values
+            self._count_locked(values, 1)
+        if self._dirty is not None:
+            self._dirty.add(doc_id)
+
+    def add(self, idea: Dict[str, Any]) -> None:
+        """
+        Count an idea row, replacing any previous version of it
+        """
+        values = facet_values(idea)
+        with self._lock:
+            self._set_locked(str(idea["id"]), values)
+
+    def add_many(self, ideas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Count a batch of idea rows
+        """
+        rows = [(str(idea["id"]), facet_values(idea)) for idea in ideas]
+        with self._lock:
+            for doc_id, values in rows:
+                self._set_locked(doc_id, values)
+
+    def remove(self, idea_id: Any) -> None:
+        """
+        Stop counting an idea
+        """
+        with self._lock:
+            self._set_locked(str(idea_id), None)
+
+    def clear(self) -> None:
+        """
+        Reset all counts before a rebuild
+        """
+        with self._lock:
+            self._docs.clear()
+            self._counts = {field: {} for field in FACET_FIELDS}
+            self.ready = False
+            self._build_started = time.monotonic()
+
+    def mark_ready(self) -> None:
+        """
+        Record that the startup scan has finished
+        """
+        self.ready = True
+        if self._build_started is not None:
+            self.build_duration = time.monotonic() - self._build_started
+
+    def begin_reconcile(self) -> None:
+        """
+        Start tracking writes so a reconcile scan does not undo them
+        """
+        with self._lock:
+            self._dirty = set()
+
+    def reconcile(self, scanned: Dict[str, FacetValues]) -> int:
+        """
+        Replace the counts with those of a scan started after begin_reconcile().
+
+        Ideas written since begin_reconcile() keep their live values. Returns
+        the drift: the number of ideas whose values differed from the scan.
+        """
+        started = time.monotonic()
+        with self._lock:
+            dirty = self._dirty or set()
+            self._dirty = None
+            docs = dict(scanned)
+            for doc_id in dirty:
+                docs.pop(doc_id, None)
+                if doc_id in self._docs:
+                    docs[doc_id] = self._docs[doc_id]
+            drift = sum(1 for doc_id, values in docs.items() if self._docs.get(doc_id) != values)
+            drift += sum(1 for doc_id in self._docs if doc_id not in docs)
+
+            self._docs = docs
+            self._counts = {field: {} for field in FACET_FIELDS}
+            for values in docs.values():
+                self._count_locked(values, 1)
+            self.ready = True
+
+        self.reconciles += 1
+        self.last_reconcile_at = time.time()
+        self.last_reconcile_duration = time.monotonic() - started
+        self.last_reconcile_drift = drift
+        return drift
+
+    def abort_reconcile(self) -> None:
+        """
+        Stop tracking writes after a failed reconcile scan
+        """
+        with self._lock:
+            self._dirty = None
+
+    def counts(self) -> Tuple[int, Dict[str, Dict[str, int]]]:
+        """
+        Number of ideas and, per facet field, the number of ideas per value
+        (most common first)
+        """
+        with self._lock:
+            total = len(self._docs)
+            facets = {
+                field: dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+                for field, counts in self._counts.items()
+            }
+        return total, facets
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Index size and reconcile history
+        """
+        with self._lock:
+            documents = len(self._docs)
+            values = sum(len(counts) for counts in self._counts.values())
+        return {
+            "ready": self.ready,
+            "documents": documents,
+            "values": values,
+            "build_duration_seconds": round(self.build_duration, 3),
+            "reconciles": self.reconciles,
+            "last_reconcile_at": self.last_reconcile_at,
+            "last_reconcile_duration_seconds": round(self.last_reconcile_duration, 4),
+            "last_reconcile_drift": self.last_reconcile_drift
+        }
+
+
+# Process-wide facet counts, built at startup and kept current by IdeaService
+facet_index = FacetIndex()
+
+def get_facet_index() -> FacetIndex:
+    """
+    Returns the process-wide facet index
+    """
+    return facet_index
@@ -0,0 +1,226 @@
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.latency import LatencyRecorder
+
+# Indexed text fields and their weight in the (BM25F-style) term frequency
+SEARCH_FIELDS = {
+    "title": 3.0,
+    "technologies": 2.0,
+    "problem_statement": 1.0,
+    "solution": 1.0
+}
+
+# Fields that can be used to filter search results and are counted as facets
+FACET_FIELDS = ["humanity_challenge", "category", "sub_category", "status"]
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "which", "will", "with"
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _stem(token: str) -> str:
+    # Very light plural folding so "villages" matches "village"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase, split on non-alphanumerics, drop stopwords and fold plurals
+    """
+    return [_stem(t) for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS and len(t) > 1]
+
+
+class IdeaSearchIndex:
+    """
+    In-memory inverted index over ideas with BM25 ranking.
+
+    Postings hold a weighted term frequency per idea, where a term found in the
+    title counts more than one found in the solution (see SEARCH_FIELDS).
+    Mutations and queries are guarded by a lock, so the index can be updated
+    from the write paths of IdeaService while requests are searching it.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._total_len = 0.0
+
+        self.ready = False
+        self.build_duration = 0.0
+        self._build_started: Optional[float] = None
+        self.latency = LatencyRecorder()
+
+    def _weighted_terms(self, idea: Dict[str, Any]) -> Dict[str, float]:
+        terms: Dict[str, float] = {}
+        for field, weight in SEARCH_FIELDS.items():
+            value = idea.get(field)
+            if not value:
+                continue
+            if isinstance(value, list):
+                value = " ".join(str(v) for v in value)
+            for term, count in Counter(tokenize(str(value))).items():
+                terms[term] = terms.get(term, 0.0) + count * weight
+        return terms
+
+    def add(self, idea: Dict[str, Any]) -> None:
+        """
+        Index an idea row, replacing any previous version of it
+        """
+        doc_id = str(idea["id"])
+        terms = self._weighted_terms(idea)
+        with self._lock:
+            self._remove_locked(doc_id)
+            for term, tf in terms.items():
+                self._postings.setdefault(term, {})[doc_id] = tf
+            self._doc_terms[doc_id] = terms
+            self._doc_len[doc_id] = sum(terms.values())
+            self._total_len += self._doc_len[doc_id]
+            self._docs[doc_id] = {
+                "id": doc_id,
+                "title": idea.get("title", ""),
+                **{field: idea.get(field) for field in FACET_FIELDS}
+            }
+
+    def add_many(self, ideas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index a batch of idea rows
+        """
+        for idea in ideas:
+            self.add(idea)
+
+    def remove(self, idea_id: Any) -> None:
+        """
+        Drop an idea from the index
+        """
+        with self._lock:
+            self._remove_locked(str(idea_id))
+
+    def _remove_locked(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id, 0.0)
+        self._docs.pop(doc_id, None)
+
+    def clear(self) -> None:
+        """
+        Empty the index before a rebuild
+        """
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_len.clear()
+            self._docs.clear()
+            self._total_len = 0.0
+            self.ready = False
+            self._build_started = time.monotonic()
+
+    def mark_ready(self) -> None:
+        """
+        Record that the startup scan has finished
+        """
+        self.ready = True
+        if self._build_started is not None:
+            self.build_duration = time.monotonic() - self._build_started
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[int, List[Dict[str, Any]], Dict[str, Dict[str, int]]]:
+        """
+        Rank ideas against a free-text query.
+
+        Returns the number of matching ideas, the requested page of hits (each
+        a dict with the idea's id, title, facet fields and score) and facet
+        counts over all matches.
+        """
+        started = time.perf_counter()
+        filters = {k: v for k, v in (filters or {}).items() if k in FACET_FIELDS and v is not None}
+        terms = set(tokenize(query))
+
+        with self._lock:
+            n_docs = len(self._doc_len)
+            avgdl = self._total_len / n_docs if n_docs else 0.0
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+
+            if filters:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if all(self._docs[doc_id].get(k) == v for k, v in filters.items())
+                }
+
+            facets: Dict[str, Dict[str, int]] = {field: {} for field in FACET_FIELDS}
+            for doc_id in scores:
+                doc = self._docs[doc_id]
+                for field in FACET_FIELDS:
+                    value = doc.get(field)
+                    if value:
+                        facets[field][value] = facets[field].get(value, 0) + 1
+
+            top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])[offset:]
+            hits = [{**self._docs[doc_id], "score": round(score, 4)} for doc_id, score in top]
+
+        self.latency.record(time.perf_counter() - started)
+        return len(scores), hits, facets
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Index size and recent query latency
+        """
+        with self._lock:
+            documents = len(self._doc_len)
+            terms = len(self._postings)
+            postings = sum(len(p) for p in self._postings.values())
+        return {
+            "ready": self.ready,
+            "documents": documents,
+            "terms": terms,
+            "postings": postings,
+            "build_duration_seconds": round(self.build_duration, 3),
+            "queries": self.latency.count,
+            "query_latency_ms": self.latency.percentiles()
+        }
+
+
+# Process-wide search index, built at startup and kept current by IdeaService
+idea_search_index = IdeaSearchIndex()
+
+def get_idea_search_index() -> IdeaSearchIndex:
+    """
+    Returns the process-wide idea search index
+    """
+    return idea_search_index
@@ -0,0 +1,255 @@
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.latency import LatencyRecorder
+from app.core.skiplist import SkipList
+from app.services.counter_service import get_counter_service
+
+# Columns a trending entry is built from (and the refresh scan selects)
+TRENDING_FIELDS = [
+    "id", "title", "humanity_challenge", "category", "date_created",
+    "upvotes", "downvotes", "view_count", "is_featured", "is_published"
+]
+
+# Fields returned for each trending idea besides its score
+_SUMMARY_FIELDS = ("id", "title", "humanity_challenge", "category", "date_created")
+
+SortKey = Tuple[float, str]
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        moment = value
+    else:
+        moment = datetime.fromisoformat(str(value))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+class TrendingIndex:
+    """
+    In-memory ranking of ideas by a time-decayed hot score.
+
+    An idea's points are its net upvotes, its views and a bonus if it is
+    featured, each weighted (see the TRENDING_* settings). Its hot score is
+    (1 + points) halved every half_life_hours since it was created.
+
+    Because every score decays at the same rate, the order never changes with
+    time alone: an idea is kept sorted by log2(1 + points) plus its creation
+    time in half-lives, and the decay is applied to the few ideas a request
+    returns. The order is a skip list, so a vote or view re-positions one
+    idea in O(log n) and top-k walks the first k entries.
+    """
+
+    def __init__(
+        self,
+        half_life_hours: Optional[float] = None,
+        vote_weight: Optional[float] = None,
+        view_weight: Optional[float] = None,
+        featured_bonus: Optional[float] = None,
+        pending_for: Optional[Callable[[Any], Dict[str, int]]] = None
+    ):
+        self.half_life_hours = half_life_hours or settings.TRENDING_HALF_LIFE_HOURS
+        self.vote_weight = settings.TRENDING_VOTE_WEIGHT if vote_weight is None else vote_weight
+        self.view_weight = settings.TRENDING_VIEW_WEIGHT if view_weight is None else view_weight
+        self.featured_bonus = settings.TRENDING_FEATURED_BONUS if featured_bonus is None else featured_bonus
+        # Counter increments not yet in the database, added to rows as they are indexed
+        self.pending_for = pending_for
+
+        self._lock = threading.Lock()
+        # Ascending (-rank, id), so the hottest idea comes first
+        self._order = SkipList()
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        self._keys: Dict[str, SortKey] = {}
+        # Ideas touched while a refresh scan is running; their live entries
+        # are newer than whatever the scan read
+        self._dirty: Optional[Set[str]] = None
+
+        self.ready = False
+        self.build_duration = 0.0
+        self._build_started: Optional[float] = None
+        self.refreshes = 0
+        self.last_refresh_at: Optional[float] = None
+        self.last_refresh_duration = 0.0
+        self.latency = LatencyRecorder()
+
+    def _points(self, doc: Dict[str, Any]) -> float:
+        return (
+            self.vote_weight * max(0, doc["upvotes"] - doc["downvotes"])
+            + self.view_weight * doc["view_count"]
+            + (self.featured_bonus if doc["is_featured"] else 0.0)
+        )
+
+    def _rank(self, doc: Dict[str, Any]) -> float:
+        # log2 of the hot score plus now / half-life, which is the same for every idea
+        return math.log2(1 + self._points(doc)) + doc["created_at"] / 3600 / self.half_life_hours
+
+    def _entry(self, idea: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if idea.get("is_published") is False:
+            return None
+        doc = {field: idea.get(field) for field in _SUMMARY_FIELDS}
+        doc["id"] = str(idea["id"])
+        doc["created_at"] = _timestamp(idea["date_created"])
+        doc["is_featured"] = bool(idea.get("is_featured"))
+        pending = self.pending_for(idea["id"]) if self.pending_for else {}
+        for column in ("upvotes", "downvotes", "view_count"):
+            doc[column] = (idea.get(column) or 0) + pending.get(column, 0)
+        return doc
+
+    def _set_locked(self, doc_id: str, doc: Optional[Dict[str, Any]]) -> None:
+        key = self._keys.pop(doc_id, None)
+        if key is not None:
+            self._order.remove(key)
+            del self._docs[doc_id]
+        if doc is not None:
+            key = (-self._rank(doc), doc_id)
+            self._order.add(key)
+            self._keys[doc_id] = key
+            self._docs[doc_id] = doc
+        if self._dirty is not None:
+            self._dirty.add(doc_id)
+
+    def add(self, idea: Dict[str, Any]) -> None:
+        """
+        Rank an idea row, replacing any previous version of it.
+        Unpublished ideas are left out.
+        """
+        doc = self._entry(idea)
+        with self._lock:
+            self._set_locked(str(idea["id"]), doc)
+
+    def add_many(self, ideas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Rank a batch of idea rows
+        """
+        docs = [(str(idea["id"]), self._entry(idea)) for idea in ideas]
+        with self._lock:
+            for doc_id, doc in docs:
+                self._set_locked(doc_id, doc)
+
+    def remove(self, idea_id: Any) -> None:
+        """
+        Drop an idea from the ranking
+        """
+        with self._lock:
+            self._set_locked(str(idea_id), None)
+
+    def increment(self, idea_id: Any, column: str, amount: int = 1) -> None:
+        """
+        Apply a vote or view to a ranked idea and move it to its new position
+        """
+        doc_id = str(idea_id)
+        with self._lock:
+            doc = self._docs.get(doc_id)
+            if doc is None:
+                return
+            self._set_locked(doc_id, {**doc, column: doc[column] + amount})
+
+    def clear(self) -> None:
+        """
+        Empty the ranking before a rebuild
+        """
+        with self._lock:
+            self._order.clear()
+            self._docs.clear()
+            self._keys.clear()
+            self.ready = False
+            self._build_started = time.monotonic()
+
+    def mark_ready(self) -> None:
+        """
+        Record that the startup scan has finished
+        """
+        self.ready = True
+        if self._build_started is not None:
+            self.build_duration = time.monotonic() - self._build_started
+
+    def begin_refresh(self) -> None:
+        """
+        Start tracking writes so a refresh scan does not undo them
+        """
+        with self._lock:
+            self._dirty = set()
+
+    def refresh(self, ideas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replace the ranking with the rows of a scan started after
+        begin_refresh(). Ideas touched since then keep their live entries.
+        """
+        started = time.monotonic()
+        docs = {str(idea["id"]): self._entry(idea) for idea in ideas}
+        with self._lock:
+            dirty = self._dirty or set()
+            self._dirty = None
+            for doc_id in dirty:
+                docs[doc_id] = self._docs.get(doc_id)
+            docs = {doc_id: doc for doc_id, doc in docs.items() if doc is not None}
+            keys = {doc_id: (-self._rank(doc), doc_id) for doc_id, doc in docs.items()}
+            self._docs = docs
+            self._keys = keys
+            self._order = SkipList()
+            for key in keys.values():
+                self._order.add(key)
+            self.ready = True
+
+        self.refreshes += 1
+        self.last_refresh_at = time.time()
+        self.last_refresh_duration = time.monotonic() - started
+
+    def abort_refresh(self) -> None:
+        """
+        Stop tracking writes after a failed refresh scan
+        """
+        with self._lock:
+            self._dirty = None
+
+    def top(self, limit: int = 20, offset: int = 0) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        The number of ranked ideas and the requested slice of the ranking,
+        each with its hot score as of now
+        """
+        started = time.perf_counter()
+        now_rank = time.time() / 3600 / self.half_life_hours
+        with self._lock:
+            total = len(self._order)
+            docs = [self._docs[doc_id] for _, doc_id in self._order.slice(offset, offset + limit)]
+        items = []
+        for doc in docs:
+            item = {field: doc[field] for field in _SUMMARY_FIELDS + ("upvotes", "downvotes", "view_count", "is_featured")}
+            item["hot_score"] = round(2 ** (self._rank(doc) - now_rank), 4)
+            items.append(item)
+        self.latency.record(time.perf_counter() - started)
+        return total, items
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Ranking size, refresh history and query latency
+        """
+        with self._lock:
+            documents = len(self._order)
+        return {
+            "ready": self.ready,
+            "documents": documents,
+            "half_life_hours": self.half_life_hours,
+            "build_duration_seconds": round(self.build_duration, 3),
+            "refreshes": self.refreshes,
+            "last_refresh_at": self.last_refresh_at,
+            "last_refresh_duration_seconds": round(self.last_refresh_duration, 4),
+            "queries": self.latency.count,
+            "query_latency_ms": self.latency.percentiles()
+        }
+
+
+# Process-wide trending ranking, built at startup and kept current by IdeaService
+trending_index = TrendingIndex(pending_for=get_counter_service().pending_for)
+
+def get_trending_index() -> TrendingIndex:
+    """
+    Returns the process-wide trending index
+    """
+    return trending_index
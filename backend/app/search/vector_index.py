@@ -0,0 +1,366 @@
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.latency import LatencyRecorder
+from app.search.embeddings import Embedder, get_embedder, idea_text
+
+Neighbour = Tuple[str, str, float]
+
+
+class VectorIndex:
+    """
+    Idea embeddings stored in a memory-mapped float32 matrix on disk.
+
+    Vectors are L2-normalised, so cosine similarity is a single matrix product
+    and top-k uses argpartition over the scores. Embedding happens on a
+    background thread: add() only queues the idea, so the write paths of
+    IdeaService never wait on the embeddings API. Ideas whose text has not
+    changed since they were embedded (tracked by a content hash that is saved
+    with the matrix) are not embedded again after a restart.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        embedder: Optional[Embedder] = None,
+        batch_size: int = 64,
+        initial_capacity: int = 1024
+    ):
+        self.directory = directory
+        self.embedder = embedder or get_embedder()
+        self.batch_size = batch_size
+        self.initial_capacity = initial_capacity
+
+        self._lock = threading.RLock()
+        self._queue: "queue.Queue[Tuple[str, str, str, str, int]]" = queue.Queue()
+        # Sequence number of the latest queued embedding per idea. Embeddings
+        # that are no longer the latest (the idea was changed again or deleted
+        # while they were queued or computed) are dropped instead of stored.
+        self._pending: Dict[str, int] = {}
+        self._sequence = 0
+        self._worker: Optional[threading.Thread] = None
+        self._seen: Optional[Set[str]] = None
+
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._titles: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        self._free: List[int] = []
+        self._matrix: Optional[np.memmap] = None
+        self._valid = np.zeros(0, dtype=bool)
+
+        self.ready = False
+        self.embedded = 0
+        self.embed_errors = 0
+        self.latency = LatencyRecorder()
+        self._load()
+
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    def _load(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        meta = None
+        if os.path.exists(self._meta_path) and os.path.exists(self._matrix_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            if meta.get("embedder") != self.embedder.name or meta.get("dim") != self.embedder.dim:
+                # Vectors from another embedder are not comparable; start over
+                meta = None
+
+        if meta is None:
+            self._matrix = np.memmap(
+                self._matrix_path, dtype=np.float32, mode="w+",
+                shape=(self.initial_capacity, self.embedder.dim)
+            )
+            self._valid = np.zeros(self.initial_capacity, dtype=bool)
+            self._save_meta()
+            return
+
+        self._matrix = np.memmap(
+            self._matrix_path, dtype=np.float32, mode="r+",
+            shape=(meta["capacity"], self.embedder.dim)
+        )
+        self._ids = meta["ids"]
+        self._titles = meta["titles"]
+        self._hashes = meta["hashes"]
+        self._valid = np.zeros(meta["capacity"], dtype=bool)
+        for row, idea_id in enumerate(self._ids):
+            if idea_id is None:
+                self._free.append(row)
+            else:
+                self._rows[idea_id] = row
+                self._valid[row] = True
+
+    def _save_meta(self) -> None:
+        meta = {
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "capacity": self._matrix.shape[0],
+            "ids": self._ids,
+            "titles": self._titles,
+            "hashes": self._hashes
+        }
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._meta_path)
+
+    def _grow(self) -> None:
+        capacity = self._matrix.shape[0]
+        data = np.array(self._matrix)
+        self._matrix.flush()
+        self._matrix = None
+        # w+ truncates the file, which is why the rows were copied out first
+        self._matrix = np.memmap(
+            self._matrix_path, dtype=np.float32, mode="w+",
+            shape=(capacity * 2, self.embedder.dim)
+        )
+        self._matrix[:capacity] = data
+        self._valid = np.concatenate([self._valid, np.zeros(capacity, dtype=bool)])
+
+    def _store(self, idea_id: str, title: str, content_hash: str, vector: np.ndarray) -> None:
+        row = self._rows.get(idea_id)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+                self._ids[row] = idea_id
+            else:
+                if len(self._ids) >= self._matrix.shape[0]:
+                    self._grow()
+                row = len(self._ids)
+                self._ids.append(idea_id)
+            self._rows[idea_id] = row
+        self._matrix[row] = vector
+        self._valid[row] = True
+        self._titles[idea_id] = title
+        self._hashes[idea_id] = content_hash
+
+    def add(self, idea: Dict[str, Any], vector: Optional[np.ndarray] = None) -> None:
+        """
+        Queue an idea row for embedding unless its text is unchanged. A
+        vector already computed from idea_text(idea) (see embed_text) is
+        stored straight away instead of being embedded again.
+        """
+        idea_id = str(idea["id"])
+        text = idea_text(idea)
+        content_hash = hashlib.sha1(text.encode()).hexdigest()
+        if vector is not None:
+            with self._lock:
+                if self._seen is not None:
+                    self._seen.add(idea_id)
+                # Supersedes any embedding of this idea still in the queue
+                self._pending.pop(idea_id, None)
+                self._store(idea_id, idea.get("title", ""), content_hash, vector)
+                self._matrix.flush()
+                self._save_meta()
+            return
+        with self._lock:
+            if self._seen is not None:
+                self._seen.add(idea_id)
+            if self._hashes.get(idea_id) == content_hash:
+                # Back to the stored text: drop any queued embedding of other text
+                self._pending.pop(idea_id, None)
+                if self._titles.get(idea_id) != idea.get("title"):
+                    self._titles[idea_id] = idea.get("title", "")
+                return
+            self._sequence += 1
+            sequence = self._pending[idea_id] = self._sequence
+        self._queue.put((idea_id, idea.get("title", ""), text, content_hash, sequence))
+        self._ensure_worker()
+
+    def add_many(self, ideas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Queue a batch of idea rows for embedding
+        """
+        for idea in ideas:
+            self.add(idea)
+
+    def remove(self, idea_id: Any) -> None:
+        """
+        Drop an idea's vector and free its row for reuse
+        """
+        with self._lock:
+            self._remove_locked(str(idea_id))
+            self._save_meta()
+
+    def _remove_locked(self, idea_id: str) -> None:
+        # An embedding still queued or being computed must not bring it back
+        self._pending.pop(idea_id, None)
+        row = self._rows.pop(idea_id, None)
+        if row is None:
+            return
+        self._ids[row] = None
+        self._valid[row] = False
+        self._matrix[row] = 0.0
+        self._free.append(row)
+        self._titles.pop(idea_id, None)
+        self._hashes.pop(idea_id, None)
+
+    def clear(self) -> None:
+        """
+        Start a rebuild. Persisted vectors are kept; ideas that the rebuild
+        scan does not see again are dropped in mark_ready().
+        """
+        with self._lock:
+            self._seen = set()
+            self.ready = False
+
+    def mark_ready(self) -> None:
+        """
+        Finish a rebuild by dropping vectors of ideas that no longer exist
+        """
+        with self._lock:
+            if self._seen is not None:
+                for idea_id in [i for i in self._rows if i not in self._seen]:
+                    self._remove_locked(idea_id)
+                self._seen = None
+                self._save_meta()
+            self.ready = True
+
+    def _ensure_worker(self) -> None:
+        if self._worker and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._run, name="idea-embedder", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                vectors = self.embedder.embed([text for _, _, text, _, _ in batch])
+            except Exception as e:
+                print(f"Error embedding {len(batch)} ideas: {str(e)}")
+                self.embed_errors += len(batch)
+                with self._lock:
+                    for idea_id, _, _, _, sequence in batch:
+                        if self._pending.get(idea_id) == sequence:
+                            del self._pending[idea_id]
+                continue
+            with self._lock:
+                for (idea_id, title, _, content_hash, sequence), vector in zip(batch, vectors):
+                    if self._pending.get(idea_id) != sequence:
+                        continue
+                    del self._pending[idea_id]
+                    self._store(idea_id, title, content_hash, vector)
+                self._matrix.flush()
+                self._save_meta()
+            self.embedded += len(batch)
+
+    def query_many(self, vectors: np.ndarray, k: int = 5, exclude: Optional[List[Optional[str]]] = None) -> List[List[Neighbour]]:
+        """
+        Batched top-k cosine search. Returns, for each query vector, a list of
+        (idea id, title, score) sorted by decreasing similarity. exclude holds
+        an optional idea id per query that must not appear in its results.
+        """
+        started = time.perf_counter()
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        with self._lock:
+            n = len(self._ids)
+            if n == 0:
+                return [[] for _ in range(len(vectors))]
+            scores = vectors @ self._matrix[:n].T
+            scores[:, ~self._valid[:n]] = -np.inf
+            for q, idea_id in enumerate(exclude or []):
+                if idea_id in self._rows:
+                    scores[q, self._rows[idea_id]] = -np.inf
+
+            kk = min(k, n)
+            top = np.argpartition(-scores, kk - 1, axis=1)[:, :kk]
+            results = []
+            for q in range(len(vectors)):
+                order = top[q][np.argsort(-scores[q, top[q]])]
+                results.append([
+                    (self._ids[row], self._titles.get(self._ids[row], ""), round(float(scores[q, row]), 4))
+                    for row in order if np.isfinite(scores[q, row])
+                ])
+        self.latency.record(time.perf_counter() - started)
+        return results
+
+    def similar(self, idea_id: Any, k: int = 5) -> Optional[List[Neighbour]]:
+        """
+        Nearest neighbours of an indexed idea, or None if it is not embedded yet
+        """
+        idea_id = str(idea_id)
+        with self._lock:
+            row = self._rows.get(idea_id)
+            if row is None:
+                return None
+            vector = np.array(self._matrix[row])
+        return self.query_many(vector, k, exclude=[idea_id])[0]
+
+    def embed_text(self, text: str) -> np.ndarray:
+        """
+        Embedding of a single text, e.g. to both query with and store later
+        """
+        return self.embedder.embed([text])[0]
+
+    def similar_to_vector(self, vector: np.ndarray, k: int = 5) -> List[Neighbour]:
+        """
+        Nearest neighbours of an embedding
+        """
+        return self.query_many(vector, k)[0]
+
+    def similar_to_text(self, text: str, k: int = 5) -> List[Neighbour]:
+        """
+        Nearest neighbours of arbitrary text (embeds the text first)
+        """
+        return self.similar_to_vector(self.embed_text(text), k)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Index size, embedding backlog and query latency
+        """
+        with self._lock:
+            size = len(self._rows)
+            capacity = self._matrix.shape[0]
+        return {
+            "ready": self.ready,
+            "embedder": self.embedder.name,
+            "dim": self.embedder.dim,
+            "vectors": size,
+            "capacity": capacity,
+            "pending": self._queue.qsize(),
+            "embedded": self.embedded,
+            "embed_errors": self.embed_errors,
+            "queries": self.latency.count,
+            "query_latency_ms": self.latency.percentiles()
+        }
+
+
+# Process-wide vector index, created on first use so the embedder is only
+# built (and the matrix only mapped) when something needs it
+_vector_index: Optional[VectorIndex] = None
+_vector_index_lock = threading.Lock()
+
+def get_vector_index() -> VectorIndex:
+    """
+    Returns the process-wide idea vector index
+    """
+    global _vector_index
+    if _vector_index is None:
+        with _vector_index_lock:
+            if _vector_index is None:
+                _vector_index = VectorIndex(settings.VECTOR_INDEX_DIR)
+    return _vector_index
@@ -1,6 +1,63 @@
-from typing import Dict, Any
+import hashlib
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional
 
-from app.agents.agent_idea_submission import analyze_idea_description
+from app.agents.agent_stack import get_agents, get_agent_stack
+from app.agents.enrichment import get_field_enricher
+from app.agents.idea_form import form_prompt, model_id, fallback_title
+from app.agents.structured_extraction import get_idea_extractor
+from app.core.config import settings
+from app.core.latency import LatencyRecorder
+from app.core.singleflight import SingleFlight
+from app.core.sqlite_cache import SQLiteCache
+from app.search.embeddings import idea_text
+from app.search.vector_index import get_vector_index
+
+
+# Process-wide, disk-backed cache of normalized analyze-idea results
+agent_result_cache = SQLiteCache(
+    settings.AGENT_CACHE_PATH,
+    ttl=settings.AGENT_CACHE_TTL_SECONDS,
+    max_entries=settings.AGENT_CACHE_MAX_ENTRIES,
+    max_bytes=settings.AGENT_CACHE_MAX_BYTES,
+    name="agent-results"
+)
+# Concurrent analyses of the same description share a single agent run
+agent_single_flight = SingleFlight()
+
+# Form fields every analysis must fill in
+REQUIRED_FORM_FIELDS = [
+    "title", "humanity_challenge", "category", "sub_category",
+    "geographic_focus", "time_horizon", "problem_statement",
+    "solution", "why_now", "market_estimate", "business_model",
+    "technologies", "competition", "status", "sources"
+]
+
+# Tiers of the analysis pipeline: a cached result, the single structured
+# extraction call, parallel web lookups for the fields it left empty, and
+# finally agent steps for whatever is still missing.
+# Counts are analyses completed at each tier; latency is the tier's own time.
+ANALYSIS_TIERS = ["cache", "extraction", "enrichment", "agent"]
+tier_completions: Dict[str, int] = {tier: 0 for tier in ANALYSIS_TIERS}
+tier_latency: Dict[str, LatencyRecorder] = {tier: LatencyRecorder() for tier in ANALYSIS_TIERS[1:]}
+_tier_lock = threading.Lock()
+
+def _record_completion(tier: str) -> None:
+    with _tier_lock:
+        tier_completions[tier] += 1
+
+def get_agent_result_cache() -> SQLiteCache:
+    """
+    Returns the process-wide agent result cache
+    """
+    return agent_result_cache
+
+def get_agent_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide single-flight group for agent runs
+    """
+    return agent_single_flight
 
 
 class AgentService:
@@ -8,62 +65,209 @@ class AgentService:
     Service for handling agent-related functionality.
     """
     
-    def analyze_idea_description(self, description: str) -> Dict[str, Any]:
+    def __init__(self):
+        self.cache = get_agent_result_cache()
+        self.single_flight = get_agent_single_flight()
+    
+    @staticmethod
+    def cache_key(description: str) -> str:
+        """
+        Content address of an analysis: the description with case and whitespace
+        normalized, plus everything else that changes the agent's answer
+        """
+        normalized = " ".join(description.split()).casefold()
+        prompt_hash = hashlib.sha256(form_prompt.encode()).hexdigest()
+        raw = "\n".join([settings.AGENT_CACHE_VERSION, model_id, prompt_hash, normalized])
+        return hashlib.sha256(raw.encode()).hexdigest()
+    
+    def _similar_idea_titles(self, form_data: Dict[str, Any]) -> List[str]:
+        """
+        Titles of existing ideas closest to the analyzed idea, from the vector index
+        """
+        if settings.SIMILAR_IDEAS_COUNT <= 0:
+            return []
+        try:
+            neighbours = get_vector_index().similar_to_text(idea_text(form_data), settings.SIMILAR_IDEAS_COUNT)
+            return [title for _, title, _ in neighbours]
+        except Exception as e:
+            print(f"Error finding similar ideas: {str(e)}")
+            return []
+    
+    def normalize_form_data(self, result: Dict[str, Any], fill_missing: bool = True) -> Dict[str, Any]:
+        """
+        Coerce raw agent output into the shape the submission form expects.
+        
+        Args:
+            result: The form fields produced by the agent
+            fill_missing: Add empty values for missing required fields (off for
+                partial results streamed while the agent is still running)
+            
+        Returns:
+            The same dictionary with required fields present, list fields as
+            lists and market_estimate as an integer
+        """
+        # Add any missing required fields with empty values
+        for field in REQUIRED_FORM_FIELDS if fill_missing else []:
+            if field not in result:
+                if field in ["technologies", "sources"]:
+                    result[field] = []
+                elif field == "market_estimate":
+                    result[field] = 0
+                else:
+                    result[field] = ""
+        
+        # Process list fields to ensure they're in the correct format
+        for field in ["technologies", "sources", "skills_required", 
+                     "potential_investors", "potential_customers", 
+                     "contacts", "collaboration_groups", "similar_ideas"]:
+            if field in result:
+                # If the field is a string, split it by commas
+                if isinstance(result[field], str):
+                    result[field] = [item.strip() for item in result[field].split(",")]
+        
+        # Ensure market_estimate is an integer
+        if "market_estimate" in result and result["market_estimate"] is not None:
+            try:
+                # If it's a string with a number, convert it
+                if isinstance(result["market_estimate"], str):
+                    # Remove any non-numeric characters (like $ or ,)
+                    clean_value = ''.join(c for c in result["market_estimate"] if c.isdigit())
+                    result["market_estimate"] = int(clean_value) if clean_value else 0
+            except (ValueError, TypeError):
+                result["market_estimate"] = 0
+        
+        return result
+    
+    def extract_fields(self, description: str) -> Dict[str, Any]:
+        """
+        First tier: fill what the description itself answers with a single
+        structured completion. Returns the normalized fields it found, or an
+        empty dict when extraction is disabled or fails.
+        """
+        if not settings.AGENT_EXTRACTION_ENABLED:
+            return {}
+        started = time.perf_counter()
+        try:
+            fields = get_idea_extractor().extract(description)
+        except Exception as e:
+            print(f"Error extracting idea fields: {str(e)}")
+            return {}
+        finally:
+            tier_latency["extraction"].record(time.perf_counter() - started)
+        return self.normalize_form_data(fields, fill_missing=False)
+    
+    def enrich_fields(self, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Second tier: look up the missing fields of a partly filled form in
+        parallel on the web. Returns the normalized fields that were found.
+        """
+        missing = self.missing_fields(fields)
+        # The lookups search for the idea by its title
+        if not settings.ENRICHMENT_ENABLED or not missing or not fields.get("title"):
+            return {}
+        started = time.perf_counter()
+        try:
+            enriched = get_field_enricher().enrich(fields, missing)
+        except Exception as e:
+            print(f"Error enriching idea fields: {str(e)}")
+            return {}
+        finally:
+            tier_latency["enrichment"].record(time.perf_counter() - started)
+        return self.normalize_form_data(enriched, fill_missing=False)
+    
+    @staticmethod
+    def missing_fields(fields: Dict[str, Any]) -> List[str]:
+        """
+        Required form fields that are still empty
+        """
+        return [field for field in REQUIRED_FORM_FIELDS if fields.get(field) in (None, "", [], 0)]
+    
+    def _run_analysis(self, key: str, description: str, cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Run the analysis pipeline (on a cache miss) and store the normalized result
+        """
+        # Another caller may have finished the same analysis while we waited
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        
+        known = self.extract_fields(description)
+        tier = "extraction"
+        if known and self.missing_fields(known):
+            enriched = self.enrich_fields(known)
+            if enriched:
+                known.update(enriched)
+                tier = "enrichment"
+        parsed = True
+        if known and not self.missing_fields(known):
+            result = known
+            _record_completion(tier)
+        else:
+            # Use the analyze_idea_description function from agent_idea_submission.py,
+            # asking it only for what extraction and enrichment could not fill
+            started = time.perf_counter()
+            agent_result = get_agents().analyze_idea_description(description, cancel_event, known or None)
+            tier_latency["agent"].record(time.perf_counter() - started)
+            _record_completion("agent")
+            parsed = agent_result.get("title") != fallback_title
+            if not parsed and known:
+                # Keep what extraction found rather than the placeholder form
+                result = known
+            else:
+                # Fields read from the description take precedence over the agent's
+                result = {**agent_result, **known}
+        result = self.normalize_form_data(result)
+        
+        # Don't keep placeholder forms from unparseable agent output around
+        if parsed and result.get("title") != fallback_title:
+            self.cache.set(key, result)
+        return result
+    
+    def analyze_idea_description(
+        self,
+        description: str,
+        cancel_event: Optional[threading.Event] = None,
+        raise_errors: bool = False
+    ) -> Dict[str, Any]:
         """
         Analyzes an idea description and extracts form fields.
         
+        Results are cached on disk by content address, and concurrent requests
+        for the same description share a single agent run. Setting
+        cancel_event detaches this caller; the shared run stops only when all
+        of its callers have cancelled.
+        
         Args:
             description: The user's idea description
+            cancel_event: Optional event that stops the agent run when set
+            raise_errors: Raise on failure instead of returning a placeholder form
             
         Returns:
             A dictionary containing the extracted form fields
         """
         try:
-            # Use the analyze_idea_description function from agent_idea_submission.py
-            result = analyze_idea_description(description)
-            
-            # Ensure we have a valid result with all required fields
-            required_fields = [
-                "title", "humanity_challenge", "category", "sub_category",
-                "geographic_focus", "time_horizon", "problem_statement",
-                "solution", "why_now", "market_estimate", "business_model",
-                "technologies", "competition", "status", "sources"
-            ]
-            
-            # Add any missing required fields with empty values
-            for field in required_fields:
-                if field not in result:
-                    if field in ["technologies", "sources"]:
-                        result[field] = []
-                    elif field == "market_estimate":
-                        result[field] = 0
-                    else:
-                        result[field] = ""
+            key = self.cache_key(description)
+            result = self.cache.get(key)
+            if result is None:
+                # The shared run is only cancelled once every caller waiting on it has cancelled
+                result = self.single_flight.do(
+                    key, lambda run_cancel: self._run_analysis(key, description, run_cancel), cancel_event
+                )
+                # Waiters share the leader's dict; give each caller its own copy
+                result = dict(result)
+            else:
+                _record_completion("cache")
             
-            # Process list fields to ensure they're in the correct format
-            for field in ["technologies", "sources", "skills_required", 
-                         "potential_investors", "potential_customers", 
-                         "contacts", "collaboration_groups", "similar_ideas"]:
-                if field in result:
-                    # If the field is a string, split it by commas
-                    if isinstance(result[field], str):
-                        result[field] = [item.strip() for item in result[field].split(",")]
-            
-            # Ensure market_estimate is an integer
-            if "market_estimate" in result and result["market_estimate"] is not None:
-                try:
-                    # If it's a string with a number, convert it
-                    if isinstance(result["market_estimate"], str):
-                        # Remove any non-numeric characters (like $ or ,)
-                        clean_value = ''.join(c for c in result["market_estimate"] if c.isdigit())
-                        result["market_estimate"] = int(clean_value) if clean_value else 0
-                except (ValueError, TypeError):
-                    result["market_estimate"] = 0
+            # Similar ideas come from our own vector index rather than the web
+            if not result.get("similar_ideas"):
+                result["similar_ideas"] = self._similar_idea_titles(result)
             
             return result
         except Exception as e:
             # Log the error
             print(f"Error in agent service: {str(e)}")
+            if raise_errors:
+                raise
             # Return a minimal valid form data structure
             return {
                 "title": "Error analyzing idea",
@@ -84,3 +288,118 @@ class AgentService:
                 "author": "",
                 "sources": []
             }
+    
+    def stream_analysis(self, description: str, cancel_event: Optional[threading.Event] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Analyze an idea description, yielding progress as it happens.
+        
+        Yields the agent's "planning" and "step" events as they are, and
+        "partial" events holding only the normalized form fields that changed
+        since the previous partial. Ends with a "result" event carrying the
+        same form data analyze_idea_description would return, or an "error"
+        event. Cached descriptions yield their result straight away, and the
+        fields found by structured extraction arrive as the first partial.
+        
+        Args:
+            description: The user's idea description
+            cancel_event: Optional event that stops the analysis when set
+                (between tiers, and between agent steps)
+        """
+        cancel_event = cancel_event or threading.Event()
+        key = self.cache_key(description)
+        cached = self.cache.get(key)
+        if cached is not None:
+            _record_completion("cache")
+            result = dict(cached)
+            if not result.get("similar_ideas"):
+                result["similar_ideas"] = self._similar_idea_titles(result)
+            yield {"event": "partial", "data": result}
+            yield {"event": "result", "data": result}
+            return
+        
+        known = self.extract_fields(description)
+        if known:
+            yield {"event": "partial", "data": known}
+        if known and not self.missing_fields(known):
+            _record_completion("extraction")
+            yield {"event": "result", "data": self._finish(key, known)}
+            return
+        if cancel_event.is_set():
+            return
+        
+        enriched = self.enrich_fields(known)
+        if enriched:
+            known.update(enriched)
+            yield {"event": "partial", "data": enriched}
+            if not self.missing_fields(known):
+                _record_completion("enrichment")
+                yield {"event": "result", "data": self._finish(key, known)}
+                return
+        if cancel_event.is_set():
+            return
+        
+        fields: Dict[str, Any] = dict(known)
+        started = time.perf_counter()
+        for event in get_agents().stream_idea_analysis(description, cancel_event, known or None):
+            if event["event"] == "partial":
+                partial = self.normalize_form_data(dict(event["data"]), fill_missing=False)
+                # Fields read from the description take precedence over the agent's
+                changed = {k: v for k, v in partial.items() if k not in known and fields.get(k) != v}
+                if changed:
+                    fields.update(changed)
+                    yield {"event": "partial", "data": changed}
+            elif event["event"] == "final":
+                tier_latency["agent"].record(time.perf_counter() - started)
+                _record_completion("agent")
+                agent_result = event["data"]
+                if agent_result.get("title") == fallback_title:
+                    yield {"event": "result", "data": self._finish(key, known or agent_result, cache=False)}
+                else:
+                    yield {"event": "result", "data": self._finish(key, {**agent_result, **known})}
+            else:
+                yield event
+    
+    def _finish(self, key: str, result: Dict[str, Any], cache: bool = True) -> Dict[str, Any]:
+        """
+        Normalize and cache a streamed analysis, then add similar ideas
+        """
+        result = self.normalize_form_data(result)
+        if cache and result.get("title") != fallback_title:
+            self.cache.set(key, result)
+        result = dict(result)
+        if not result.get("similar_ideas"):
+            result["similar_ideas"] = self._similar_idea_titles(result)
+        return result
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Agent result cache and single-flight counters
+        """
+        return {
+            **self.cache.stats(),
+            "single_flight": self.single_flight.stats()
+        }
+    
+    def tier_stats(self) -> Dict[str, Any]:
+        """
+        Analyses completed at each pipeline tier and the latency of each tier
+        """
+        with _tier_lock:
+            completions = dict(tier_completions)
+        return {
+            "completions": completions,
+            "latency_ms": {tier: recorder.percentiles() for tier, recorder in tier_latency.items()},
+            "extraction_enabled": settings.AGENT_EXTRACTION_ENABLED,
+            "enrichment_enabled": settings.ENRICHMENT_ENABLED,
+            "enrichment": get_field_enricher().stats()
+        }
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Agent pool occupancy and checkout wait time, once the agent stack is loaded
+        """
+        stack = get_agent_stack()
+        if not stack.loaded:
+            return {"stack": stack.state()}
+        return {**get_agents().agent_pool.stats(), "stack": stack.state()}
+
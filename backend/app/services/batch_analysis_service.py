@@ -0,0 +1,191 @@
+import asyncio
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+
+from app.agents.idea_form import fallback_title
+from app.core.config import settings
+from app.schemas.idea import IdeaCreate
+from app.services.agent_service import AgentService
+from app.services.idea_service import IdeaService, validation_message
+
+# Never returned to the client; set from the request when ideas are saved
+AUTHOR_FIELDS = ("author", "type_of_author")
+
+# Without these an analysis did not describe the idea and is not worth saving
+ESSENTIAL_FIELDS = ("title", "humanity_challenge", "category", "problem_statement", "solution")
+
+
+def invalid_reason(form_data: Dict[str, Any]) -> Optional[str]:
+    """
+    Why an analysis result is unusable (the agent output could not be
+    parsed, or essential fields are empty), or None if it is usable
+    """
+    if form_data.get("title") == fallback_title:
+        return "Agent output could not be parsed"
+    missing = [field for field in ESSENTIAL_FIELDS if not form_data.get(field)]
+    if missing:
+        return f"Missing required fields: {', '.join(missing)}"
+    return None
+
+
+class BatchAnalysisService:
+    """
+    Analyzes many idea descriptions at once for curator ingestion.
+
+    Items run through AgentService.analyze_idea_description with at most
+    `concurrency` in flight, and results are yielded in completion order. An
+    item that exceeds its time budget is reported as timed out straight away
+    and its run is cancelled; its slot is freed once the run has stopped (at
+    the next agent step), so the concurrency cap always holds.
+    """
+
+    def __init__(self, agent_service: Optional[AgentService] = None, idea_service: Optional[IdeaService] = None):
+        self.agent_service = agent_service or AgentService()
+        self.idea_service = idea_service
+
+    async def _run_item(
+        self,
+        index: int,
+        description: str,
+        budget: float,
+        slots: asyncio.Semaphore,
+        results: "asyncio.Queue[Dict[str, Any]]",
+        cancel_events: List[threading.Event]
+    ) -> None:
+        async with slots:
+            cancel_event = cancel_events[index]
+            started = time.perf_counter()
+            run = asyncio.ensure_future(run_in_threadpool(
+                self.agent_service.analyze_idea_description, description, cancel_event, True
+            ))
+            item: Dict[str, Any] = {"index": index}
+            try:
+                form_data = await asyncio.wait_for(asyncio.shield(run), budget)
+                reason = invalid_reason(form_data)
+                if reason:
+                    item.update(status="invalid", error=reason, form_data=form_data)
+                else:
+                    item.update(status="ok", form_data=form_data)
+            except asyncio.TimeoutError:
+                cancel_event.set()
+                item.update(status="timeout", error=f"Analysis exceeded {budget:g}s")
+            except Exception as e:
+                item.update(status="error", error=str(e))
+            item["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            await results.put(item)
+
+            if not run.done():
+                # Hold the slot until the cancelled run has actually stopped
+                try:
+                    await run
+                except Exception:
+                    pass
+
+    async def _persist(self, items: List[Dict[str, Any]], author: str, type_of_author: str) -> List[Dict[str, Any]]:
+        """
+        Save one batch of analyzed ideas with a single multi-row insert;
+        returns a "persisted" event per item
+        """
+        idea_service = self.idea_service or IdeaService()
+        events: Dict[int, Dict[str, Any]] = {}
+        valid: List[Tuple[int, IdeaCreate]] = []
+        for item in items:
+            try:
+                valid.append((item["index"], IdeaCreate.model_validate({
+                    **item["form_data"], "author": author, "type_of_author": type_of_author
+                })))
+            except ValidationError as e:
+                events[item["index"]] = {"index": item["index"], "status": "error", "error": validation_message(e)}
+
+        if valid:
+            try:
+                created = await idea_service.create_ideas([idea for _, idea in valid])
+                for (index, _), idea in zip(valid, created):
+                    events[index] = {"index": index, "status": "ok", "idea_id": str(idea.id)}
+            except Exception as e:
+                print(f"Error saving analyzed ideas: {str(e)}")
+                for index, _ in valid:
+                    events[index] = {"index": index, "status": "error", "error": str(e)}
+        return [events[item["index"]] for item in items]
+
+    async def analyze_batch(
+        self,
+        descriptions: List[str],
+        concurrency: Optional[int] = None,
+        item_budget: Optional[float] = None,
+        persist: bool = False,
+        author: str = "",
+        type_of_author: str = "Curator"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze descriptions concurrently, yielding events as items finish.
+
+        Yields a "result" event per item ({index, status, form_data and/or
+        error, duration_ms}) in completion order. Status "invalid" marks an
+        analysis whose agent output could not be parsed or that left essential
+        fields empty; such results are never saved. With persist, "ok" results
+        are saved through IdeaService.create_ideas in multi-row batches and a
+        "persisted" event ({index, status, idea_id or error}) follows each
+        saved item. Ends with a "done" event summarizing the batch. Closing the
+        generator cancels the items still running.
+        """
+        concurrency = max(1, min(concurrency or settings.AGENT_BATCH_CONCURRENCY, settings.AGENT_BATCH_MAX_CONCURRENCY))
+        budget = item_budget or settings.AGENT_BATCH_ITEM_BUDGET_SECONDS
+        started = time.perf_counter()
+
+        slots = asyncio.Semaphore(concurrency)
+        results: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        cancel_events = [threading.Event() for _ in descriptions]
+        tasks = [
+            asyncio.create_task(self._run_item(index, description, budget, slots, results, cancel_events))
+            for index, description in enumerate(descriptions)
+        ]
+        counts = {"ok": 0, "invalid": 0, "error": 0, "timeout": 0}
+        persisted = {"ok": 0, "error": 0}
+        pending_persist: List[Dict[str, Any]] = []
+
+        async def flush() -> AsyncIterator[Dict[str, Any]]:
+            batch = pending_persist[:]
+            pending_persist.clear()
+            for event in await self._persist(batch, author, type_of_author):
+                persisted[event["status"]] += 1
+                yield {"event": "persisted", "data": event}
+
+        try:
+            for _ in descriptions:
+                item = await results.get()
+                counts[item["status"]] += 1
+                if "form_data" in item:
+                    item["form_data"] = {k: v for k, v in item["form_data"].items() if k not in AUTHOR_FIELDS}
+                yield {"event": "result", "data": item}
+
+                if persist and item["status"] == "ok":
+                    pending_persist.append(item)
+                    if len(pending_persist) >= settings.AGENT_BATCH_PERSIST_BATCH_SIZE:
+                        async for event in flush():
+                            yield event
+            if pending_persist:
+                async for event in flush():
+                    yield event
+
+            took = time.perf_counter() - started
+            yield {"event": "done", "data": {
+                "items": len(descriptions),
+                **counts,
+                "persisted": persisted["ok"] if persist else None,
+                "persist_errors": persisted["error"] if persist else None,
+                "concurrency": concurrency,
+                "item_budget_seconds": budget,
+                "took_ms": round(took * 1000, 1),
+                "items_per_minute": round(len(descriptions) / took * 60, 2) if took > 0 else 0.0
+            }}
+        finally:
+            # The client went away (or the batch ended); stop whatever is still running
+            for cancel_event in cancel_events:
+                cancel_event.set()
+            for task in tasks:
+                task.cancel()
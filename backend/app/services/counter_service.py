@@ -0,0 +1,191 @@
+import threading
+import time
+from typing import Dict, Any, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.repositories.idea_repository import IdeaRepository
+
+COUNTER_COLUMNS = ("view_count", "upvotes", "downvotes")
+
+
+class CounterService:
+    """
+    Write-behind buffer for idea view and vote counters.
+
+    Increments are merged per idea in memory and flushed to the database in
+    one batched, atomic server-side increment, either every flush interval or
+    as soon as the number of buffered ideas reaches the size threshold.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[IdeaRepository] = None,
+        flush_interval: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.repository = repository or IdeaRepository()
+        self.flush_interval = flush_interval or settings.COUNTER_FLUSH_INTERVAL_SECONDS
+        self.max_pending = max_pending or settings.COUNTER_FLUSH_MAX_PENDING
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._pending_since: Optional[float] = None
+        self._in_flight: Dict[str, Dict[str, int]] = {}
+        self._in_flight_since: Optional[float] = None
+
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.flushes = 0
+        self.failed_flushes = 0
+        self.flushed_increments = 0
+        self.last_flush_at: Optional[float] = None
+        self.last_flush_duration = 0.0
+
+    def increment(self, idea_id: UUID, column: str, amount: int = 1) -> None:
+        """
+        Record an increment without touching the database
+        """
+        if column not in COUNTER_COLUMNS:
+            raise ValueError(f"Unknown counter column: {column}")
+
+        with self._lock:
+            deltas = self._pending.setdefault(str(idea_id), {})
+            deltas[column] = deltas.get(column, 0) + amount
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            pending_ideas = len(self._pending)
+
+        if pending_ideas >= self.max_pending:
+            self._wakeup.set()
+
+    def pending_for(self, idea_id: UUID) -> Dict[str, int]:
+        """
+        Get the increments of an idea that are not yet in the database
+        """
+        key = str(idea_id)
+        with self._lock:
+            totals = dict(self._in_flight.get(key, {}))
+            for column, amount in self._pending.get(key, {}).items():
+                totals[column] = totals.get(column, 0) + amount
+        return totals
+
+    def apply_pending(self, idea: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add the not-yet-flushed increments to a database row, in place.
+        Columns that are not in the row (projected away) are left out.
+        """
+        for column, amount in self.pending_for(idea["id"]).items():
+            if column in idea:
+                idea[column] = (idea[column] or 0) + amount
+        return idea
+
+    def flush(self) -> int:
+        """
+        Push all buffered increments to the database.
+
+        Returns the number of ideas that were updated. On failure the batch is
+        merged back into the buffer so no increment is lost.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return 0
+                batch = self._pending
+                self._in_flight, self._in_flight_since = batch, self._pending_since
+                self._pending, self._pending_since = {}, None
+
+            updates = [{"id": idea_id, **deltas} for idea_id, deltas in batch.items()]
+            started = time.monotonic()
+            try:
+                self.repository.increment_counters(updates)
+            except Exception as e:
+                print(f"Error flushing idea counters: {str(e)}")
+                with self._lock:
+                    for idea_id, deltas in batch.items():
+                        pending = self._pending.setdefault(idea_id, {})
+                        for column, amount in deltas.items():
+                            pending[column] = pending.get(column, 0) + amount
+                    self._pending_since = min(
+                        t for t in (self._pending_since, self._in_flight_since) if t is not None
+                    )
+                    self._in_flight, self._in_flight_since = {}, None
+                self.failed_flushes += 1
+                return 0
+
+            with self._lock:
+                self._in_flight, self._in_flight_since = {}, None
+            self.flushes += 1
+            self.flushed_increments += sum(sum(d.values()) for d in batch.values())
+            self.last_flush_at = time.time()
+            self.last_flush_duration = time.monotonic() - started
+            return len(batch)
+
+    def start(self) -> None:
+        """
+        Start the background flush thread
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="idea-counter-flusher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread and flush whatever is still buffered
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout=self.flush_interval + 5)
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Buffer size and flush lag (age of the oldest unflushed increment)
+        """
+        now = time.monotonic()
+        with self._lock:
+            oldest = min(
+                (t for t in (self._pending_since, self._in_flight_since) if t is not None),
+                default=None
+            )
+            pending_ideas = len(self._pending) + len(self._in_flight)
+            pending_increments = sum(
+                sum(d.values()) for d in list(self._pending.values()) + list(self._in_flight.values())
+            )
+        return {
+            "pending_ideas": pending_ideas,
+            "pending_increments": pending_increments,
+            "flush_lag_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "flush_interval_seconds": self.flush_interval,
+            "max_pending": self.max_pending,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "flushed_increments": self.flushed_increments,
+            "last_flush_at": self.last_flush_at,
+            "last_flush_duration_seconds": round(self.last_flush_duration, 4)
+        }
+
+
+# Process-wide counter buffer shared by every IdeaService instance
+counter_service = CounterService()
+
+def get_counter_service() -> CounterService:
+    """
+    Returns the process-wide counter buffer
+    """
+    return counter_service
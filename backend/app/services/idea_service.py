@@ -1,37 +1,457 @@
-from app.repositories.idea_repository import IdeaRepository
-from app.schemas.idea import IdeaCreate, IdeaUpdate, IdeaResponse
+from app.repositories.idea_repository import get_idea_repository
+from app.schemas.idea import (
+    IdeaCreate, IdeaUpdate, IdeaResponse, IdeaPage, IdeaSearchResponse, SimilarIdea,
+    IdeaImportError, IdeaImportReport, IdeaFacets, TrendingIdeas, IdeaSummary, IdeaProjection,
+    IDEA_FIELDS, IDEA_SUMMARY_FIELDS
+)
+from app.search.idea_search_index import get_idea_search_index, FACET_FIELDS
+from app.search.facet_index import get_facet_index, facet_values
+from app.search.trending_index import get_trending_index, TRENDING_FIELDS
+from app.search.vector_index import get_vector_index
+from app.search.embeddings import idea_text
+from starlette.concurrency import run_in_threadpool
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.ndjson import ndjson_line, iter_ndjson_lines
+from app.core.etag import weak_etag
+from app.services.counter_service import get_counter_service
+from app.core.cache import TTLCache
+from app.core.config import settings
 from uuid import UUID
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, AsyncIterator, Hashable, Iterable, Tuple
+from pydantic import ValidationError
+import asyncio
+import time
+
+# Process-wide cache of IdeaResponse objects keyed by idea id (as a string).
+# Cached entries already include counter increments that are not yet flushed.
+idea_cache = TTLCache(
+    maxsize=settings.IDEA_CACHE_MAX_ENTRIES,
+    ttl=settings.IDEA_CACHE_TTL_SECONDS,
+    name="ideas"
+)
+
+# Ids of the ideas on recently served list pages, keyed by the list query
+idea_list_cache = TTLCache(
+    maxsize=settings.IDEA_LIST_CACHE_MAX_ENTRIES,
+    ttl=settings.IDEA_LIST_CACHE_TTL_SECONDS,
+    name="idea-lists"
+)
+
+def get_idea_list_cache() -> TTLCache:
+    """
+    Returns the process-wide idea list cache
+    """
+    return idea_list_cache
+
+def _idea_version(idea: IdeaResponse, views: bool = True) -> str:
+    version = f"{idea.id}:{idea.date_updated.isoformat()}:{idea.upvotes}:{idea.downvotes}"
+    return f"{version}:{idea.view_count}" if views else version
+
+def idea_etag(idea: IdeaResponse) -> str:
+    """
+    ETag of an idea: changes when it is edited or voted on
+    """
+    # The view count is left out: every GET of an idea counts a view, so
+    # including it would change the ETag on every poll
+    return weak_etag([_idea_version(idea, views=False)])
+
+def ideas_etag(ideas: Iterable[IdeaResponse]) -> str:
+    """
+    ETag of a list of ideas: changes when its membership or order changes,
+    or when any idea on it is edited, voted on or viewed. Listing does not
+    count views, so the view counts in the body are safe to include.
+    """
+    return weak_etag(_idea_version(idea) for idea in ideas)
+
+def validation_message(error: ValidationError) -> str:
+    """
+    One-line summary of a validation error: "field: message; ..."
+    """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'value'}: {e['msg']}" for e in error.errors()
+    )
+
+def get_idea_cache() -> TTLCache:
+    """
+    Returns the process-wide idea cache
+    """
+    return idea_cache
 
 class IdeaService:
+    """
+    Async service for ideas. The repository is either the native async one or
+    the blocking one run in a threadpool, depending on settings.IDEAS_ASYNC_CLIENT.
+    """
     def __init__(self):
-        self.repository = IdeaRepository()
+        self.repository = get_idea_repository()
+        self.counters = get_counter_service()
+        self.cache = get_idea_cache()
+        self.list_cache = get_idea_list_cache()
+        self.search_index = get_idea_search_index()
+        self.vector_index = get_vector_index()
+        self.facet_index = get_facet_index()
+        self.trending_index = get_trending_index()
+        # In-memory indexes kept current by the create/update/delete paths.
+        # Each one provides add(row), add_many(rows), remove(id), clear() and mark_ready().
+        self.indexes = [self.search_index, self.vector_index, self.facet_index, self.trending_index]
+    
+    def _to_response(self, idea: Dict[str, Any]) -> IdeaResponse:
+        """
+        Build an IdeaResponse from a database row and refresh its cache entry
+        """
+        response = IdeaResponse.model_validate(self.counters.apply_pending(idea))
+        self.cache.set(str(response.id), response)
+        return response
+    
+    def _index_upsert(self, idea: Dict[str, Any], vector: Any = None) -> None:
+        """
+        Add or replace an idea in every index. vector is its embedding, if
+        it was already computed, so the vector index does not embed it again.
+        """
+        for index in self.indexes:
+            try:
+                if index is self.vector_index and vector is not None:
+                    index.add(idea, vector=vector)
+                else:
+                    index.add(idea)
+            except Exception as e:
+                print(f"Error indexing idea {idea.get('id')} in {type(index).__name__}: {str(e)}")
+    
+    def _index_delete(self, idea_id: UUID) -> None:
+        for index in self.indexes:
+            index.remove(idea_id)
+    
+    async def stream_ideas(
+        self,
+        columns: str = "*",
+        batch_size: int = 500,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Scan the whole ideas table in keyset-paginated batches
+        """
+        after = None
+        while True:
+            result = await self.repository.get_page(batch_size, after, columns, filters)
+            if not result.data:
+                return
+            yield result.data
+            if len(result.data) < batch_size:
+                return
+            last = result.data[-1]
+            after = (last["date_created"], str(last["id"]))
+    
+    async def rebuild_indexes(self) -> None:
+        """
+        Rebuild every in-memory index from a single streamed scan of the table.
+        An index that fails to load is left out of the rest of the scan and not
+        marked ready; the others still finish loading.
+        """
+        for index in self.indexes:
+            index.clear()
+        failed: List[Any] = []
+        try:
+            async for batch in self.stream_ideas():
+                for index in self.indexes:
+                    if index in failed:
+                        continue
+                    try:
+                        index.add_many(batch)
+                    except Exception as e:
+                        print(f"Error rebuilding {type(index).__name__}: {str(e)}")
+                        failed.append(index)
+        except Exception as e:
+            print(f"Error rebuilding idea indexes: {str(e)}")
+            return
+        for index in self.indexes:
+            if index not in failed:
+                index.mark_ready()
+    
+    def get_facets(self) -> IdeaFacets:
+        """
+        Number of ideas per facet value, from the in-memory counts (no database query)
+        """
+        total, facets = self.facet_index.counts()
+        return IdeaFacets(total=total, facets=facets, ready=self.facet_index.ready)
     
-    def get_all_ideas(self, limit: int = 100, offset: int = 0) -> List[IdeaResponse]:
+    async def reconcile_facets(self) -> Optional[int]:
+        """
+        Recount the facets from a scan of the facet columns and replace the
+        in-memory counts. Returns the number of ideas that had drifted, or
+        None if the scan failed.
+        """
+        self.facet_index.begin_reconcile()
+        scanned = {}
+        try:
+            async for batch in self.stream_ideas(
+                ",".join(["id", "date_created"] + FACET_FIELDS), settings.FACET_RECONCILE_BATCH_SIZE
+            ):
+                for idea in batch:
+                    scanned[str(idea["id"])] = facet_values(idea)
+        except Exception as e:
+            self.facet_index.abort_reconcile()
+            print(f"Error reconciling facet counts: {str(e)}")
+            return None
+        return self.facet_index.reconcile(scanned)
+    
+    async def reconcile_facets_periodically(self, interval: Optional[float] = None) -> None:
+        """
+        Run reconcile_facets every interval until cancelled
+        """
+        interval = interval or settings.FACET_RECONCILE_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            drift = await self.reconcile_facets()
+            if drift:
+                print(f"Facet counts had drifted for {drift} ideas; reconciled")
+    
+    def get_trending(self, limit: int = 20, offset: int = 0) -> TrendingIdeas:
+        """
+        Ideas with the highest hot score, from the in-memory ranking (no database query)
+        """
+        total, items = self.trending_index.top(limit, offset)
+        return TrendingIdeas(total=total, items=items, ready=self.trending_index.ready)
+    
+    async def refresh_trending(self) -> bool:
+        """
+        Re-read the ranked columns of every idea, so votes and views recorded
+        by other processes are reflected. Returns False if the scan failed.
+        """
+        self.trending_index.begin_refresh()
+        rows: List[Dict[str, Any]] = []
+        try:
+            async for batch in self.stream_ideas(",".join(TRENDING_FIELDS), settings.TRENDING_REFRESH_BATCH_SIZE):
+                rows.extend(batch)
+        except Exception as e:
+            self.trending_index.abort_refresh()
+            print(f"Error refreshing trending ideas: {str(e)}")
+            return False
+        self.trending_index.refresh(rows)
+        return True
+    
+    async def refresh_trending_periodically(self, interval: Optional[float] = None) -> None:
+        """
+        Run refresh_trending every interval until cancelled
+        """
+        interval = interval or settings.TRENDING_REFRESH_INTERVAL_SECONDS
+        while True:
+            await asyncio.sleep(interval)
+            await self.refresh_trending()
+    
+    async def get_all_ideas(self, limit: int = 100, offset: int = 0) -> List[IdeaResponse]:
         """
         Get all ideas with pagination
         """
-        result = self.repository.get_all(limit, offset)
-        return [IdeaResponse.model_validate(idea) for idea in result.data]
+        result = await self.repository.get_all(limit, offset)
+        ideas = [self._to_response(idea) for idea in result.data]
+        self.list_cache.set(("all", limit, offset), tuple(str(idea.id) for idea in ideas))
+        return ideas
+    
+    def _cached_list_etag(self, key: Hashable) -> Optional[str]:
+        """
+        ETag of a list page recomputed from the caches alone. None when the
+        page, or any idea on it, is no longer cached.
+        """
+        ids = self.list_cache.peek(key)
+        if ids is None:
+            return None
+        ideas = [self.cache.peek(idea_id) for idea_id in ids]
+        if any(idea is None for idea in ideas):
+            return None
+        return ideas_etag(ideas)
+    
+    def get_all_ideas_etag(self, limit: int = 100, offset: int = 0) -> Optional[str]:
+        """
+        Current ETag of get_all_ideas(limit, offset), if it is known without a
+        database query
+        """
+        return self._cached_list_etag(("all", limit, offset))
+    
+    def get_idea_etag(self, idea_id: UUID) -> Optional[str]:
+        """
+        Current ETag of an idea, if it is cached
+        """
+        idea = self.cache.peek(str(idea_id))
+        return idea_etag(idea) if idea is not None else None
     
-    def get_idea_by_id(self, idea_id: UUID) -> Optional[IdeaResponse]:
+    @staticmethod
+    def _select_columns(fields: Optional[str]) -> List[str]:
         """
-        Get an idea by its ID
+        Resolve a fields= value ("summary", "all" or comma-separated columns)
+        into the PostgREST select list. Raises ValueError on unknown columns.
         """
-        result = self.repository.get_by_id(idea_id)
+        if not fields or fields == "summary":
+            return list(IDEA_SUMMARY_FIELDS)
+        if fields in ("all", "*"):
+            return list(IDEA_FIELDS)
+        
+        columns = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [c for c in columns if c not in IDEA_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # The cursor is built from these two, so they are always selected
+        for required in ("date_created", "id"):
+            if required not in columns:
+                columns.insert(0, required)
+        return columns
+    
+    async def get_ideas_page(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> IdeaPage:
+        """
+        Get ideas newest first with keyset pagination and a column projection
+        """
+        columns = self._select_columns(fields)
+        after = decode_cursor(cursor)
+        
+        # Fetch one extra row to know whether there is a next page
+        result = await self.repository.get_page(limit + 1, after, ",".join(columns), filters)
+        rows = result.data
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["date_created"], rows[-1]["id"])
+        
+        item_model = IdeaSummary if columns == IDEA_SUMMARY_FIELDS else IdeaProjection
+        return IdeaPage(
+            items=[item_model.model_validate(self.counters.apply_pending(row)) for row in rows],
+            next_cursor=next_cursor
+        )
+    
+    def export_ideas(
+        self,
+        fields: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Every idea (newest first) as NDJSON lines, read in keyset-paginated
+        batches so memory use does not grow with the table.
+
+        The columns are resolved before the stream starts, so unknown fields
+        raise ValueError here rather than halfway through a response.
+        """
+        columns = ",".join(self._select_columns(fields or "all"))
+        return self._export(columns, filters)
+    
+    async def _export(self, columns: str, filters: Optional[Dict[str, Any]]) -> AsyncIterator[str]:
+        async for batch in self.stream_ideas(columns, settings.IDEA_EXPORT_BATCH_SIZE, filters):
+            # One chunk per batch keeps the number of writes to the socket low
+            yield "".join(ndjson_line(self.counters.apply_pending(row)) for row in batch)
+    
+    async def import_ideas(self, chunks: AsyncIterator[bytes], batch_size: Optional[int] = None) -> IdeaImportReport:
+        """
+        Create ideas from an NDJSON stream, one IdeaCreate per line.
+
+        Lines are validated as they arrive and valid rows are inserted in
+        multi-row batches. Invalid lines, and the rows of a batch the database
+        rejected, are reported with their line numbers; the rest of the import
+        carries on. Similar ideas are not suggested for imported rows.
+        """
+        batch_size = batch_size or settings.IDEA_IMPORT_BATCH_SIZE
+        started = time.perf_counter()
+        errors: List[IdeaImportError] = []
+        batch: List[Tuple[int, Dict[str, Any]]] = []
+        received = imported = batches = 0
+        
+        async for line_number, line in iter_ndjson_lines(chunks, settings.IDEA_IMPORT_MAX_LINE_BYTES):
+            if line is None:
+                received += 1
+                errors.append(IdeaImportError(
+                    line=line_number, error=f"Line exceeds {settings.IDEA_IMPORT_MAX_LINE_BYTES} bytes"
+                ))
+                continue
+            if not line.strip():
+                continue
+            received += 1
+            try:
+                idea = IdeaCreate.model_validate_json(line)
+            except ValidationError as e:
+                errors.append(IdeaImportError(line=line_number, error=validation_message(e)))
+                continue
+            batch.append((line_number, idea.model_dump()))
+            if len(batch) >= batch_size:
+                imported += await self._insert_batch(batch, errors)
+                batches += 1
+                batch = []
+        if batch:
+            imported += await self._insert_batch(batch, errors)
+            batches += 1
+        
+        took = time.perf_counter() - started
+        return IdeaImportReport(
+            received=received,
+            imported=imported,
+            failed=len(errors),
+            batches=batches,
+            errors=errors,
+            took_ms=round(took * 1000, 3),
+            rows_per_second=round(imported / took, 2) if took > 0 else 0.0
+        )
+    
+    async def _insert_batch(self, batch: List[Tuple[int, Dict[str, Any]]], errors: List[IdeaImportError]) -> int:
+        """
+        Insert one batch of validated rows; returns the number inserted
+        """
+        try:
+            result = await self.repository.create_many([row for _, row in batch])
+        except Exception as e:
+            print(f"Error importing ideas: {str(e)}")
+            errors.extend(IdeaImportError(line=line_number, error=str(e)) for line_number, _ in batch)
+            return 0
+        self._index_inserted(result.data)
+        return len(result.data)
+    
+    def _index_inserted(self, rows: List[Dict[str, Any]]) -> None:
+        # New ideas change which ideas are on each list page
+        self.list_cache.clear()
+        for index in self.indexes:
+            try:
+                index.add_many(rows)
+            except Exception as e:
+                print(f"Error indexing inserted ideas in {type(index).__name__}: {str(e)}")
+    
+    async def create_ideas(self, ideas: List[IdeaCreate]) -> List[IdeaResponse]:
+        """
+        Create several ideas with one multi-row insert, returned in the same
+        order. Unlike create_idea, similar ideas are not suggested.
+        """
+        result = await self.repository.create_many([idea.model_dump() for idea in ideas])
+        self._index_inserted(result.data)
+        return [self._to_response(row) for row in result.data]
+    
+    async def get_idea_by_id(self, idea_id: UUID) -> Optional[IdeaResponse]:
+        """
+        Get an idea by its ID (served from the cache when possible)
+        """
+        cached = self.cache.get(str(idea_id))
+        if cached is not None:
+            return cached
+        
+        result = await self.repository.get_by_id(idea_id)
         if result.data:
-            return IdeaResponse.model_validate(result.data)
+            return self._to_response(result.data)
         return None
     
-    def create_idea(self, idea: IdeaCreate) -> IdeaResponse:
+    async def create_idea(self, idea: IdeaCreate) -> IdeaResponse:
         """
         Create a new idea
         """
         idea_dict = idea.model_dump()
-        result = self.repository.create(idea_dict)
-        return IdeaResponse.model_validate(result.data[0])
+        vector = None
+        if not idea_dict.get("similar_ideas"):
+            # The embedding is kept for the vector index, so the idea is embedded once
+            idea_dict["similar_ideas"], vector = await self._similar_titles_and_vector(idea_dict)
+        result = await self.repository.create(idea_dict)
+        # A new idea changes which ideas are on each list page
+        self.list_cache.clear()
+        self._index_upsert(result.data[0], vector)
+        return self._to_response(result.data[0])
     
-    def update_idea(self, idea_id: UUID, idea: IdeaUpdate) -> Optional[IdeaResponse]:
+    async def update_idea(self, idea_id: UUID, idea: IdeaUpdate) -> Optional[IdeaResponse]:
         """
         Update an existing idea
         """
@@ -40,44 +460,129 @@ class IdeaService:
         
         if not update_data:
             # If no fields to update, just return the current idea
-            return self.get_idea_by_id(idea_id)
+            return await self.get_idea_by_id(idea_id)
         
         # Update the date_updated field
         update_data["date_updated"] = "NOW()"
         
-        result = self.repository.update(idea_id, update_data)
+        result = await self.repository.update(idea_id, update_data)
+        self.list_cache.clear()
         if result.data:
-            return IdeaResponse.model_validate(result.data[0])
+            self._index_upsert(result.data[0])
+            return self._to_response(result.data[0])
+        self.cache.delete(str(idea_id))
         return None
     
-    def delete_idea(self, idea_id: UUID) -> bool:
+    async def delete_idea(self, idea_id: UUID) -> bool:
         """
         Delete an idea
         """
-        result = self.repository.delete(idea_id)
+        result = await self.repository.delete(idea_id)
+        self.cache.delete(str(idea_id))
+        self.list_cache.clear()
+        self._index_delete(idea_id)
         return len(result.data) > 0
     
-    def search_ideas(self, query_params: Dict[str, Any]) -> List[IdeaResponse]:
+    async def search_ideas(self, query_params: Dict[str, Any]) -> List[IdeaResponse]:
         """
         Search ideas based on query parameters
         """
-        result = self.repository.search(query_params)
-        return [IdeaResponse.model_validate(idea) for idea in result.data]
+        result = await self.repository.search(query_params)
+        ideas = [self._to_response(idea) for idea in result.data]
+        self.list_cache.set(self._search_key(query_params), tuple(str(idea.id) for idea in ideas))
+        return ideas
+    
+    @staticmethod
+    def _search_key(query_params: Dict[str, Any]) -> Hashable:
+        return ("search",) + tuple(sorted((k, str(v)) for k, v in query_params.items() if v is not None))
+    
+    def search_ideas_etag(self, query_params: Dict[str, Any]) -> Optional[str]:
+        """
+        Current ETag of search_ideas(query_params), if it is known without a
+        database query
+        """
+        return self._cached_list_etag(self._search_key(query_params))
+    
+    async def full_text_search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> IdeaSearchResponse:
+        """
+        Ranked full-text search over the in-memory index
+        """
+        started = time.perf_counter()
+        total, hits, facets = self.search_index.search(query, limit, offset, filters)
+        return IdeaSearchResponse(
+            total=total,
+            items=hits,
+            facets=facets,
+            took_ms=round((time.perf_counter() - started) * 1000, 3)
+        )
+    
+    async def suggest_similar_titles(self, idea: Dict[str, Any]) -> Optional[List[str]]:
+        """
+        Titles of the existing ideas closest to a (possibly unsaved) idea
+        """
+        titles, _ = await self._similar_titles_and_vector(idea)
+        return titles
+    
+    async def _similar_titles_and_vector(self, idea: Dict[str, Any]) -> Tuple[Optional[List[str]], Any]:
+        """
+        Similar titles for an idea plus the embedding they were found with
+        (None when suggestions are off or embedding failed)
+        """
+        if settings.SIMILAR_IDEAS_COUNT <= 0:
+            return None, None
+        def lookup() -> Tuple[Any, List[Any]]:
+            vector = self.vector_index.embed_text(idea_text(idea))
+            return vector, self.vector_index.similar_to_vector(vector, settings.SIMILAR_IDEAS_COUNT)
+        
+        try:
+            vector, neighbours = await run_in_threadpool(lookup)
+        except Exception as e:
+            print(f"Error finding similar ideas: {str(e)}")
+            return None, None
+        return [title for _, title, _ in neighbours] or None, vector
+    
+    def get_similar_ideas(self, idea_id: UUID, k: int = 5) -> Optional[List[SimilarIdea]]:
+        """
+        Nearest neighbours of an idea from the vector index (no LLM call).
+        Returns None if the idea has not been embedded.
+        """
+        neighbours = self.vector_index.similar(idea_id, k)
+        if neighbours is None:
+            return None
+        return [SimilarIdea(id=i, title=title, score=score) for i, title, score in neighbours]
+    
+    def _increment(self, idea_id: UUID, column: str) -> None:
+        """
+        Buffer a counter increment and apply it to the cached idea, if any,
+        and to its position in the trending ranking
+        """
+        self.counters.increment(idea_id, column)
+        self.trending_index.increment(idea_id, column)
+        self.cache.update(
+            str(idea_id),
+            lambda cached: cached.model_copy(update={column: getattr(cached, column) + 1})
+        )
     
-    def view_idea(self, idea_id: UUID) -> None:
+    async def view_idea(self, idea_id: UUID) -> None:
         """
-        Increment the view count of an idea
+        Increment the view count of an idea (buffered, flushed in the background)
         """
-        self.repository.increment_view_count(idea_id)
+        self._increment(idea_id, "view_count")
     
-    def upvote_idea(self, idea_id: UUID) -> None:
+    async def upvote_idea(self, idea_id: UUID) -> None:
         """
-        Increment the upvotes of an idea
+        Increment the upvotes of an idea (buffered, flushed in the background)
         """
-        self.repository.upvote(idea_id)
+        self._increment(idea_id, "upvotes")
     
-    def downvote_idea(self, idea_id: UUID) -> None:
+    async def downvote_idea(self, idea_id: UUID) -> None:
         """
-        Increment the downvotes of an idea
+        Increment the downvotes of an idea (buffered, flushed in the background)
         """
-        self.repository.downvote(idea_id) 
\ No newline at end of file
+        self._increment(idea_id, "downvotes")
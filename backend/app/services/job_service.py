@@ -0,0 +1,207 @@
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.repositories.job_repository import (
+    JobRepository, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED
+)
+
+ANALYZE_IDEA_JOB = "analyze_idea"
+
+
+class JobQueueFullError(Exception):
+    """
+    Raised when a job is submitted while the queue is at its maximum depth
+    """
+
+
+class JobService:
+    """
+    Bounded background queue for long-running agent analyses.
+
+    Jobs are persisted in a SQLite store and executed by a fixed pool of worker
+    threads. Jobs that were queued or still running when the process stopped
+    are queued again on the next start. Finished jobs are deleted once they
+    are older than the retention period.
+    """
+
+    def __init__(
+        self,
+        repository: Optional[JobRepository] = None,
+        workers: Optional[int] = None,
+        max_depth: Optional[int] = None,
+        retention: Optional[float] = None
+    ):
+        self.repository = repository or JobRepository(settings.JOB_STORE_PATH)
+        self.workers = workers or settings.JOB_WORKERS
+        self.max_depth = max_depth or settings.JOB_QUEUE_MAX_DEPTH
+        self.retention = retention or settings.JOB_RETENTION_SECONDS
+        self.cleanup_interval = settings.JOB_CLEANUP_INTERVAL_SECONDS
+        self.handlers: Dict[str, Callable[[Dict[str, Any], threading.Event], Any]] = {
+            ANALYZE_IDEA_JOB: self._analyze_idea
+        }
+
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._running = 0
+        self._stopping = threading.Event()
+        self._cleaner: Optional[threading.Thread] = None
+        self.cleaned = 0
+        self.last_cleanup_at: Optional[float] = None
+
+    def _analyze_idea(self, payload: Dict[str, Any], cancel_event: threading.Event) -> Dict[str, Any]:
+        # Imported here so the job module does not load the agent stack on its own
+        from app.services.agent_service import AgentService
+        # Raise on failure so the job is recorded as failed, not as a placeholder form
+        return AgentService().analyze_idea_description(payload["description"], cancel_event, raise_errors=True)
+
+    def submit(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Persist a new job and queue it. Raises JobQueueFullError when the
+        queue already holds max_depth jobs.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        # Check and enqueue together, so concurrent submits cannot overshoot max_depth
+        with self._lock:
+            if self._queue.qsize() >= self.max_depth:
+                raise JobQueueFullError(f"Job queue is full ({self.max_depth} jobs waiting)")
+            job = self.repository.create(kind, payload)
+            self._queue.put(job["id"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job with its status and, once finished, its result or error
+        """
+        return self.repository.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a queued or running job. A running analysis is signalled to stop
+        and its result, if it still arrives, is discarded.
+        """
+        cancelled = self.repository.transition(
+            job_id, (JOB_QUEUED, JOB_RUNNING), JOB_CANCELLED, finished_at=time.time()
+        )
+        if cancelled:
+            with self._lock:
+                event = self._cancel_events.get(job_id)
+            if event:
+                event.set()
+        return self.repository.get(job_id)
+
+    def cleanup(self) -> int:
+        """
+        Delete finished jobs older than the retention period. Returns the
+        number of jobs deleted.
+        """
+        try:
+            deleted = self.repository.delete_finished(time.time() - self.retention)
+        except Exception as e:
+            print(f"Error cleaning up finished jobs: {str(e)}")
+            return 0
+        self.cleaned += deleted
+        self.last_cleanup_at = time.time()
+        return deleted
+
+    def start(self) -> None:
+        """
+        Re-queue unfinished jobs from the store and start the worker threads
+        and the cleanup thread
+        """
+        if self._threads:
+            return
+        for job in self.repository.list_unfinished():
+            if job["status"] == JOB_RUNNING:
+                self.repository.transition(job["id"], (JOB_RUNNING,), JOB_QUEUED, started_at=None)
+            self._queue.put(job["id"])
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._stopping.clear()
+        self._cleaner = threading.Thread(target=self._clean, name="job-cleaner", daemon=True)
+        self._cleaner.start()
+
+    def stop(self) -> None:
+        """
+        Stop taking new jobs. Jobs still running are left as "running" in the
+        store and are picked up again on the next start.
+        """
+        for _ in self._threads:
+            self._queue.put(None)
+        self._threads = []
+        self._stopping.set()
+        if self._cleaner:
+            self._cleaner.join(timeout=5)
+            self._cleaner = None
+
+    def _clean(self) -> None:
+        while not self._stopping.is_set():
+            self.cleanup()
+            self._stopping.wait(self.cleanup_interval)
+
+    def _work(self) -> None:
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            job = self.repository.get(job_id)
+            if not job or not self.repository.transition(
+                job_id, (JOB_QUEUED,), JOB_RUNNING, started_at=time.time()
+            ):
+                # Cancelled (or already handled) while it was waiting
+                continue
+
+            cancel_event = threading.Event()
+            with self._lock:
+                self._cancel_events[job_id] = cancel_event
+                self._running += 1
+            try:
+                result = self.handlers[job["kind"]](job["payload"], cancel_event)
+                self.repository.transition(
+                    job_id, (JOB_RUNNING,), JOB_SUCCEEDED, result=result, finished_at=time.time()
+                )
+            except Exception as e:
+                if cancel_event.is_set():
+                    # cancel() has already recorded the job as cancelled
+                    print(f"Job {job_id} cancelled while running")
+                    continue
+                print(f"Error running job {job_id}: {str(e)}")
+                self.repository.transition(
+                    job_id, (JOB_RUNNING,), JOB_FAILED, error=str(e), finished_at=time.time()
+                )
+            finally:
+                with self._lock:
+                    self._cancel_events.pop(job_id, None)
+                    self._running -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Queue depth, worker occupancy and job counts per status
+        """
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_depth": self.max_depth,
+            "workers": self.workers,
+            "running": self._running,
+            "retention_seconds": self.retention,
+            "cleaned": self.cleaned,
+            "last_cleanup_at": self.last_cleanup_at,
+            "jobs": self.repository.count_by_status()
+        }
+
+
+# Process-wide job queue, started and stopped with the application
+job_service = JobService()
+
+def get_job_service() -> JobService:
+    """
+    Returns the process-wide job queue
+    """
+    return job_service
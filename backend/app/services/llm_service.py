@@ -1,9 +1,12 @@
-from app.llms.llm_basics import LLMProvider
+from typing import AsyncIterator
+
+from app.llms.llm_basics import get_llm_provider
 from app.llms.prompts.idea_prompts import IdeaPrompts
 
 class LLMService:
     def __init__(self):
-        self.llm = LLMProvider()
+        # Shared provider: one connection pool and one set of in-flight requests
+        self.llm = get_llm_provider()
         self.prompts = IdeaPrompts()
     
     async def improve_idea_text(self, text: str) -> str:
@@ -31,3 +34,48 @@ class LLMService:
             # Log the error
             print(f"Error improving idea text: {str(e)}")
             raise
+    
+    async def stream_improved_idea_text(self, text: str) -> AsyncIterator[str]:
+        """
+        Streaming variant of improve_idea_text that yields the improved text
+        in chunks as the LLM generates it.
+        
+        Leading and trailing whitespace is dropped, like the strip() in
+        improve_idea_text, so the concatenated chunks equal its result.
+        
+        Args:
+            text: The raw idea description text
+            
+        Yields:
+            Chunks of the improved text
+        """
+        if not text or not text.strip():
+            return
+            
+        prompt = self.prompts.get_improvement_prompt(text)
+        
+        try:
+            chunks = await self.llm.complete(
+                prompt=prompt,
+                temperature=0.3,  # Lower temperature for more consistent results
+                stream=True
+            )
+            started = False
+            # Whitespace is held back until we know it is not the end of the text
+            pending = ""
+            async for chunk in chunks:
+                if not started:
+                    chunk = chunk.lstrip()
+                    if not chunk:
+                        continue
+                    started = True
+                body = chunk.rstrip()
+                if body:
+                    yield pending + body
+                    pending = chunk[len(body):]
+                else:
+                    pending += chunk
+        except Exception as e:
+            # Log the error
+            print(f"Error improving idea text: {str(e)}")
+            raise
@@ -1,12 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
+from app.api.v1.endpoints import metrics
+from app.core.metrics import MetricsMiddleware
+from app.core.compression import CompressionMiddleware
+from app.services.counter_service import get_counter_service
+from app.db.supabase import close_async_supabase_client
+from app.services.idea_service import IdeaService
+from app.services.job_service import get_job_service
+from app.llms.llm_basics import get_llm_provider, close_llm_provider
+from app.agents.agent_stack import get_agent_stack
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Flush buffered view/vote counters in the background
+    counters = get_counter_service()
+    counters.start()
+    # Build the in-memory idea indexes from a streamed scan without delaying startup
+    index_build = asyncio.create_task(IdeaService().rebuild_indexes())
+    # Periodically recount the facet counts from the database to fix any drift
+    facet_reconcile = asyncio.create_task(IdeaService().reconcile_facets_periodically())
+    # Periodically re-read vote and view counts for the trending ranking
+    trending_refresh = asyncio.create_task(IdeaService().refresh_trending_periodically())
+    # Run queued (and interrupted) analysis jobs in the background
+    jobs = get_job_service()
+    jobs.start()
+    # Open the shared LLM client (and its connection pool) up front
+    get_llm_provider()
+    # The agent stack is loaded on first use unless warm-up is enabled
+    if settings.AGENT_WARMUP:
+        get_agent_stack().start_warm_up(settings.AGENT_WARMUP_SETS)
+    yield
+    jobs.stop()
+    index_build.cancel()
+    facet_reconcile.cancel()
+    trending_refresh.cancel()
+    # Flush whatever is still buffered before the process exits
+    counters.stop()
+    await close_async_supabase_client()
+    await close_llm_provider()
 
 app = FastAPI(
     title="The Way Forward API",
     description="Backend API for The Way Forward platform",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Custom middleware to add CORS headers
@@ -38,5 +79,17 @@ app.add_middleware(
     expose_headers=["Content-Range", "Range"]
 )
 
+# Gzip large JSON bodies (idea lists); streamed responses are left as they are
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.RESPONSE_GZIP_MIN_BYTES,
+    compresslevel=settings.RESPONSE_GZIP_LEVEL
+)
+
+# Record request latency per route; added last so it is the outermost layer
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
+# Prometheus scrapes /metrics at the root
+app.include_router(metrics.router, tags=["metrics"])
@@ -0,0 +1,65 @@
+"""
+Measure cold import time of the API and of the agent stack.
+
+Each measurement runs in a fresh interpreter so nothing is cached between
+runs. Run from the backend directory:
+
+    python scripts/benchmark_import_time.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    # What uvicorn imports to serve the API
+    "api": "import main",
+    # What importing the API used to pull in eagerly
+    "agent_stack": "import app.agents.agent_idea_submission",
+    # Lazy path: the API plus a first analysis loading the agents
+    "api_then_agents": "import main; from app.agents.agent_stack import get_agents; get_agents()",
+}
+
+
+def measure(statement: str) -> float:
+    code = (
+        "import time; started = time.perf_counter(); "
+        f"{statement}; "
+        "print(time.perf_counter() - started)"
+    )
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = {}
+    for name, statement in TARGETS.items():
+        samples = [measure(statement) for _ in range(args.runs)]
+        results[name] = {
+            "median_ms": round(statistics.median(samples) * 1000, 1),
+            "min_ms": round(min(samples) * 1000, 1),
+            "max_ms": round(max(samples) * 1000, 1),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, result in results.items():
+        print(f"{name:16} median {result['median_ms']:8.1f} ms  (min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Measure the per-row CPU cost of serializing an idea list response.
+
+Compares the path GET /ideas used to take (IdeaResponse.model_validate in the
+service, then FastAPI validating and serializing the list again through
+response_model and rendering it with the standard json module) with the fast
+path (one validation, model_dump, orjson), plus the cost and savings of
+gzipping the body. Run from the backend directory:
+
+    python scripts/benchmark_serialization.py --rows 100 --repeat 200
+"""
+import argparse
+import asyncio
+import datetime
+import gzip
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.config import settings
+from app.schemas.idea import IdeaResponse
+
+
+def make_rows(count: int, text_chars: int) -> List[Dict[str, Any]]:
+    """
+    Database-shaped rows with long text and a nested supporting_material document
+    """
+    now = datetime.datetime.now(datetime.timezone.utc)
+    text = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (text_chars // 56 + 1))[:text_chars]
+    rows = []
+    for i in range(count):
+        created = (now - datetime.timedelta(minutes=i)).isoformat()
+        rows.append({
+            "id": str(uuid.uuid4()),
+            "title": f"Idea {i}",
+            "humanity_challenge": "Climate Change",
+            "category": "Energy",
+            "sub_category": "Storage",
+            "geographic_focus": "Global",
+            "time_horizon": "Medium-term (3-5 years)",
+            "problem_statement": text,
+            "solution": text,
+            "why_now": text,
+            "market_estimate": 50_000_000,
+            "business_model": text,
+            "technologies": ["Batteries", "IoT", "Machine Learning"],
+            "competition": "Acme Corp, Globex, Initech",
+            "status": "Concept",
+            "type_of_author": "Individual",
+            "author": "Benchmark",
+            "sources": [f"https://example.com/source/{j}" for j in range(5)],
+            "date_created": created,
+            "date_updated": created,
+            "upvotes": i,
+            "downvotes": 0,
+            "view_count": i * 10,
+            "is_featured": False,
+            "is_published": True,
+            "ideal_customer_profile": text,
+            "skills_required": ["Engineering", "Sales"],
+            "potential_investors": ["Fund A (VC)", "Fund B (Impact)"],
+            "potential_customers": ["Utility A (Utility)"],
+            "contacts": None,
+            "collaboration_groups": ["Group A (NGO)"],
+            "similar_ideas": ["Idea X", "Idea Y"],
+            "supporting_material": {
+                "links": [{"title": f"Doc {j}", "url": f"https://example.com/{j}"} for j in range(10)],
+                "figures": {"capex": [1.5, 2.5, 3.5], "opex": {"year_1": 100, "year_2": 120}},
+                "notes": text,
+            },
+            "other": None,
+        })
+    return rows
+
+
+RESPONSE_FIELD = create_response_field(name="Response_get_ideas", type_=List[IdeaResponse])
+
+
+def before(rows: List[Dict[str, Any]]) -> bytes:
+    ideas = [IdeaResponse.model_validate(row) for row in rows]
+    content = asyncio.run(serialize_response(field=RESPONSE_FIELD, response_content=ideas))
+    return JSONResponse(content).body
+
+
+def after(rows: List[Dict[str, Any]]) -> bytes:
+    ideas = [IdeaResponse.model_validate(row) for row in rows]
+    return ORJSONResponse([idea.model_dump() for idea in ideas]).body
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--text-chars", type=int, default=2000, help="Length of each long text field")
+    parser.add_argument("--repeat", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows, args.text_chars)
+    # Both paths must produce the same document
+    assert json.loads(before(rows)) == json.loads(after(rows).replace(b'+00:00"', b'Z"'))
+
+    body = after(rows)
+    # asyncio.run in before() has a fixed cost; measure it so it can be subtracted
+    event_loop = measure(lambda: asyncio.run(asyncio.sleep(0)), args.repeat)
+    results = {
+        "rows": args.rows,
+        "body_bytes": len(body),
+        "before_us_per_row": (measure(lambda: before(rows), args.repeat) - event_loop) / args.rows * 1e6,
+        "after_us_per_row": measure(lambda: after(rows), args.repeat) / args.rows * 1e6,
+        "gzip_us_per_row": measure(lambda: gzip.compress(body, compresslevel=settings.RESPONSE_GZIP_LEVEL), args.repeat) / args.rows * 1e6,
+        "gzip_bytes": len(gzip.compress(body, compresslevel=settings.RESPONSE_GZIP_LEVEL)),
+    }
+    results["speedup"] = results["before_us_per_row"] / results["after_us_per_row"]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.rows} rows, {results['body_bytes'] / 1024:.0f} KiB body")
+    print(f"before (validate twice, json):  {results['before_us_per_row']:8.1f} us/row")
+    print(f"after  (validate once, orjson): {results['after_us_per_row']:8.1f} us/row  ({results['speedup']:.1f}x)")
+    print(
+        f"gzip level {settings.RESPONSE_GZIP_LEVEL}:                   {results['gzip_us_per_row']:8.1f} us/row  "
+        f"({results['gzip_bytes'] / 1024:.0f} KiB, {results['gzip_bytes'] / results['body_bytes']:.0%} of the body)"
+    )
+
+
+if __name__ == "__main__":
+    main()
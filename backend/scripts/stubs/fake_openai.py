@@ -0,0 +1,233 @@
+"""
+Fake OpenAI-compatible chat completions server for offline benchmarks.
+
+Responses take --latency-ms before the first token, then stream at
+--tokens-per-second. The content depends on the request:
+
+- structured outputs (response_format json_schema): a JSON object matching the schema
+- agent steps (a system prompt asking for final_answer): one code step returning the form
+- anything else: --completion-tokens words of filler text
+
+Embeddings are deterministic pseudo-vectors, returned after --latency-ms.
+
+Point OPENAI_BASE_URL (and OPENAI_API_BASE, read by LiteLLM) at http://host:port/v1:
+
+    python scripts/stubs/fake_openai.py --port 8101 --latency-ms 300 --tokens-per-second 80
+"""
+import argparse
+import array
+import asyncio
+import base64
+import hashlib
+import json
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FILLER = (
+    "This idea proposes a practical and measurable approach to a pressing problem, "
+    "with a clear path from pilot to scale and a sustainable business model."
+).split()
+
+AGENT_FORM = {
+    "title": "Benchmark Idea",
+    "humanity_challenge": "Climate Change",
+    "category": "Energy",
+    "sub_category": "Storage",
+    "geographic_focus": "Global",
+    "time_horizon": "Medium-term (3-5 years)",
+    "problem_statement": "Renewable energy is intermittent.",
+    "solution": "Low-cost community batteries.",
+    "why_now": "Battery prices have fallen sharply.",
+    "market_estimate": 50000000,
+    "business_model": "Energy-as-a-service subscriptions",
+    "technologies": ["Batteries", "IoT"],
+    "competition": "Tesla, Fluence",
+    "status": "Concept",
+    "sources": ["https://example.com/report"],
+}
+
+
+def _count_tokens(text: str) -> int:
+    # Close enough to tiktoken for load modelling
+    return max(1, len(text) // 4)
+
+
+def _filler(tokens: int) -> str:
+    return " ".join(FILLER[i % len(FILLER)] for i in range(tokens))
+
+
+def _from_schema(schema: Dict[str, Any], defs: Dict[str, Any]) -> Any:
+    if "$ref" in schema:
+        return _from_schema(defs[schema["$ref"].split("/")[-1]], defs)
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"] or schema["anyOf"]
+        return _from_schema(options[0], defs)
+    if "enum" in schema:
+        return schema["enum"][0]
+    kind = schema.get("type")
+    if kind == "object":
+        return {name: _from_schema(prop, defs) for name, prop in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [_from_schema(schema.get("items", {"type": "string"}), defs)]
+    if kind == "integer":
+        return 1000000
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    if kind == "null":
+        return None
+    return "Benchmark value"
+
+
+def respond_to(body: Dict[str, Any], completion_tokens: int) -> str:
+    """
+    The text of the completion for a chat completions request body
+    """
+    response_format = body.get("response_format") or {}
+    if response_format.get("type") == "json_schema":
+        schema = response_format["json_schema"]["schema"]
+        return json.dumps(_from_schema(schema, schema.get("$defs", {})))
+
+    system = " ".join(
+        m["content"] if isinstance(m.get("content"), str)
+        else " ".join(part.get("text", "") for part in m.get("content") or [])
+        for m in body.get("messages", []) if m.get("role") == "system"
+    )
+    if "final_answer" in system:
+        return (
+            "Thought: I have enough information to fill in the form.\n"
+            "Code:\n```py\nfinal_answer(" + json.dumps(AGENT_FORM) + ")\n```<end_code>"
+        )
+    return _filler(completion_tokens)
+
+
+def create_app(latency_ms: float = 300.0, tokens_per_second: float = 80.0, completion_tokens: int = 60) -> FastAPI:
+    """
+    The fake server; every completion waits latency_ms, then takes
+    one token per 1/tokens_per_second seconds
+    """
+    app = FastAPI(title="Fake OpenAI")
+    app.state.requests = 0
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        model = body.get("model", "gpt-4o-mini")
+        text = respond_to(body, completion_tokens)
+        prompt_tokens = _count_tokens(json.dumps(body.get("messages", [])))
+        # Keep word boundaries so the streamed chunks reassemble exactly
+        words = text.split(" ")
+        tokens: List[str] = [w if i == 0 else " " + w for i, w in enumerate(words)]
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens)
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        delay = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency_ms / 1000 + delay * len(tokens))
+            return JSONResponse({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": text},
+                    "finish_reason": "stop"
+                }],
+                "usage": usage
+            })
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+            return "data: " + json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }) + "\n\n"
+
+        async def events():
+            await asyncio.sleep(latency_ms / 1000)
+            yield chunk({"role": "assistant", "content": ""})
+            for token in tokens:
+                if delay:
+                    await asyncio.sleep(delay)
+                yield chunk({"content": token})
+            yield chunk({}, "stop")
+            if include_usage:
+                yield "data: " + json.dumps({
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": usage
+                }) + "\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    @app.post("/embeddings")
+    async def embeddings(request: Request):
+        body = await request.json()
+        inputs = body.get("input") or []
+        inputs = [inputs] if isinstance(inputs, str) else inputs
+        dim = int(body.get("dimensions") or 512)
+        await asyncio.sleep(latency_ms / 1000)
+        data = []
+        for index, text in enumerate(inputs):
+            # Deterministic per text, so identical texts embed identically
+            seed = hashlib.sha256(str(text).encode()).digest()
+            vector = [(seed[i % len(seed)] - 128) / 128 for i in range(dim)]
+            if body.get("encoding_format") == "base64":
+                # The openai client asks for packed float32 when numpy is installed
+                vector = base64.b64encode(array.array("f", vector).tobytes()).decode()
+            data.append({"object": "embedding", "index": index, "embedding": vector})
+        tokens = sum(_count_tokens(str(text)) for text in inputs)
+        return {
+            "object": "list",
+            "data": data,
+            "model": body.get("model", "text-embedding-3-small"),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+        }
+
+    @app.get("/v1/models")
+    async def models():
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "owned_by": "benchmark"}]}
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8101)
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="Time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=80.0, help="Generation rate after the first token")
+    parser.add_argument("--completion-tokens", type=int, default=60, help="Length of free-text completions")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(
+        create_app(args.latency_ms, args.tokens_per_second, args.completion_tokens),
+        host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+In-memory PostgREST stand-in for the Supabase `ideas` table.
+
+Understands the subset of PostgREST the repository layer uses: column
+selection, eq/neq/lt/lte/gt/gte/ilike filters, nested or=/and= conditions
+(keyset pagination), order, limit/offset, single-object responses, insert,
+update, delete and the increment_idea_counters RPC. Point SUPABASE_URL at it:
+
+    python scripts/stubs/postgrest_stub.py --port 54321 --rows 1000 --latency-ms 5
+"""
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import re
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import FastAPI, Request, Response
+
+TABLE = "ideas"
+COUNTER_COLUMNS = ("view_count", "upvotes", "downvotes")
+
+CHALLENGES = ["Climate Change", "AI Ethics", "Other Challenges"]
+CATEGORIES = ["Energy", "Agriculture", "Healthcare", "Education", "Transport"]
+STATUSES = ["Concept", "Prototype", "Pilot", "Scaling"]
+
+
+def make_row(index: int, **values: Any) -> Dict[str, Any]:
+    """
+    A complete ideas row, with defaults filled in for anything not given
+    """
+    created = datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(minutes=index)
+    row = {
+        "id": str(uuid.uuid4()),
+        "title": f"Idea {index}",
+        "humanity_challenge": CHALLENGES[index % len(CHALLENGES)],
+        "category": CATEGORIES[index % len(CATEGORIES)],
+        "sub_category": "General",
+        "geographic_focus": "Global",
+        "time_horizon": "Medium-term (3-5 years)",
+        "problem_statement": f"Problem statement of idea {index}. " * 4,
+        "solution": f"Solution of idea {index}. " * 4,
+        "why_now": "Costs have dropped and demand is growing.",
+        "market_estimate": 1_000_000 * (index % 50 + 1),
+        "business_model": "Subscription",
+        "technologies": ["IoT", "Machine Learning"],
+        "competition": "Acme Corp, Globex",
+        "status": STATUSES[index % len(STATUSES)],
+        "type_of_author": "Individual",
+        "author": "Benchmark",
+        "sources": ["https://example.com"],
+        "ideal_customer_profile": None,
+        "skills_required": None,
+        "potential_investors": None,
+        "potential_customers": None,
+        "contacts": None,
+        "collaboration_groups": None,
+        "similar_ideas": None,
+        "supporting_material": None,
+        "other": None,
+        "is_featured": index % 10 == 0,
+        "is_published": True,
+        "upvotes": random.randint(0, 100),
+        "downvotes": random.randint(0, 20),
+        "view_count": random.randint(0, 1000),
+        "date_created": created.isoformat(),
+        "date_updated": created.isoformat(),
+    }
+    row.update(values)
+    return row
+
+
+def _split_top_level(text: str) -> List[str]:
+    # Split on commas that are not inside parentheses or double quotes
+    parts, depth, quoted, current = [], 0, False, ""
+    for char in text:
+        if char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def _compare(op: str, left: Any, right: str) -> bool:
+    if op == "is":
+        return left is None if right == "null" else str(left).lower() == right
+    if left is None:
+        return False
+    if op in ("like", "ilike"):
+        pattern = re.escape(right).replace(r"\*", ".*").replace("%", ".*")
+        flags = re.IGNORECASE if op == "ilike" else 0
+        return re.fullmatch(pattern, str(left), flags) is not None
+    if isinstance(left, bool):
+        right_value: Any = right == "true"
+    elif isinstance(left, (int, float)):
+        right_value = float(right)
+    else:
+        left, right_value = str(left), right
+    return {
+        "eq": left == right_value,
+        "neq": left != right_value,
+        "lt": left < right_value,
+        "lte": left <= right_value,
+        "gt": left > right_value,
+        "gte": left >= right_value,
+    }[op]
+
+
+def _condition(column: str, expression: str) -> Callable[[Dict[str, Any]], bool]:
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, value = expression.partition(".")
+    value = value[1:-1] if value.startswith('"') and value.endswith('"') else value
+    return lambda row: _compare(op, row.get(column), value) != negate
+
+
+def _logical(kind: str, body: str) -> Callable[[Dict[str, Any]], bool]:
+    # body is the inside of or=(...)/and(...): a comma list of conditions or nested groups
+    conditions = []
+    for part in _split_top_level(body):
+        match = re.fullmatch(r"(or|and)\((.*)\)", part)
+        if match:
+            conditions.append(_logical(match.group(1), match.group(2)))
+        else:
+            column, _, expression = part.partition(".")
+            conditions.append(_condition(column, expression))
+    combine = any if kind == "or" else all
+    return lambda row: combine(condition(row) for condition in conditions)
+
+
+def parse_query(params: List[Tuple[str, str]]) -> Dict[str, Any]:
+    """
+    Filters, ordering, paging and column selection of a PostgREST query string
+    """
+    query: Dict[str, Any] = {"filters": [], "order": [], "limit": None, "offset": 0, "select": None}
+    for key, value in params:
+        if key == "select":
+            query["select"] = None if value.strip() == "*" else [c.strip() for c in value.split(",")]
+        elif key == "order":
+            for term in value.split(","):
+                column, *modifiers = term.split(".")
+                query["order"].append((column, "desc" in modifiers))
+        elif key == "limit":
+            query["limit"] = int(value)
+        elif key == "offset":
+            query["offset"] = int(value)
+        elif key in ("columns", "on_conflict"):
+            # Insert/upsert options, not filters
+            continue
+        elif key in ("or", "and"):
+            query["filters"].append(_logical(key, value[1:-1]))
+        else:
+            query["filters"].append(_condition(key, value))
+    return query
+
+
+class IdeasTable:
+    """
+    The rows of the ideas table, with PostgREST query semantics
+    """
+
+    def __init__(self, rows: int = 0):
+        self.rows: Dict[str, Dict[str, Any]] = {}
+        for index in range(rows):
+            row = make_row(index)
+            self.rows[row["id"]] = row
+
+    def select(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rows = [r for r in self.rows.values() if all(f(r) for f in query["filters"])]
+        # Sort by the least significant key first so the first key wins
+        for column, desc in reversed(query["order"]):
+            present = [r for r in rows if r.get(column) is not None]
+            present.sort(key=lambda r: r[column], reverse=desc)
+            rows = present + [r for r in rows if r.get(column) is None]
+        rows = rows[query["offset"]:]
+        if query["limit"] is not None:
+            rows = rows[:query["limit"]]
+        if query["select"]:
+            rows = [{c: r.get(c) for c in query["select"]} for r in rows]
+        return rows
+
+    def insert(self, values: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        inserted = []
+        for value in values:
+            row = make_row(0, **{"upvotes": 0, "downvotes": 0, "view_count": 0, **value})
+            self.rows[row["id"]] = row
+            inserted.append(row)
+        return inserted
+
+    def update(self, query: Dict[str, Any], values: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rows = [r for r in self.rows.values() if all(f(r) for f in query["filters"])]
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        for row in rows:
+            row.update(values, date_updated=now)
+        return rows
+
+    def delete(self, query: Dict[str, Any]) -> List[Dict[str, Any]]:
+        rows = [r for r in self.rows.values() if all(f(r) for f in query["filters"])]
+        for row in rows:
+            del self.rows[row["id"]]
+        return rows
+
+    def increment_counters(self, updates: List[Dict[str, Any]]) -> None:
+        for update in updates:
+            row = self.rows.get(str(update.get("id")))
+            if row is None:
+                continue
+            for column in COUNTER_COLUMNS:
+                row[column] = (row.get(column) or 0) + int(update.get(column) or 0)
+
+
+def create_app(rows: int = 1000, latency_ms: float = 0.0) -> FastAPI:
+    """
+    The stub server; latency_ms is added to every response
+    """
+    app = FastAPI(title="PostgREST stub")
+    table = IdeasTable(rows)
+    app.state.table = table
+
+    def json_response(body: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+        return Response(json.dumps(body, default=str), status, headers=headers, media_type="application/json")
+
+    @app.api_route(f"/rest/v1/{TABLE}", methods=["GET", "HEAD", "POST", "PATCH", "DELETE"])
+    async def ideas(request: Request) -> Response:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        query = parse_query(list(request.query_params.multi_items()))
+        if request.method == "POST":
+            body = json.loads(await request.body())
+            rows = table.insert(body if isinstance(body, list) else [body])
+            return json_response(rows, 201)
+        if request.method == "PATCH":
+            rows = table.update(query, json.loads(await request.body()))
+        elif request.method == "DELETE":
+            rows = table.delete(query)
+        else:
+            rows = table.select(query)
+
+        headers = {"Content-Range": f"0-{max(len(rows) - 1, 0)}/{len(rows) if 'count=' in request.headers.get('prefer', '') else '*'}"}
+        if "vnd.pgrst.object" in request.headers.get("accept", ""):
+            if len(rows) != 1:
+                return json_response({
+                    "code": "PGRST116",
+                    "details": f"The result contains {len(rows)} rows",
+                    "hint": None,
+                    "message": "JSON object requested, multiple (or no) rows returned"
+                }, 406)
+            return json_response(rows[0], headers=headers)
+        return json_response(rows, headers=headers)
+
+    @app.post("/rest/v1/rpc/increment_idea_counters")
+    async def increment_idea_counters(request: Request) -> Response:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        body = json.loads(await request.body())
+        table.increment_counters(body.get("updates") or [])
+        return json_response(None)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--rows", type=int, default=1000, help="Ideas to seed the table with")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_app(args.rows, args.latency_ms), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()